@@ -0,0 +1,303 @@
+# async_protection_service.py - Asyncio fetch engine for batches of URLs
+import asyncio
+import logging
+import queue
+import threading
+import time
+import httpx
+from transports import strip_hop_by_hop
+
+class AsyncProtectionService:
+    """Asyncio counterpart to ProtectionService built on httpx
+
+    Shares fingerprinting, service rotation and proxy configuration with the
+    ProtectionService it wraps, and bounds concurrency globally and per domain.
+    All coroutines run on one background event loop so pooled clients and
+    semaphores stay bound to a single loop.
+    """
+
+    def __init__(self, protection_service):
+        self.protection_service = protection_service
+        self.config_manager = protection_service.config_manager
+        self.max_concurrency = self.config_manager.get_value("protection.max_concurrency", 10)
+        self.max_per_domain = self.config_manager.get_value("protection.max_per_domain", 2)
+        self.logger = logging.getLogger("AsyncProtectionService")
+
+        self.clients = {}
+        self.global_semaphore = None
+        self.domain_semaphores = {}
+
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    async def get_with_protection(self, url, headers=None, bypass_cache=False):
+        """Make a protected HTTP request without blocking the event loop"""
+        page = await self.get_bytes_with_protection(url, headers, bypass_cache)
+        if page is None:
+            return None
+
+        return self.protection_service._decode_body(*page)
+
+    async def get_bytes_with_protection(self, url, headers=None, bypass_cache=False):
+        """Make a protected HTTP request and return (body, encoding) undecoded
+
+        Shares in-flight fetches with the sync path through the single-flight
+        registry of the wrapped ProtectionService.
+        """
+        # Same key as the sync path so sync and async callers share fetches
+        key = self.protection_service._flight_key(url, headers, bypass_cache)
+        return await self.protection_service.single_flight.do_async(
+            key, self._get_once, url, headers, bypass_cache
+        )
+
+    async def _get_once(self, url, headers=None, bypass_cache=False):
+        """Make a protected HTTP request without de-duplication"""
+        ps = self.protection_service
+        loop = asyncio.get_running_loop()
+
+        # The SQLite cache and charset detection block, so they run off the event loop
+        headers = ps._request_headers(headers)
+        cache_entry, fresh, headers = await loop.run_in_executor(
+            None, ps._cache_lookup, url, headers, bypass_cache
+        )
+        if fresh:
+            encoding = await loop.run_in_executor(
+                None, ps._resolve_encoding, cache_entry["body"], cache_entry["encoding"]
+            )
+            return cache_entry["body"], encoding
+
+        service = ps._select_service(url) if ps.enabled else "Direct"
+        response = await self._make_request(service, url, headers or {})
+        if response is None:
+            return None
+
+        return await loop.run_in_executor(None, ps._cache_response, url, headers, cache_entry, response)
+
+    async def get_many_with_protection(self, urls, headers=None, bypass_cache=False, as_bytes=False):
+        """Fetch URLs concurrently, yielding (url, html) as each completes
+
+        With as_bytes=True each result is (body, encoding) instead of text.
+        """
+        get = self.get_bytes_with_protection if as_bytes else self.get_with_protection
+
+        async def fetch(url):
+            return url, await get(url, headers, bypass_cache)
+
+        # Drop duplicates but keep submission order
+        tasks = [asyncio.ensure_future(fetch(url)) for url in dict.fromkeys(urls)]
+
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def get_many(self, urls, headers=None, bypass_cache=False, as_bytes=False):
+        """Fetch URLs from synchronous code, yielding (url, html) as each completes"""
+        loop = self._get_loop()
+        results = queue.Queue()
+        done = object()
+
+        async def collect():
+            batch = self.get_many_with_protection(urls, headers, bypass_cache, as_bytes)
+            try:
+                async for item in batch:
+                    results.put(item)
+            finally:
+                await batch.aclose()
+                results.put(done)
+
+        future = asyncio.run_coroutine_threadsafe(collect(), loop)
+
+        try:
+            while True:
+                item = results.get()
+                if item is done:
+                    break
+                yield item
+
+            # Surface any error raised inside the batch
+            future.result()
+        finally:
+            # Stop outstanding fetches if the caller stops iterating early
+            if not future.done():
+                future.cancel()
+
+    def close(self):
+        """Close pooled clients and stop the background event loop"""
+        with self._lock:
+            if self._loop is None:
+                return
+
+            asyncio.run_coroutine_threadsafe(self._close_clients(), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+            self._loop = None
+            self._thread = None
+
+    async def _close_clients(self):
+        """Close all pooled httpx clients"""
+        for client in self.clients.values():
+            await client.aclose()
+        self.clients = {}
+
+    def _get_loop(self):
+        """Start the background event loop on first use"""
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever,
+                    name="AsyncProtectionLoop",
+                    daemon=True
+                )
+                self._thread.start()
+            return self._loop
+
+    def _get_client(self, service, route, http2=False):
+        """Get the pooled client for a service, proxy endpoint and protocol"""
+        key = (service, route["endpoint"], http2)
+
+        if key not in self.clients:
+            pool_size = self.protection_service.pool_size
+            self.clients[key] = httpx.AsyncClient(
+                http2=http2,
+                proxy=route["proxy"],
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_connections=pool_size,
+                    max_keepalive_connections=pool_size
+                )
+            )
+
+        return self.clients[key]
+
+    async def _make_request(self, service, url, headers):
+        """Send a request through a service with the same retry logic as the sync path"""
+        ps = self.protection_service
+        loop = asyncio.get_running_loop()
+        route = ps._get_route(service, url)
+
+        if route is None:
+            self.logger.warning(f"{service} not configured, falling back to direct request")
+            service = "Direct"
+            route = ps._get_route(service, url)
+
+        # Multiplex over HTTP/2 where the domain is configured for it
+        http2 = ps._get_transport(route["url"]).name == "http2"
+        if http2:
+            headers = strip_hop_by_hop(headers)
+        client = self._get_client(service, route, http2)
+
+        domain = ps._extract_domain(url)
+        if self.global_semaphore is None:
+            self.global_semaphore = asyncio.Semaphore(self.max_concurrency)
+        if domain not in self.domain_semaphores:
+            self.domain_semaphores[domain] = asyncio.Semaphore(self.max_per_domain)
+
+        ps.retry_scheduler.record_request()
+
+        # Make request with retry logic. Backoff waits happen outside the
+        # semaphores so the slots serve other URLs in the meantime.
+        delay = 0
+        attempt = 0
+        while True:
+            # Fail fast while this route's breaker is open
+            if not ps.circuit_breaker.allow(service, domain):
+                self.logger.debug(f"Circuit open for {service} on {domain}, skipping {url}")
+                return None
+
+            # Wait only if this domain's request budget is exhausted
+            await ps.rate_limiter.acquire_async(domain)
+
+            started = time.monotonic()
+            retry_after = None
+            try:
+                async with self.domain_semaphores[domain], self.global_semaphore:
+                    # Stay within the service's concurrency cap and count the request
+                    await ps.service_quota.acquire_async(service)
+                    started = time.monotonic()
+                    try:
+                        async with client.stream(
+                            "GET",
+                            route["url"],
+                            headers=headers,
+                            timeout=route["timeout"]
+                        ) as response:
+                            if response.status_code in [200, 304]:
+                                # Only a body that was read in full counts as a success
+                                result = await self._read_response(url, response)
+                                await self._report_result(service, url, started, "success")
+                                if result is not None:
+                                    await loop.run_in_executor(
+                                        None, ps.service_quota.record_bytes, service, len(result.content)
+                                    )
+                                return result
+                    finally:
+                        ps.service_quota.release(service)
+
+                if not ps.retry_scheduler.should_retry_status(response.status_code):
+                    self.logger.warning(f"Unexpected status code: {response.status_code}")
+                    outcome = "error" if response.status_code >= 500 else "success"
+                    await self._report_result(service, url, started, outcome)
+                    return None
+
+                self.logger.warning(f"Blocked with status {response.status_code} on {service}")
+                outcome = "blocked" if response.status_code in [403, 429] else "error"
+                await self._report_result(service, url, started, outcome)
+                retry_after = response.headers.get("Retry-After")
+            except Exception as e:
+                self.logger.error(f"Error making {service} request: {e}")
+                await self._report_result(service, url, started, "error")
+
+            delay = ps.retry_scheduler.next_delay(url, attempt, delay, retry_after)
+            if delay is None:
+                return None
+
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _report_result(self, service, url, started, outcome):
+        """Feed a request outcome back into routing off the event loop
+
+        The router saves its stats to disk every few seconds while holding its
+        lock, so it is never called from the loop directly.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            None, self.protection_service._report_result, service, url, started, outcome
+        )
+
+    async def _read_response(self, url, response):
+        """Stream a response body, rejecting unwanted content types and capping its size"""
+        ps = self.protection_service
+
+        if response.status_code == 304:
+            return ps._build_result(304, response.headers, b"")
+
+        # Abort before reading the body if the headers already rule it out
+        if not ps._accepts_content_type(url, response.headers.get("Content-Type", "")):
+            return None
+
+        body = bytearray()
+        truncated = False
+        async for chunk in response.aiter_bytes():
+            body += chunk
+            if len(body) > ps.max_body_bytes:
+                del body[ps.max_body_bytes:]
+                truncated = True
+                break
+
+        if truncated:
+            self.logger.warning(f"Truncated {url} at {ps.max_body_bytes} bytes")
+            ps._record_fetch_stat(url, "truncated")
+
+        return ps._build_result(
+            response.status_code,
+            response.headers,
+            bytes(body),
+            truncated
+        )
\ No newline at end of file
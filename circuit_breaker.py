@@ -0,0 +1,117 @@
+# circuit_breaker.py - Per-domain, per-service circuit breakers
+import logging
+import threading
+import time
+
+class CircuitBreaker:
+    """Fails fast on routes that keep getting blocked or timing out
+
+    Each (service, domain) route has its own breaker. After failure_threshold
+    consecutive blocks or errors the breaker opens and requests on that route
+    are refused without touching the network. Once the cooldown has passed
+    the breaker goes half-open and lets a single probe through: success
+    closes it again, failure reopens it for another cooldown.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, config_manager):
+        self.config_manager = config_manager
+        self.enabled = config_manager.get_value("protection.circuit_breaker.enabled", True)
+        self.failure_threshold = config_manager.get_value("protection.circuit_breaker.failure_threshold", 5)
+        self.cooldown = config_manager.get_value("protection.circuit_breaker.cooldown", 60)
+        self.logger = logging.getLogger("CircuitBreaker")
+
+        self.breakers = {}
+        self._lock = threading.Lock()
+
+    def allow(self, service, domain):
+        """Check whether a request may be sent on a route, claiming the probe if half-open"""
+        if not self.enabled:
+            return True
+
+        with self._lock:
+            breaker = self._get_breaker(service, domain)
+            now = time.monotonic()
+
+            if breaker["state"] == self.CLOSED:
+                return True
+
+            if breaker["state"] == self.OPEN and now >= breaker["opened_at"] + self.cooldown:
+                breaker["state"] = self.HALF_OPEN
+                breaker["probe_started"] = now
+                self.logger.info(f"Circuit half-open for {service} on {domain}, sending probe")
+                return True
+
+            # Let another probe through if the last one never reported back
+            if breaker["state"] == self.HALF_OPEN and now >= breaker["probe_started"] + self.cooldown:
+                breaker["probe_started"] = now
+                return True
+
+            breaker["rejected"] += 1
+            return False
+
+    def record(self, service, domain, outcome):
+        """Record the outcome of a request (success, blocked or error)"""
+        if not self.enabled:
+            return
+
+        with self._lock:
+            breaker = self._get_breaker(service, domain)
+
+            if outcome == "success":
+                if breaker["state"] != self.CLOSED:
+                    self.logger.info(f"Circuit closed for {service} on {domain}")
+                breaker["state"] = self.CLOSED
+                breaker["failures"] = 0
+                return
+
+            breaker["failures"] += 1
+            if breaker["state"] == self.HALF_OPEN or breaker["failures"] >= self.failure_threshold:
+                if breaker["state"] != self.OPEN:
+                    breaker["opens"] += 1
+                    self.logger.warning(
+                        f"Circuit open for {service} on {domain} after {breaker['failures']} "
+                        f"consecutive failures, failing fast for {self.cooldown}s"
+                    )
+                breaker["state"] = self.OPEN
+                breaker["opened_at"] = time.monotonic()
+
+    def is_open(self, service, domain):
+        """Check whether a route is currently refusing requests"""
+        if not self.enabled:
+            return False
+
+        with self._lock:
+            breaker = self.breakers.get(f"{service}|{domain}")
+            if breaker is None or breaker["state"] == self.CLOSED:
+                return False
+            if breaker["state"] == self.OPEN:
+                return time.monotonic() < breaker["opened_at"] + self.cooldown
+            return True
+
+    def get_stats(self):
+        """Get state and counters for every route"""
+        with self._lock:
+            return {key: dict(breaker) for key, breaker in self.breakers.items()}
+
+    def reset(self):
+        """Close all breakers"""
+        with self._lock:
+            self.breakers = {}
+
+    def _get_breaker(self, service, domain):
+        """Get or create the breaker for a route"""
+        key = f"{service}|{domain}"
+        if key not in self.breakers:
+            self.breakers[key] = {
+                "state": self.CLOSED,
+                "failures": 0,
+                "opened_at": 0,
+                "probe_started": 0,
+                "opens": 0,
+                "rejected": 0
+            }
+        return self.breakers[key]
\ No newline at end of file
@@ -17,25 +17,113 @@ class ConfigManager:
             "enabled": True,
             "fingerprinting": True,
             "current_service": "Direct",
+            "pool_size": 10,
+            "max_concurrency": 10,
+            "max_per_domain": 2,
+            "max_body_bytes": 5242880,
+            "charset_detect_bytes": 65536,
+            "allowed_content_types": [
+                "text/html",
+                "application/xhtml+xml",
+                "application/json",
+                "text/plain",
+                "text/xml",
+                "application/xml",
+                "application/rss+xml",
+                "application/atom+xml"
+            ],
+            "transports": {
+                "default": "http1",
+                "amazon.com": "http2",
+                "ebay.com": "http2",
+                "indeed.com": "http2"
+            },
+            "rate_limits": {
+                "default": {
+                    "rate": 0.5,
+                    "burst": 2,
+                    "jitter": 0.5
+                }
+            },
+            "retry": {
+                "max_attempts": 3,
+                "base_delay": 1.0,
+                "max_delay": 30.0,
+                "max_retry_after": 120,
+                "statuses": [403, 429, 503],
+                "budget_ratio": 0.2,
+                "budget_min_per_second": 0.5,
+                "budget_cap": 10
+            },
+            "circuit_breaker": {
+                "enabled": True,
+                "failure_threshold": 5,
+                "cooldown": 60
+            },
+            "cache": {
+                "enabled": True,
+                "path": "http_cache.sqlite",
+                "max_bytes": 104857600,
+                "default_ttl": 3600,
+                "domain_ttls": {}
+            },
+            "routing": {
+                "mode": "adaptive",
+                "stats_file": "routing_stats.json",
+                "decay": 0.3,
+                "exploration": 0.1,
+                "quarantine_after": 3,
+                "cooldown": 300
+            },
+            "quota": {
+                "stats_file": "service_usage.json",
+                "soft_budget": 0.8
+            },
             "services": {
                 "BrightData": {
                     "enabled": False,
                     "username": "",
                     "password": "",
                     "host": "",
-                    "port": ""
+                    "port": "",
+                    "max_concurrency": 10,
+                    "quota_requests": 0,
+                    "quota_bytes": 0,
+                    "billing_period": "monthly"
                 },
                 "ScraperAPI": {
                     "enabled": False,
-                    "api_key": ""
+                    "api_key": "",
+                    "max_concurrency": 5,
+                    "quota_requests": 0,
+                    "quota_bytes": 0,
+                    "billing_period": "monthly"
                 }
             }
         },
+        "scraping": {
+            "source_timeout": 120,
+            "parser": "lxml",
+            "extraction_rules": "extraction_rules.json",
+            "parse_workers": 2,
+            "inline_parse_bytes": 65536,
+            "stream_parsing": False,
+            "feed_workers": 8,
+            "search_pages": 1,
+            "crawl_workers": 4,
+            "crawl_max_per_host": 2,
+            "craigslist_cities": ["sfbay", "newyork", "losangeles", "seattle", "chicago", "boston", "austin", "denver"],
+            "enrichment": {
+                "enabled": True,
+                "top_n": 20,
+                "cache_file": "job_details.json",
+                "cache_ttl": 604800,
+                "cache_max_entries": 5000
+            }
+        },
         "job_sources": {
             "Indeed": True,
             "RemoteOK": True,
-            "LinkedIn": True, 
-            "Freelancer": True,
             "Craigslist": True
         }
     }
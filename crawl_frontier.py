@@ -0,0 +1,137 @@
+# crawl_frontier.py - Prioritised URL frontier shared by the general crawler's workers
+import heapq
+import itertools
+import logging
+import threading
+import time
+from urllib.parse import urlparse
+from utils import canonicalize_url
+
+class CrawlFrontier:
+    """Queue of listing pages to crawl across every target site
+
+    Pages are handed out lowest page number first, so every site's first
+    pages are fetched before anyone's later ones, and pages from different
+    sites are crawled side by side. Each site (host) has a budget of
+    max_pages pages; URLs past it, or already seen, are not queued. At most
+    max_per_host pages of one host are handed out at once; the protection
+    layer's rate limiter paces the requests themselves.
+
+    Workers call get() for the next page, queue any pages it leads to, then
+    call done(). A page whose fetch has to back off is handed back with
+    retry() and not handed out again until its delay is up, so neither the
+    worker nor the host's slot waits on it. get() blocks while every queued
+    page's host is busy or backing off and returns None once the queue is
+    empty and nothing is in flight.
+    """
+
+    def __init__(self, max_pages, max_per_host=2):
+        self.max_pages = max_pages
+        self.max_per_host = max_per_host
+        self.logger = logging.getLogger("CrawlFrontier")
+
+        self.queue = []
+        self.seen = set()
+        self.scheduled = {}
+        self.in_flight = {}
+        self.closed = False
+        self._order = itertools.count()
+        self._condition = threading.Condition()
+
+    def add(self, url, page=1):
+        """Queue a page of a site, returning False if it was seen or is over the site's budget"""
+        host = urlparse(url).netloc
+        key = canonicalize_url(url)
+
+        with self._condition:
+            if self.closed or key in self.seen:
+                return False
+            if self.scheduled.get(host, 0) >= self.max_pages:
+                self.logger.debug(f"Page budget for {host} spent, skipping {url}")
+                return False
+
+            self.seen.add(key)
+            self.scheduled[host] = self.scheduled.get(host, 0) + 1
+            heapq.heappush(self.queue, (page, next(self._order), url, host, 0, None))
+            self._condition.notify()
+            return True
+
+    def retry(self, url, page, state, delay):
+        """Queue a page handed out by get() again once delay seconds have passed
+
+        state is handed back by get() with the page. Call this before done()
+        so the crawl is not seen as finished in between.
+        """
+        host = urlparse(url).netloc
+        with self._condition:
+            if self.closed:
+                return
+            not_before = time.monotonic() + delay
+            heapq.heappush(self.queue, (page, next(self._order), url, host, not_before, state))
+            self._condition.notify_all()
+
+    def get(self):
+        """Wait for the next page whose host has a free slot, as (url, page, retry state), or None when the crawl is over
+
+        The retry state is None for a first attempt and whatever was passed to
+        retry() otherwise.
+        """
+        with self._condition:
+            while True:
+                if self.closed:
+                    return None
+
+                now = time.monotonic()
+                entry = self._pop_ready(now)
+                if entry is not None:
+                    page, _, url, host, _, state = entry
+                    self.in_flight[host] = self.in_flight.get(host, 0) + 1
+                    return url, page, state
+
+                if not self.queue and not any(self.in_flight.values()):
+                    # Nothing left to hand out and nothing that could add more
+                    self._condition.notify_all()
+                    return None
+
+                # Wake up when a host frees a slot or the earliest backoff ends
+                backing_off = [entry[4] for entry in self.queue if entry[4] > now]
+                self._condition.wait(min(backing_off) - now if backing_off else None)
+
+    def done(self, url):
+        """Mark a page handed out by get() as crawled, freeing its host's slot"""
+        host = urlparse(url).netloc
+        with self._condition:
+            self.in_flight[host] -= 1
+            self._condition.notify_all()
+
+    def drop_site(self, host, after_page):
+        """Remove a host's queued pages numbered past after_page, returning how many were dropped"""
+        with self._condition:
+            kept = [entry for entry in self.queue if entry[3] != host or entry[0] <= after_page]
+            dropped = len(self.queue) - len(kept)
+            if dropped:
+                self.queue = kept
+                heapq.heapify(self.queue)
+                self._condition.notify_all()
+            return dropped
+
+    def close(self):
+        """Stop handing out pages, waking every waiting worker"""
+        with self._condition:
+            self.closed = True
+            self._condition.notify_all()
+
+    def _pop_ready(self, now):
+        """Pop the first queued page that is not backing off and whose host has a free slot, or None"""
+        skipped = []
+        entry = None
+        while self.queue:
+            candidate = heapq.heappop(self.queue)
+            if candidate[4] <= now and self.in_flight.get(candidate[3], 0) < self.max_per_host:
+                entry = candidate
+                break
+            skipped.append(candidate)
+
+        for candidate in skipped:
+            heapq.heappush(self.queue, candidate)
+        return entry
\ No newline at end of file
@@ -0,0 +1,158 @@
+"""
+Feed Sources Benchmark
+
+Compares the two ways of reading RemoteOK: parsing a large HTML search page
+built from the fixture page, and streaming the same number of listings from
+a JSON API response through FeedParser. Then fans a Craigslist search out
+over many city feeds served by a local server that answers each feed after
+a short delay, once with a single feed worker and once with
+scraping.feed_workers, and reports the wall time of each.
+"""
+
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add parent directory to path for imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Import project modules
+from config_manager import ConfigManager
+from extraction_rules import ExtractionRules
+from html_parser import HtmlParser
+from parse_stage import extract_remoteok_jobs
+from protection_service import ProtectionService
+from scrapers import CraigslistFeed, RemoteOKFeed
+from scrapers.feed_source import FeedParser
+from bench_targeted_parsing import build_large_page
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("FeedSourcesBenchmark")
+
+CITIES = [f"city{i}" for i in range(16)]
+
+def build_api_response(items):
+    """Build a RemoteOK API response with its legal notice and one listing per item"""
+    listings = [{"last_updated": 0, "legal": "API Terms of Service"}]
+    listings += [
+        {
+            "id": str(171234 + i),
+            "position": "Senior Python Engineer",
+            "company": "Acme Data",
+            "location": "Worldwide",
+            "description": "<p>Work on our ingestion platform.<br>Async Python, Postgres.</p>",
+            "salary_min": 120000,
+            "salary_max": 160000,
+            "tags": ["python", "postgres", "aws"]
+        }
+        for i in range(items)
+    ]
+    return json.dumps(listings).encode("utf-8")
+
+def build_city_feed(city, items=25):
+    """Build a Craigslist RSS feed for one city"""
+    entries = "".join(
+        f'<item><title>Python Developer {i} ({city})</title>'
+        f'<link>https://{city}.craigslist.org/sof/d/python-developer/{7700000000 + i}.html</link>'
+        f'<description>Backend role, Python and Django.</description></item>'
+        for i in range(items)
+    )
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>'
+        '<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" xmlns="http://purl.org/rss/1.0/">'
+        f'<channel><title>craigslist {city} | jobs</title></channel>{entries}</rdf:RDF>'
+    ).encode("utf-8")
+
+class FeedHandler(BaseHTTPRequestHandler):
+    """Serves a city's feed after a fixed delay"""
+    protocol_version = "HTTP/1.1"
+    delay = 0.2
+
+    def do_GET(self):
+        time.sleep(self.delay)
+        body = build_city_feed(self.path.strip("/"))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def time_remoteok(items=400, repeat=5):
+    """Time extracting the same listings from HTML and from the JSON API"""
+    html_page = build_large_page("remoteok_search.html", '<tr class="job"', '<tr class="expand"', items=items)
+    api_page = build_api_response(items)
+    parser = HtmlParser()
+    rules = ExtractionRules()
+    feed = RemoteOKFeed()
+
+    def read_html():
+        document = parser.parse_document(html_page, "utf-8", ["tr.job"])
+        return extract_remoteok_jobs(document, "https://remoteok.com/", [], rules)[0]
+
+    def read_api():
+        feed_parser = FeedParser()
+        entries = []
+        for i in range(0, len(api_page), 65536):
+            entries.extend(feed_parser.feed(api_page[i:i + 65536], "utf-8"))
+        entries.extend(feed_parser.close())
+        return [job for job in (feed.to_job(entry, RemoteOKFeed.API_URL) for entry in entries) if job]
+
+    results = {}
+    for name, page, read in (("html", html_page, read_html), ("api", api_page, read_api)):
+        start = time.process_time()
+        for _ in range(repeat):
+            jobs = read()
+        results[name] = (len(page), len(jobs), (time.process_time() - start) / repeat)
+    return results
+
+def time_craigslist():
+    """Time a Craigslist search over many city feeds with one and with several feed workers"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FeedHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    workdir = tempfile.mkdtemp()
+    config_manager = ConfigManager(os.path.join(workdir, "config.json"))
+    config_manager.set_value("protection.cache.enabled", False)
+    config_manager.set_value("protection.routing.stats_file", os.path.join(workdir, "routing_stats.json"))
+    config_manager.set_value("protection.quota.stats_file", os.path.join(workdir, "service_usage.json"))
+    protection_service = ProtectionService(config_manager)
+    protection_service.set_rate_limit("default", 10000, 10000, 0)
+
+    source = CraigslistFeed()
+    source.get_feed_urls = lambda keywords, location, config: [f"{base}/{city}" for city in CITIES]
+
+    results = {}
+    try:
+        for workers in (1, config_manager.get_value("scraping.feed_workers", 8)):
+            config_manager.set_value("scraping.feed_workers", workers)
+            start = time.perf_counter()
+            jobs = source.search(["python"], [], None, protection_service)
+            results[workers] = (len(jobs), time.perf_counter() - start)
+    finally:
+        protection_service.close()
+        server.shutdown()
+
+    return results
+
+if __name__ == "__main__":
+    logger.info("=== Starting Feed Sources Benchmark ===")
+    items = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    remoteok = time_remoteok(items)
+    craigslist = time_craigslist()
+
+    logger.info("=== Benchmark Results ===")
+    for name, (size, jobs, cpu) in remoteok.items():
+        logger.info(f"RemoteOK {name}: {jobs} jobs from {size / 1024:.0f} KB in {cpu * 1000:.1f} ms CPU")
+    for workers, (jobs, elapsed) in craigslist.items():
+        logger.info(f"Craigslist, {len(CITIES)} cities, {workers} feed workers: {jobs} jobs in {elapsed:.2f}s")
\ No newline at end of file
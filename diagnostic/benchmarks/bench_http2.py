@@ -0,0 +1,184 @@
+"""
+HTTP/2 Transport Benchmark
+
+Fetches many small pages from one host through ProtectionService with the
+http1 (requests) and http2 (httpx) transports, both serially and from a pool
+of worker threads. The local test server speaks TLS with ALPN so it can
+serve both protocols on one port, and counts accepted connections so the
+multiplexing is visible directly. Needs the openssl command line tool to
+create a throwaway certificate and the h2 package.
+"""
+
+import logging
+import os
+import socket
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import h2.config
+import h2.connection
+import h2.events
+
+# Add parent directory to path for imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+# Import project modules
+from protection_service import ProtectionService
+from config_manager import ConfigManager
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("Http2Benchmark")
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+PAGE = b"<html><body>" + b"<div class='s-item'>item</div>" * 50 + b"</body></html>"
+
+class DualProtocolHandler(BaseHTTPRequestHandler):
+    """Serves a small HTML page over HTTP/2 or HTTP/1.1, depending on ALPN"""
+    protocol_version = "HTTP/1.1"
+    connections = {"h2": 0, "http/1.1": 0}
+    lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def handle(self):
+        protocol = self.request.selected_alpn_protocol() or "http/1.1"
+        with DualProtocolHandler.lock:
+            DualProtocolHandler.connections[protocol] += 1
+
+        if protocol == "h2":
+            self.handle_h2()
+        else:
+            super().handle()
+
+    def handle_h2(self):
+        """Answer every stream on an HTTP/2 connection"""
+        conn = h2.connection.H2Connection(config=h2.config.H2Configuration(client_side=False))
+        conn.initiate_connection()
+        self.request.sendall(conn.data_to_send())
+
+        while True:
+            try:
+                data = self.request.recv(65535)
+            except (ConnectionError, ssl.SSLError):
+                return
+            if not data:
+                return
+
+            for event in conn.receive_data(data):
+                if isinstance(event, h2.events.RequestReceived):
+                    conn.send_headers(event.stream_id, [
+                        (":status", "200"),
+                        ("content-type", "text/html; charset=utf-8"),
+                        ("content-length", str(len(PAGE)))
+                    ])
+                    conn.send_data(event.stream_id, PAGE, end_stream=True)
+                elif isinstance(event, h2.events.ConnectionTerminated):
+                    return
+
+            self.request.sendall(conn.data_to_send())
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(PAGE)))
+        self.end_headers()
+        self.wfile.write(PAGE)
+
+    def log_message(self, format, *args):
+        pass
+
+def make_certificate(directory):
+    """Create a self-signed certificate for 127.0.0.1"""
+    cert_file = os.path.join(directory, "cert.pem")
+    key_file = os.path.join(directory, "key.pem")
+    subprocess.run(
+        [
+            "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes",
+            "-keyout", key_file, "-out", cert_file, "-days", "1",
+            "-subj", "/CN=127.0.0.1", "-addext", "subjectAltName=IP:127.0.0.1"
+        ],
+        check=True,
+        capture_output=True
+    )
+    return cert_file, key_file
+
+def start_server(cert_file, key_file):
+    """Start the local TLS test server on a free port"""
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert_file, key_file)
+    context.set_alpn_protocols(["h2", "http/1.1"])
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), DualProtocolHandler)
+    server.socket = context.wrap_socket(server.socket, server_side=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+def run_benchmark(protection_service, urls, workers):
+    """Fetch urls with a number of worker threads and return elapsed time and connections"""
+    DualProtocolHandler.connections = {"h2": 0, "http/1.1": 0}
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pages = list(executor.map(protection_service.get_bytes_with_protection, urls))
+
+    elapsed = time.perf_counter() - start
+    failed = sum(1 for page in pages if page is None)
+    return elapsed, dict(DualProtocolHandler.connections), failed
+
+def benchmark_http2(requests_count=500, workers=8):
+    """Benchmark the http1 and http2 transports against the same host"""
+    workdir = tempfile.mkdtemp()
+    cert_file, key_file = make_certificate(workdir)
+
+    # Trust the throwaway certificate in both clients
+    os.environ["REQUESTS_CA_BUNDLE"] = cert_file
+    os.environ["SSL_CERT_FILE"] = cert_file
+
+    server = start_server(cert_file, key_file)
+    host = f"127.0.0.1:{server.server_address[1]}"
+
+    config_manager = ConfigManager(os.path.join(workdir, "config.json"))
+    config_manager.set_value("protection.cache.enabled", False)
+    config_manager.set_value("protection.routing.stats_file", os.path.join(workdir, "routing_stats.json"))
+    config_manager.set_value("protection.pool_size", workers)
+
+    results = {}
+    try:
+        for transport in ["http1", "http2"]:
+            for mode, threads in [("serial", 1), (f"{workers} threads", workers)]:
+                protection_service = ProtectionService(config_manager)
+                protection_service.set_rate_limit("default", 10000, 10000, 0)
+                protection_service.set_transport(host, transport)
+
+                # Unique URLs so nothing is coalesced or cached
+                urls = [f"https://{host}/sch?_nkw=laptop&_pgn={i}" for i in range(requests_count)]
+                try:
+                    results[f"{transport} {mode}"] = run_benchmark(protection_service, urls, threads)
+                finally:
+                    protection_service.close()
+    finally:
+        server.shutdown()
+
+    return results
+
+if __name__ == "__main__":
+    logger.info("=== Starting HTTP/2 Transport Benchmark ===")
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    results = benchmark_http2(count)
+
+    logger.info("=== Benchmark Results ===")
+    for name, (elapsed, connections, failed) in results.items():
+        logger.info(
+            f"{name}: {count} requests in {elapsed:.3f}s "
+            f"({elapsed / count * 1000:.2f} ms/request, connections {connections}, {failed} failed)"
+        )
\ No newline at end of file
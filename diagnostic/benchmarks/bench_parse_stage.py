@@ -0,0 +1,87 @@
+"""
+Parse Stage Benchmark
+
+Hands a burst of large search pages to ScraperEngine's parse stage from
+several threads at once, the way concurrent fetches deliver them, first
+with every page parsed inline and then with the process pool. Reports the
+wall time, the pages sent to each path and whether both produce the same
+records. The speedup is bounded by the number of CPU cores available.
+"""
+
+import logging
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add parent directory to path for imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Import project modules
+from config_manager import ConfigManager
+from scraper_engine import ScraperEngine
+from bench_targeted_parsing import build_large_page
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("ParseStageBenchmark")
+
+URL = "https://www.ebay.com/sch/i.html?_nkw=laptop"
+
+def run_burst(workers, pages, threads):
+    """Parse every page through the parse stage from a number of threads"""
+    config_manager = ConfigManager(os.path.join(tempfile.mkdtemp(), "config.json"))
+    config_manager.set_value("scraping.parse_workers", workers)
+    engine = ScraperEngine(config_manager, None, None)
+
+    try:
+        targets = engine._get_parse_targets(URL)
+
+        # Start the pool before timing so process start-up is not counted
+        if workers:
+            engine.parse_stage.parse("listing", pages[0], URL, targets)
+            engine.parse_stage.stats = {"inline": 0, "pool": 0}
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            results = list(executor.map(lambda page: engine.parse_stage.parse("listing", page, URL, targets), pages))
+        elapsed = time.perf_counter() - start
+        return elapsed, engine.parse_stage.get_stats(), results
+    finally:
+        engine.parse_stage.close()
+
+def benchmark_parse_stage(page_count=24, threads=8):
+    """Benchmark inline parsing against the process pool"""
+    body = build_large_page("ebay_search.html", '<li class="s-item', "</li>")
+    pages = [(body, "utf-8")] * page_count
+    workers = os.cpu_count() or 1
+
+    inline_time, inline_stats, inline_results = run_burst(0, pages, threads)
+    pool_time, pool_stats, pool_results = run_burst(workers, pages, threads)
+
+    return {
+        "page_size": len(body),
+        "workers": workers,
+        "inline": (inline_time, inline_stats),
+        "pool": (pool_time, pool_stats),
+        "identical": inline_results == pool_results
+    }
+
+if __name__ == "__main__":
+    logger.info("=== Starting Parse Stage Benchmark ===")
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 24
+    result = benchmark_parse_stage(count)
+
+    logger.info("=== Benchmark Results ===")
+    for name in ["inline", "pool"]:
+        elapsed, stats = result[name]
+        logger.info(
+            f"{name}: {count} pages of {result['page_size'] / 1024:.0f} KB in {elapsed:.3f}s "
+            f"({elapsed / count * 1000:.1f} ms/page, inline {stats['inline']}, pool {stats['pool']})"
+        )
+    logger.info(
+        f"Speedup with {result['workers']} workers: {result['inline'][0] / result['pool'][0]:.2f}x, "
+        f"records identical: {result['identical']}"
+    )
\ No newline at end of file
@@ -0,0 +1,111 @@
+"""
+Session Pooling Benchmark
+
+Compares bare requests.get calls against the pooled sessions owned by
+ProtectionService, using a local keep-alive HTTP server. The server counts
+accepted connections so the handshake savings are visible directly.
+"""
+
+import logging
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+import requests
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add parent directory to path for imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+# Import project modules
+from protection_service import ProtectionService
+from config_manager import ConfigManager
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("SessionPoolBenchmark")
+
+PAGE = b"<html><body>" + b"<div class='job_seen_beacon'>job</div>" * 50 + b"</body></html>"
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    """Serves a small HTML page over HTTP/1.1 keep-alive"""
+    protocol_version = "HTTP/1.1"
+    connections = 0
+    lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        # Disable Nagle so keep-alive responses are not held back by delayed ACKs
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with KeepAliveHandler.lock:
+            KeepAliveHandler.connections += 1
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(PAGE)))
+        self.end_headers()
+        self.wfile.write(PAGE)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_server():
+    """Start the local test server on a free port"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+def run_benchmark(fetch, url, requests_count):
+    """Run a fetch function repeatedly and return elapsed time and connections"""
+    KeepAliveHandler.connections = 0
+    start = time.perf_counter()
+
+    for _ in range(requests_count):
+        fetch(url)
+
+    elapsed = time.perf_counter() - start
+    return elapsed, KeepAliveHandler.connections
+
+def benchmark_session_pool(requests_count=500):
+    """Benchmark bare requests against pooled sessions"""
+    server = start_server()
+    url = f"http://127.0.0.1:{server.server_address[1]}/jobs?q=python"
+
+    config_manager = ConfigManager(os.path.join(tempfile.mkdtemp(), "config.json"))
+    protection_service = ProtectionService(config_manager)
+    session = protection_service.transports["http1"].get_session("Direct")
+    headers = protection_service._get_headers()
+
+    results = {}
+    try:
+        results["bare requests.get"] = run_benchmark(
+            lambda u: requests.get(u, headers=headers, timeout=30),
+            url,
+            requests_count
+        )
+        results["pooled session"] = run_benchmark(
+            lambda u: session.get(u, headers=headers, timeout=30),
+            url,
+            requests_count
+        )
+    finally:
+        protection_service.close()
+        server.shutdown()
+
+    return results
+
+if __name__ == "__main__":
+    logger.info("=== Starting Session Pool Benchmark ===")
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    results = benchmark_session_pool(count)
+
+    logger.info("=== Benchmark Results ===")
+    for name, (elapsed, connections) in results.items():
+        logger.info(
+            f"{name}: {count} requests in {elapsed:.3f}s "
+            f"({elapsed / count * 1000:.2f} ms/request, {connections} connections)"
+        )
\ No newline at end of file
@@ -0,0 +1,138 @@
+"""
+Streaming Parse Benchmark
+
+Serves a large search page built from the fixture pages from a local server
+that sends it in chunks with a short pause between them, like a slow
+connection, and extracts it through ProtectionService twice: buffered
+(download, then parse) and streamed into the incremental parser. Reports
+the time to the first record, the total time and the peak traced memory of
+each, and checks both extract identical records.
+"""
+
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add parent directory to path for imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Import project modules
+from config_manager import ConfigManager
+from protection_service import ProtectionService
+from scraper_engine import ScraperEngine
+from stream_parser import StreamingExtractor
+from bench_targeted_parsing import build_large_page
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("StreamParsingBenchmark")
+
+URL = "https://www.ebay.com/sch/i.html?_nkw=laptop"
+
+class SlowPageHandler(BaseHTTPRequestHandler):
+    """Sends one page in 64 KB chunks with a pause after each"""
+    protocol_version = "HTTP/1.1"
+    page = b""
+    pause = 0.02
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(self.page)))
+        self.end_headers()
+
+        for i in range(0, len(self.page), 65536):
+            self.wfile.write(self.page[i:i + 65536])
+            self.wfile.flush()
+            time.sleep(self.pause)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_server():
+    """Start the local test server on a free port"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowPageHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+def run_buffered(protection_service, engine, url, targets):
+    """Download the whole page, then parse it"""
+    first = []
+    start = time.perf_counter()
+    page = protection_service.get_bytes_with_protection(url)
+    result = engine.parse_stage.parse("listing", page, URL, targets)
+    if result["records"]:
+        first.append(time.perf_counter() - start)
+    return result, first[0] if first else None, time.perf_counter() - start
+
+def run_streamed(protection_service, engine, url, targets):
+    """Parse the page while it downloads"""
+    first = []
+    start = time.perf_counter()
+    extractor = StreamingExtractor(
+        "listing", URL, targets, engine.extraction_rules, engine.html_parser,
+        on_record=lambda record: first or first.append(time.perf_counter() - start)
+    )
+    protection_service.stream_with_protection(url, extractor.feed)
+    result = extractor.close()
+    return result, first[0] if first else None, time.perf_counter() - start
+
+def measure(run, *args):
+    """Run once for timing, then again under tracemalloc for peak memory"""
+    result, first, total = run(*args)
+    tracemalloc.start()
+    run(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, first, total, peak
+
+def benchmark_stream_parsing(items=400):
+    """Benchmark buffered against streamed extraction of one large page"""
+    SlowPageHandler.page = build_large_page("ebay_search.html", '<li class="s-item', "</li>", items=items)
+    server = start_server()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    workdir = tempfile.mkdtemp()
+    config_manager = ConfigManager(os.path.join(workdir, "config.json"))
+    config_manager.set_value("protection.cache.enabled", False)
+    config_manager.set_value("protection.routing.stats_file", os.path.join(workdir, "routing_stats.json"))
+    config_manager.set_value("protection.quota.stats_file", os.path.join(workdir, "service_usage.json"))
+    config_manager.set_value("scraping.parse_workers", 0)
+
+    protection_service = ProtectionService(config_manager)
+    protection_service.set_rate_limit("default", 10000, 10000, 0)
+    engine = ScraperEngine(config_manager, None, protection_service)
+    targets = engine._get_parse_targets(URL)
+
+    try:
+        results = {
+            "buffered": measure(run_buffered, protection_service, engine, f"{base}/page?buffered", targets),
+            "streamed": measure(run_streamed, protection_service, engine, f"{base}/page?streamed", targets)
+        }
+    finally:
+        protection_service.close()
+        server.shutdown()
+
+    return len(SlowPageHandler.page), results
+
+if __name__ == "__main__":
+    logger.info("=== Starting Streaming Parse Benchmark ===")
+    items = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    size, results = benchmark_stream_parsing(items)
+
+    logger.info("=== Benchmark Results ===")
+    for name, (result, first, total, peak) in results.items():
+        logger.info(
+            f"{name}: {len(result['records'])} records from {size / 1024:.0f} KB, "
+            f"first record {first:.3f}s, total {total:.3f}s, peak memory {peak / 1024 / 1024:.1f} MB"
+        )
+    buffered, streamed = results["buffered"][0], results["streamed"][0]
+    identical = buffered["records"] == streamed["records"] and buffered["next_page"] == streamed["next_page"]
+    logger.info(f"Records identical: {identical}")
\ No newline at end of file
@@ -0,0 +1,147 @@
+"""
+Targeted Parsing Benchmark
+
+Builds large search pages from the fixture pages (many listing items
+surrounded by the navigation, carousels, inline scripts and footer markup
+that make up most of a real search page) and parses them with and without
+the per-site parse targets used by ScraperEngine. Reports CPU time, peak
+traced memory and the number of tags built, and checks that both parses
+extract identical records.
+"""
+
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Add parent directory to path for imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+# Import project modules
+from config_manager import ConfigManager
+from html_parser import HtmlParser
+from scraper_engine import ScraperEngine
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("TargetedParsingBenchmark")
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "..", "fixtures")
+
+# Listing item markup to repeat and the URL each page is extracted as
+PAGES = {
+    "ebay": ("ebay_search.html", "https://www.ebay.com/sch/i.html?_nkw=laptop", '<li class="s-item', "</li>"),
+    "amazon": (
+        "amazon_search.html",
+        "https://www.amazon.com/s?k=laptop",
+        '<div data-asin="B0ABC12345"',
+        '<div data-asin="B0DEF67890"'
+    )
+}
+
+NOISE_BLOCK = (
+    '<div class="carousel"><ul>'
+    + ''.join(
+        f'<li class="card"><a href="/rec/{i}"><img src="/img/{i}.jpg" alt="Recommended {i}">'
+        f'<span class="label">Recommended item {i}</span></a><div class="meta"><span>4.{i % 10} stars</span>'
+        f'<span>{i * 7} reviews</span></div></li>'
+        for i in range(40)
+    )
+    + '</ul></div>\n'
+)
+
+SCRIPT_BLOCK = "<script>window.__data = {" + ",".join(f'"k{i}": [{i}, "v{i}"]' for i in range(2000)) + "};</script>\n"
+
+def build_large_page(fixture, item_start, item_end, items=120, noise_blocks=60):
+    """Repeat a fixture's first listing item and pad the page with unrelated markup"""
+    with open(os.path.join(FIXTURE_DIR, fixture), "rb") as f:
+        page = f.read().decode("utf-8")
+
+    start = page.index(item_start)
+    end = page.index(item_end, start + len(item_start))
+    if item_end == "</li>":
+        end += len(item_end)
+    item = page[start:end]
+
+    body_start = page.index("<body>") + len("<body>")
+    header = SCRIPT_BLOCK * 3 + NOISE_BLOCK * (noise_blocks // 2)
+    footer = NOISE_BLOCK * (noise_blocks // 2) + SCRIPT_BLOCK * 3
+
+    page = page[:start] + item * items + page[start:]
+    page = page[:body_start] + header + page[body_start:]
+    page = page.replace("</body>", footer + "</body>")
+    return page.encode("utf-8")
+
+def count_tags(document):
+    """Count the elements in a parsed tree"""
+    return len(document.root.find_all(True))
+
+def measure(parse, repeat):
+    """Return the best CPU time and the peak traced memory of a parse"""
+    best = None
+    for _ in range(repeat):
+        start = time.process_time()
+        parse()
+        elapsed = time.process_time() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    result = parse()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak, result
+
+def benchmark_targeted_parsing(repeat=5):
+    """Benchmark full against targeted parsing for each backend and site"""
+    config_manager = ConfigManager(os.path.join(tempfile.mkdtemp(), "config.json"))
+    engine = ScraperEngine(config_manager, None, None)
+    results = []
+
+    for backend in ["lxml", "html.parser"]:
+        parser = HtmlParser(backend=backend)
+        if parser.backend != backend:
+            continue
+
+        for site, (fixture, url, item_start, item_end) in PAGES.items():
+            body = build_large_page(fixture, item_start, item_end)
+            targets = engine._get_parse_targets(url)
+
+            full_time, full_peak, full_doc = measure(lambda: parser.parse_document(body, "utf-8"), repeat)
+            target_time, target_peak, target_doc = measure(
+                lambda: parser.parse_document(body, "utf-8", targets), repeat
+            )
+
+            rules = engine.extraction_rules
+            full_records = rules.extract(full_doc, url, [])
+            target_records = rules.extract(target_doc, url, [])
+
+            results.append({
+                "backend": backend,
+                "site": site,
+                "size": len(body),
+                "full": (full_time, full_peak, count_tags(full_doc)),
+                "targeted": (target_time, target_peak, count_tags(target_doc)),
+                "records": len(full_records),
+                "identical": full_records == target_records
+                    and rules.find_next_page(full_doc, url) == rules.find_next_page(target_doc, url)
+            })
+
+    return results
+
+if __name__ == "__main__":
+    logger.info("=== Starting Targeted Parsing Benchmark ===")
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    results = benchmark_targeted_parsing(repeat)
+
+    logger.info("=== Benchmark Results ===")
+    for result in results:
+        full_time, full_peak, full_tags = result["full"]
+        target_time, target_peak, target_tags = result["targeted"]
+        logger.info(
+            f"{result['backend']} {result['site']} ({result['size'] / 1024:.0f} KB, {result['records']} records): "
+            f"full {full_time * 1000:.1f} ms, {full_peak / 1024 / 1024:.1f} MB, {full_tags} tags; "
+            f"targeted {target_time * 1000:.1f} ms, {target_peak / 1024 / 1024:.1f} MB, {target_tags} tags; "
+            f"records identical: {result['identical']}"
+        )
\ No newline at end of file
@@ -0,0 +1,167 @@
+"""
+Parser Conformance Check
+
+Runs the job and product extractors over the fixture pages in fixtures/
+with every available HTML parser backend and checks that each backend
+produces exactly the same records and next-page links as lxml, the
+default. Also checks that pages read through the embedded-JSON fast path
+give the same records as the selectors do on the same page. Exits with
+status 1 if anything disagrees.
+"""
+
+import json
+import logging
+import os
+import sys
+import tempfile
+
+# Add parent directory to import path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Import project modules
+from config_manager import ConfigManager
+from html_parser import HtmlParser
+from parse_stage import EMBEDDED, parse_records
+from scraper_engine import ScraperEngine
+from scrapers import IndeedScraper, RemoteOKScraper
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("ParserConformance")
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+# Fixture served for each page URL the extractors ask for
+FIXTURES = {
+    "www.indeed.com": "indeed_search.html",
+    "remoteok.com": "remoteok_search.html",
+    "www.ebay.com": "ebay_search.html",
+    "www.amazon.com": "amazon_search.html",
+    "shop.example.com": "generic_search.html"
+}
+
+# Pages with embedded JSON, as (fixture, page kind, URL)
+EMBEDDED_FIXTURES = [
+    ("indeed_search_embedded.html", "indeed", "https://www.indeed.com/jobs?q=python"),
+    ("amazon_search_embedded.html", "listing", "https://www.amazon.com/s?k=laptop")
+]
+
+# Listing pages run through parse_records, as the engine's parse stage does
+LISTING_URLS = [
+    "https://www.ebay.com/sch/i.html?_nkw=laptop",
+    "https://www.amazon.com/s?k=laptop",
+    "https://shop.example.com/search?q=desk"
+]
+
+class FixtureProtectionService:
+    """Serves fixture pages in place of the network"""
+
+    def __init__(self, config_manager):
+        self.config_manager = config_manager
+
+    def get_bytes_with_protection(self, url, headers=None, bypass_cache=False):
+        """Return the fixture page for url's domain as (body, encoding)"""
+        domain = url.split("/")[2]
+        with open(os.path.join(FIXTURE_DIR, FIXTURES[domain]), "rb") as f:
+            return f.read(), "utf-8"
+
+def extract_all(backend):
+    """Run every extractor over the fixtures with one backend"""
+    config_manager = ConfigManager(os.path.join(tempfile.mkdtemp(), "config.json"))
+    config_manager.set_value("scraping.parser", backend)
+    protection_service = FixtureProtectionService(config_manager)
+    engine = ScraperEngine(config_manager, None, protection_service)
+    state = {"parser": engine.html_parser, "rules": engine.extraction_rules}
+
+    records = {
+        "indeed": IndeedScraper().search(["python"], [], None, protection_service),
+        "remoteok": RemoteOKScraper().search(["python"], [], None, protection_service)
+    }
+
+    for url in LISTING_URLS:
+        body, encoding = protection_service.get_bytes_with_protection(url)
+        parsed = parse_records("listing", body, encoding, url, engine._get_parse_targets(url), [], state)
+        records[url] = {"records": parsed["records"], "next_page": parsed["next_page"]}
+
+    return records
+
+def run_conformance():
+    """Compare every available backend against lxml"""
+    backends = [
+        backend for backend in HtmlParser.BACKENDS
+        if HtmlParser(backend=backend).backend == backend
+    ]
+    logger.info(f"Backends available: {', '.join(backends)}")
+
+    reference = extract_all("lxml")
+    failures = 0
+
+    for name, records in reference.items():
+        count = len(records["records"]) if isinstance(records, dict) else len(records)
+        logger.info(f"{name}: {count} records with lxml")
+
+    for backend in backends:
+        if backend == "lxml":
+            continue
+
+        results = extract_all(backend)
+        for name, expected in reference.items():
+            if results[name] == expected:
+                logger.info(f"{backend} matches lxml on {name}")
+            else:
+                failures += 1
+                logger.error(
+                    f"{backend} differs from lxml on {name}:\n"
+                    f"lxml: {json.dumps(expected, indent=2, ensure_ascii=False)}\n"
+                    f"{backend}: {json.dumps(results[name], indent=2, ensure_ascii=False)}"
+                )
+
+    return failures
+
+def check_embedded():
+    """Compare the embedded-JSON path with the selectors on pages that have both"""
+    config_manager = ConfigManager(os.path.join(tempfile.mkdtemp(), "config.json"))
+    engine = ScraperEngine(config_manager, None, None)
+    state = {"parser": engine.html_parser, "rules": engine.extraction_rules}
+    failures = 0
+
+    for fixture, kind, url in EMBEDDED_FIXTURES:
+        with open(os.path.join(FIXTURE_DIR, fixture), "rb") as f:
+            body = f.read()
+
+        # Hide the blob's marker so the same page falls back to the selectors
+        if kind == "listing":
+            marker = engine.extraction_rules.get_rule(url).embedded.marker
+        else:
+            marker = EMBEDDED[kind].marker
+        hidden = body.replace(marker, b"<script>")
+
+        data_points = ["rating", "review_count"]
+        targets = engine._get_parse_targets(url)
+        embedded = parse_records(kind, body, "utf-8", url, targets, data_points, state)
+        selectors = parse_records(kind, hidden, "utf-8", url, targets, data_points, state)
+
+        if embedded["path"] != "embedded" or selectors["path"] != "selectors":
+            failures += 1
+            logger.error(f"{fixture}: expected the embedded and selector paths, got {embedded['path']} and {selectors['path']}")
+        elif {**embedded, "path": None} != {**selectors, "path": None}:
+            failures += 1
+            logger.error(
+                f"Embedded JSON differs from selectors on {fixture}:\n"
+                f"embedded: {json.dumps(embedded, indent=2, ensure_ascii=False)}\n"
+                f"selectors: {json.dumps(selectors, indent=2, ensure_ascii=False)}"
+            )
+        else:
+            logger.info(f"Embedded JSON matches selectors on {fixture} ({len(embedded['records'])} records)")
+
+    return failures
+
+if __name__ == "__main__":
+    logger.info("=== Starting Parser Conformance Check ===")
+    failures = run_conformance() + check_embedded()
+
+    if failures:
+        logger.error(f"{failures} mismatches found")
+        sys.exit(1)
+
+    logger.info("All backends and extraction paths produce identical records")
\ No newline at end of file
@@ -12,7 +12,6 @@ import random
 import requests
 import time
 import hashlib
-from bs4 import BeautifulSoup
 import sys
 
 # Add parent directory to import path
@@ -21,6 +20,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 # Import project modules
 from protection_service import ProtectionService
 from config_manager import ConfigManager
+from scrapers import IndeedScraper
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -150,6 +150,7 @@ class ResilientScraper:
         self.config_manager = config_manager
         self.protection_service = ProtectionService(config_manager)
         self.header_selector = AdaptiveHeaderSelector()
+        self.indeed = IndeedScraper()
         self.fallback_enabled = True
         
     def get_page(self, url):
@@ -235,12 +236,8 @@ class ResilientScraper:
         return None
     
     def search_jobs(self, query, location=None):
-        """Search for jobs with the query (resilient implementation)"""
-        # Build search URL
-        if location:
-            url = f"https://www.indeed.com/jobs?q={query.replace(' ', '+')}&l={location.replace(' ', '+')}"
-        else:
-            url = f"https://www.indeed.com/jobs?q={query.replace(' ', '+')}&remotejob=032b3046-06a3-4876-8dfd-474eb5e7ed11"
+        """Search Indeed for jobs with the query (resilient implementation)"""
+        url = self.indeed.search_url([query], [], location)
         
         # Get the page content
         html = self.get_page(url)
@@ -249,52 +246,8 @@ class ResilientScraper:
             logger.warning("Failed to get search results")
             return []
         
-        # Parse the HTML with BeautifulSoup
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        # Extract job listings
-        job_cards = soup.select("div.job_seen_beacon")
-        
-        jobs = []
-        for card in job_cards:
-            try:
-                # Extract job details
-                title_elem = card.select_one("h2.jobTitle span")
-                company_elem = card.select_one("span.companyName")
-                location_elem = card.select_one("div.companyLocation")
-                
-                # Get job URL
-                job_link_elem = card.select_one("h2.jobTitle a")
-                job_url = ""
-                
-                if job_link_elem and job_link_elem.has_attr("href"):
-                    job_path = job_link_elem["href"]
-                    if job_path.startswith("/"):
-                        job_url = f"https://www.indeed.com{job_path}"
-                    else:
-                        job_url = job_path
-                
-                # Get job description snippet
-                snippet_elem = card.select_one("div.job-snippet")
-                
-                # Get salary if available
-                salary_elem = card.select_one("div.salary-snippet-container")
-                
-                # Create job object
-                job = {
-                    "title": title_elem.text.strip() if title_elem else "Unknown",
-                    "company": company_elem.text.strip() if company_elem else "Unknown",
-                    "location": location_elem.text.strip() if location_elem else "Unknown",
-                    "url": job_url,
-                    "description": snippet_elem.text.strip() if snippet_elem else "",
-                    "salary": salary_elem.text.strip() if salary_elem else "Not specified",
-                    "source": "Indeed"
-                }
-                
-                jobs.append(job)
-            
-            except Exception as e:
-                logger.error(f"Error parsing job card: {e}")
+        # Extract job listings the same way the Indeed scraper does
+        jobs = self.indeed.parse_search_page((html.encode("utf-8"), "utf-8"), url, self.config_manager)
         
         logger.info(f"Found {len(jobs)} jobs")
         return jobs
@@ -72,7 +72,9 @@ def run_all_tests():
         "test_fingerprinting.py",
         "test_protection_layer.py",
         "test_header_combinations.py",
-        "test_request_timing.py"
+        "test_request_timing.py",
+        "test_single_flight.py",
+        "test_feed_parser.py"
     ]
     
     results = []
@@ -0,0 +1,59 @@
+import json
+import logging
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+# Import project modules
+from scrapers.feed_source import FeedParser
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger("FeedParserTest")
+
+FEED = [12, -3.5e2, "a,b]", {"id": 7, "tags": ["x", "y"]}, [1, [2]], True, None, 45]
+
+def parse_chunks(chunks):
+    """Feed chunks through a FeedParser, returning every entry it produced"""
+    parser = FeedParser()
+    entries = []
+    for chunk in chunks:
+        entries.extend(parser.feed(chunk))
+    entries.extend(parser.close())
+    return entries
+
+def test_number_split_across_chunks():
+    """A number cut by a chunk boundary is decoded whole"""
+    entries = parse_chunks([b"[1", b"2]"])
+    logger.info(f"[1 + 2] gave {entries}")
+    assert entries == [12]
+
+def test_every_chunk_boundary():
+    """Splitting a JSON feed at any byte gives the same entries as reading it whole"""
+    body = json.dumps(FEED).encode("utf-8")
+    for split in range(1, len(body)):
+        entries = parse_chunks([body[:split], body[split:]])
+        assert entries == FEED, f"split at {split}: {entries}"
+
+    # One byte at a time
+    entries = parse_chunks([body[i:i + 1] for i in range(len(body))])
+    assert entries == FEED, f"byte by byte: {entries}"
+
+def test_unclosed_array_keeps_last_number():
+    """A feed cut off after a number still returns that number when it ends"""
+    entries = parse_chunks([b"[1, 2", b"3"])
+    logger.info(f"Unclosed [1, 23 gave {entries}")
+    assert entries == [1, 23]
+
+if __name__ == "__main__":
+    logger.info("=== Starting Feed Parser Test ===")
+    try:
+        test_number_split_across_chunks()
+        test_every_chunk_boundary()
+        test_unclosed_array_keeps_last_number()
+        logger.info("Test result: SUCCESS")
+    except AssertionError:
+        logger.error("Test result: FAILED", exc_info=True)
+        sys.exit(1)
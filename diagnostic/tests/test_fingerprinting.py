@@ -28,7 +28,7 @@ def test_fingerprinting_only():
     # Test request with fingerprinting
     url = "https://www.indeed.com/jobs?q=python+developer"
     logger.info("Testing request with fingerprinting only (no proxy)...")
-    html = protection_service.get_with_protection(url)
+    html = protection_service.get_with_protection(url, bypass_cache=True)
     
     # Process results
     if html:
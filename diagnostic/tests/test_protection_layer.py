@@ -30,7 +30,7 @@ def test_protection_layer():
     # Test request through protection layer without fingerprinting
     url = "https://www.indeed.com/jobs?q=python+developer"
     logger.info("Testing protection layer without fingerprinting...")
-    html = protection_service.get_with_protection(url)
+    html = protection_service.get_with_protection(url, bypass_cache=True)
     
     # Process results
     if html:
@@ -46,7 +46,7 @@ def test_protection_layer():
     protection_service.set_fingerprinting(True)
     
     logger.info("Testing protection layer with fingerprinting...")
-    html = protection_service.get_with_protection(url)
+    html = protection_service.get_with_protection(url, bypass_cache=True)
     
     # Process results
     if html:
@@ -0,0 +1,93 @@
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add parent directory to path for imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+# Import project modules
+from protection_service import ProtectionService
+from config_manager import ConfigManager
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger("SingleFlightTest")
+
+PAGE = b"<html><body><div class='job_seen_beacon'>job</div></body></html>"
+
+class SlowHandler(BaseHTTPRequestHandler):
+    """Serves a page slowly enough for concurrent callers to overlap, counting hits"""
+    hits = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with SlowHandler.lock:
+            SlowHandler.hits += 1
+        time.sleep(0.5)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(PAGE)))
+        self.end_headers()
+        self.wfile.write(PAGE)
+
+    def log_message(self, format, *args):
+        pass
+
+def make_protection_service():
+    """Build a protection service whose state files live in a throwaway directory"""
+    state_dir = tempfile.mkdtemp()
+    config_manager = ConfigManager(os.path.join(state_dir, "config.json"))
+    config_manager.set_value("protection.cache.enabled", False)
+    config_manager.set_value("protection.routing.stats_file", os.path.join(state_dir, "routing_stats.json"))
+    config_manager.set_value("protection.quota.stats_file", os.path.join(state_dir, "service_usage.json"))
+    return ProtectionService(config_manager)
+
+def test_sync_and_async_share_fetch():
+    """One sync and one async caller asking for the same URL cause a single upstream hit"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/jobs?q=python"
+
+    SlowHandler.hits = 0
+    protection_service = make_protection_service()
+    start = threading.Barrier(2)
+    results = {}
+
+    def sync_caller():
+        start.wait()
+        results["sync"] = protection_service.get_with_protection(url)
+
+    def async_caller():
+        start.wait()
+        for _, html in protection_service.get_many_with_protection([url]):
+            results["async"] = html
+
+    threads = [threading.Thread(target=sync_caller), threading.Thread(target=async_caller)]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        protection_service.close()
+        server.shutdown()
+
+    stats = protection_service.single_flight.get_stats()
+    logger.info(f"Upstream hits: {SlowHandler.hits}, single-flight stats: {stats}")
+
+    assert results.get("sync") and results.get("sync") == results.get("async")
+    assert SlowHandler.hits == 1
+    assert stats["shared"] == 1
+
+if __name__ == "__main__":
+    logger.info("=== Starting Single-Flight Test ===")
+    try:
+        test_sync_and_async_share_fetch()
+        logger.info("Test result: SUCCESS")
+    except AssertionError:
+        logger.error("Test result: FAILED", exc_info=True)
+        sys.exit(1)
@@ -0,0 +1,127 @@
+# embedded_json.py - Reads listing records from JSON blobs pages embed in <script> tags
+import html
+import json
+import logging
+import re
+
+TAG = re.compile(r'<[^>]+>')
+
+class EmbeddedJson:
+    """Extracts records from a JSON blob embedded in a page, without building a DOM
+
+    A spec names the marker that precedes the blob, the dot-separated path to
+    the list of listings inside it, and the fields read from each listing:
+
+        {
+            "marker": "window.mosaic.providerData[\\"mosaic-provider-jobcards\\"]=",
+            "records": "metaData.mosaicProviderJobCardsModel.results",
+            "fields": {
+                "title": "title",
+                "url": {"path": "jobkey", "prefix": "https://www.indeed.com/viewjob?jk="},
+                "description": {"path": "snippet", "html": true}
+            },
+            "extra_fields": {"rating": "rating.displayString"},
+            "source": "Indeed"
+        }
+
+    Field specs may also give a default for missing values (otherwise "").
+    html fields have their tags stripped and entities decoded. Extra fields
+    are only read when asked for and only set when present. The blob is found
+    with a plain byte search and only the blob itself is decoded.
+    """
+
+    def __init__(self, spec):
+        self.marker = spec["marker"].encode("utf-8")
+        self.records = self._split_path(spec["records"])
+        self.fields = {field: self._compile_field(field_spec) for field, field_spec in spec["fields"].items()}
+        self.extra_fields = {
+            field: self._compile_field(field_spec) for field, field_spec in spec.get("extra_fields", {}).items()
+        }
+        self.source = spec.get("source")
+        self.logger = logging.getLogger("EmbeddedJson")
+
+    def extract(self, body, encoding=None, source=None, data_points=None):
+        """Get the records from a page body, or None if it has no usable blob"""
+        data = self._load_blob(body, encoding)
+        if data is None:
+            return None
+
+        listings = self._lookup(data, self.records)
+        if not isinstance(listings, list):
+            self.logger.debug("Embedded JSON has no listing array")
+            return None
+
+        data_points = data_points or []
+        records = []
+        for listing in listings:
+            if not isinstance(listing, dict):
+                continue
+
+            record = {
+                field: self._read_field(listing, field_spec, field_spec["default"])
+                for field, field_spec in self.fields.items()
+            }
+            record["source"] = self.source or source
+
+            for field, field_spec in self.extra_fields.items():
+                if field in data_points:
+                    value = self._read_field(listing, field_spec, None)
+                    if value is not None:
+                        record[field] = value
+
+            records.append(record)
+
+        return records
+
+    def _load_blob(self, body, encoding):
+        """Find the blob after the marker and decode just that JSON value"""
+        start = body.find(self.marker)
+        if start < 0:
+            return None
+
+        start += len(self.marker)
+        end = body.find(b"</script>", start)
+        blob = body[start:end if end >= 0 else len(body)]
+
+        try:
+            text = blob.decode(encoding or "utf-8", errors="replace").lstrip(" \t\r\n=")
+            return json.JSONDecoder().raw_decode(text)[0]
+        except (LookupError, ValueError) as e:
+            self.logger.debug(f"Could not decode embedded JSON: {e}")
+            return None
+
+    def _compile_field(self, field_spec):
+        """Normalise a field spec"""
+        if isinstance(field_spec, str):
+            field_spec = {"path": field_spec}
+        return {
+            "path": self._split_path(field_spec["path"]),
+            "prefix": field_spec.get("prefix", ""),
+            "default": field_spec.get("default", ""),
+            "html": field_spec.get("html", False)
+        }
+
+    def _read_field(self, listing, field_spec, default):
+        """Read one field as text, or default when it is missing"""
+        value = self._lookup(listing, field_spec["path"])
+        if value is None or value == "":
+            return default
+
+        value = str(value)
+        if field_spec["html"]:
+            value = html.unescape(TAG.sub("", value))
+        return field_spec["prefix"] + value.strip()
+
+    def _lookup(self, data, path):
+        """Follow a split dot path through dicts and lists"""
+        for key in path:
+            if isinstance(data, dict):
+                data = data.get(key)
+            elif isinstance(data, list) and key.isdigit() and int(key) < len(data):
+                data = data[int(key)]
+            else:
+                return None
+        return data
+
+    def _split_path(self, path):
+        return path.split(".") if path else []
\ No newline at end of file
@@ -0,0 +1,230 @@
+# extraction_rules.py - Declarative per-site extraction rules with precompiled selectors
+import json
+import logging
+import os
+from urllib.parse import urlparse, urljoin
+from embedded_json import EmbeddedJson
+from html_parser import CompiledSelector, compile_target
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+DEFAULT_RULES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "extraction_rules.json")
+
+class ExtractionRule:
+    """One site's extraction rule with every selector compiled up front
+
+    A rule names the selector for listing items, the fields read from each
+    item (element text, or an attribute with an optional prefix), extra
+    fields only read when asked for, and the next-page link selectors. Sites
+    that embed their listings as JSON can also give an embedded spec (see
+    EmbeddedJson), which is tried before the selectors.
+    """
+
+    def __init__(self, name, spec):
+        self.name = name
+        self.domains = spec.get("domains", [])
+        self.source = spec.get("source")
+        self.items = CompiledSelector(spec["items"])
+        self.fields = {field: self._compile_field(field_spec) for field, field_spec in spec.get("fields", {}).items()}
+        self.extra_fields = {
+            field: self._compile_field(field_spec) for field, field_spec in spec.get("extra_fields", {}).items()
+        }
+
+        next_page = spec.get("next_page")
+        if next_page is not None:
+            self.next_page = [CompiledSelector(selector) for selector in next_page.get("selectors", [])]
+            self.next_page_base = next_page.get("base")
+        else:
+            self.next_page = None
+            self.next_page_base = None
+
+        self.embedded = EmbeddedJson(spec["embedded"]) if spec.get("embedded") else None
+        self.parse_targets = None
+        self.next_page_targets = None
+
+    def extract(self, document, url, data_points, logger):
+        """Build one record per listing item on a parsed page"""
+        results = []
+        source = self.source or urlparse(url).netloc
+
+        for item in self.items.select(document):
+            try:
+                result = {field: self._read_field(item, field_spec, "") for field, field_spec in self.fields.items()}
+                result["source"] = source
+
+                for field, field_spec in self.extra_fields.items():
+                    if field in data_points:
+                        value = self._read_field(item, field_spec, None)
+                        if value is not None:
+                            result[field] = value
+
+                results.append(result)
+            except Exception as e:
+                logger.error(f"Error extracting {self.name} item: {e}")
+
+        return results
+
+    def find_next_page(self, document):
+        """Find the next-page link on a parsed page, relative to the rule's base if it has one"""
+        for selector in self.next_page or []:
+            next_elem = selector.select_one(document)
+            if next_elem and 'href' in next_elem.attrs:
+                if self.next_page_base:
+                    return urljoin(self.next_page_base, next_elem['href'])
+                return next_elem['href']
+        return None
+
+    def build_parse_targets(self):
+        """Set parse_targets to the item and next-page selectors if all are simple
+
+        next_page_targets holds just the next-page selectors, for pages whose
+        items come from embedded JSON. Rules using anything a TargetStrainer
+        cannot match (descendant selectors, selector lists, pseudo-classes)
+        are parsed whole.
+        """
+        self.next_page_targets = self._simple_targets(self.next_page or [])
+        if self.next_page_targets is not None:
+            self.parse_targets = self._simple_targets([self.items] + self.next_page)
+
+    def _simple_targets(self, selectors):
+        """Get selectors as parse targets, or None if any is not a simple selector"""
+        try:
+            for selector in selectors:
+                compile_target(str(selector))
+        except ValueError:
+            return None
+        return [str(selector) for selector in selectors]
+
+    def _compile_field(self, field_spec):
+        """Normalise a field spec and compile its selector"""
+        if isinstance(field_spec, str):
+            field_spec = {"selector": field_spec}
+        return {
+            "selector": CompiledSelector(field_spec["selector"]),
+            "attr": field_spec.get("attr"),
+            "prefix": field_spec.get("prefix", "")
+        }
+
+    def _read_field(self, item, field_spec, default):
+        """Read one field from an item: stripped text, or an attribute value"""
+        elem = field_spec["selector"].select_one(item)
+        if not elem:
+            return default
+
+        if field_spec["attr"] is None:
+            return elem.text.strip()
+
+        if field_spec["attr"] not in elem.attrs:
+            return default
+        return field_spec["prefix"] + elem[field_spec["attr"]]
+
+class ExtractionRules:
+    """Registry of extraction rules indexed by domain
+
+    Rules are loaded from the JSON (or, with PyYAML installed, YAML) file set
+    by scraping.extraction_rules, or from the bundled extraction_rules.json.
+    Adding a site only takes a new entry in that file. A URL's rule is found
+    by walking its host from the full name down to the registered domain,
+    so www.ebay.com finds the ebay.com rule; hosts with no rule get the one
+    registered for "*". Rules with invalid selectors are logged and skipped.
+    """
+
+    def __init__(self, config_manager=None, rules_file=None):
+        self.logger = logging.getLogger("ExtractionRules")
+
+        if rules_file is None and config_manager is not None:
+            rules_file = config_manager.get_value("scraping.extraction_rules", None)
+        self.rules_file = self._resolve_path(rules_file) if rules_file else DEFAULT_RULES_FILE
+
+        self.rules = {}
+        self.domain_index = {}
+        self.default_rule = None
+        self._host_cache = {}
+        self._load_rules()
+
+    def get_rule(self, url):
+        """Get the rule for a URL's host, or the default rule"""
+        host = urlparse(url).netloc.split(":")[0].lower()
+        if host not in self._host_cache:
+            rule = None
+            labels = host.split(".")
+            for i in range(len(labels)):
+                rule = self.domain_index.get(".".join(labels[i:]))
+                if rule is not None:
+                    break
+            self._host_cache[host] = rule or self.default_rule
+        return self._host_cache[host]
+
+    def extract(self, document, url, data_points):
+        """Extract records from a parsed page with the rule for url"""
+        rule = self.get_rule(url)
+        if rule is None:
+            return []
+        return rule.extract(document, url, data_points, self.logger)
+
+    def find_next_page(self, document, url):
+        """Find the absolute next-page URL with the rule for url
+
+        Rules without next_page selectors use the default rule's.
+        """
+        rule = self.get_rule(url)
+        if rule is not None and rule.next_page is None:
+            rule = self.default_rule
+        next_url = rule.find_next_page(document) if rule is not None else None
+
+        # Make relative URLs absolute
+        if next_url and not next_url.startswith(('http://', 'https://')):
+            next_url = urljoin(url, next_url)
+
+        return next_url
+
+    def get_parse_targets(self, url):
+        """Get the parse targets for url's rule (None to parse the whole page)"""
+        rule = self.get_rule(url)
+        return rule.parse_targets if rule is not None else None
+
+    def _load_rules(self):
+        """Load, compile and index every rule in the rules file"""
+        try:
+            with open(self.rules_file, 'r', encoding="utf-8") as f:
+                if self.rules_file.endswith((".yaml", ".yml")):
+                    if yaml is None:
+                        self.logger.error(f"PyYAML is not installed, cannot load {self.rules_file}")
+                        return
+                    specs = yaml.safe_load(f) or {}
+                else:
+                    specs = json.load(f)
+        except Exception as e:
+            self.logger.error(f"Error loading extraction rules from {self.rules_file}: {e}")
+            return
+
+        for name, spec in specs.items():
+            try:
+                rule = ExtractionRule(name, spec)
+            except Exception as e:
+                self.logger.error(f"Skipping extraction rule {name}: {e}")
+                continue
+
+            self.rules[name] = rule
+            for domain in rule.domains:
+                if domain == "*":
+                    self.default_rule = rule
+                else:
+                    self.domain_index[domain.lower()] = rule
+
+        # Rules without their own next-page selectors fall back to the default rule's,
+        # so only rules with their own can leave the rest of the page unparsed
+        for rule in self.rules.values():
+            if rule.next_page is not None:
+                rule.build_parse_targets()
+
+        self.logger.info(f"Loaded {len(self.rules)} extraction rules from {self.rules_file}")
+
+    def _resolve_path(self, rules_file):
+        """Look for a relative rules file in the working directory, then next to this module"""
+        if os.path.isabs(rules_file) or os.path.exists(rules_file):
+            return rules_file
+        return os.path.join(os.path.dirname(DEFAULT_RULES_FILE), rules_file)
\ No newline at end of file
@@ -41,7 +41,12 @@ def main():
         
         # Create and run the GUI
         app = GravyScraperApp(config_manager, claude_service, protection_service, scraper_engine)
-        app.run()
+        try:
+            app.run()
+        finally:
+            # Stop the parse workers and close pooled connections once the window closes
+            scraper_engine.close()
+            protection_service.close()
     
     except Exception as e:
         logger.error(f"Error in main application: {e}", exc_info=True)
@@ -5,6 +5,7 @@ import webbrowser
 import os
 import logging
 import json
+from scrapers import available_scrapers
 
 class GravyScraperApp:
     def __init__(self, config_manager, claude_service, protection_service, scraper_engine):
@@ -113,7 +114,8 @@ class GravyScraperApp:
         sources_label.grid(row=0, column=0, sticky=tk.W, padx=5, pady=5)
         
         self.job_sources = {}
-        sources = ["Indeed", "RemoteOK", "LinkedIn", "Freelancer", "Craigslist"]
+        # Only sources with a registered scraper plugin can be searched
+        sources = list(available_scrapers)
         
         for i, source in enumerate(sources):
             var = tk.BooleanVar(value=self.config_manager.get_value(f"job_sources.{source}", True))
@@ -464,8 +466,14 @@ class GravyScraperApp:
                     self.status_var.set("Test search completed")
                     return
                 
-                # Perform real search
-                jobs = self.scraper_engine.search_jobs(query, sources, location)
+                # Perform real search, counting listings as the sources find them
+                found = []
+                
+                def job_found(job):
+                    found.append(job)
+                    self.status_var.set(f"Searching for jobs... {len(found)} listings found")
+                
+                jobs = self.scraper_engine.search_jobs(query, sources, location, on_job=job_found)
                 
                 # Update output
                 if jobs:
@@ -863,7 +871,7 @@ class GravyScraperApp:
             
             # Test protection service
             try:
-                html = self.protection_service.get_with_protection("https://httpbin.org/ip")
+                html = self.protection_service.get_with_protection("https://httpbin.org/ip", bypass_cache=True)
                 if html:
                     result_text.insert(tk.END, "Connection Test: SUCCESS ✓\n")
                 else:
@@ -0,0 +1,254 @@
+# html_parser.py - Pluggable HTML parser backends behind one facade
+import logging
+import re
+import soupsieve
+from bs4 import BeautifulSoup, FeatureNotFound, SoupStrainer
+
+try:
+    from selectolax.parser import HTMLParser as SelectolaxHTMLParser
+except ImportError:
+    SelectolaxHTMLParser = None
+
+# One simple selector: tag, #id, .classes and [attr], [attr=v], [attr*=v] or [attr^=v] filters
+SIMPLE_SELECTOR = re.compile(r'^([\w-]*)(?:#([\w-]+))?((?:\.[\w-]+)*)((?:\[[^\]]+\])*)$')
+ATTRIBUTE_FILTER = re.compile(r'\[([\w-]+)(?:([*^]?=)["\']?([^"\'\]]*)["\']?)?\]')
+
+def compile_target(selector):
+    """Compile a simple selector into a (tag, classes, attribute filters) matcher"""
+    match = SIMPLE_SELECTOR.match(selector.strip())
+    if match is None:
+        raise ValueError(f"Unsupported parse target: {selector}")
+
+    tag, element_id, classes, attributes = match.groups()
+    filters = ATTRIBUTE_FILTER.findall(attributes)
+    if element_id:
+        filters.append(("id", "=", element_id))
+
+    return (
+        tag or None,
+        set(classes.split(".")[1:]),
+        filters
+    )
+
+class TargetStrainer(SoupStrainer):
+    """Keeps only the subtrees whose root matches one of a list of simple selectors
+
+    Tags outside those subtrees are never created, so the tree holds just
+    the parts of the page an extractor reads.
+    """
+
+    def __init__(self, targets):
+        super().__init__()
+        self.targets = [compile_target(target) for target in targets]
+
+    def matches(self, name, attrs):
+        """Check whether a tag starts a wanted subtree"""
+        attrs = attrs or {}
+        for tag, classes, filters in self.targets:
+            if tag and tag != name:
+                continue
+
+            if classes:
+                tag_classes = attrs.get("class", "")
+                if isinstance(tag_classes, str):
+                    tag_classes = tag_classes.split()
+                if not classes.issubset(tag_classes):
+                    continue
+
+            if all(self._attribute_matches(attrs.get(attr), op, value) for attr, op, value in filters):
+                return True
+
+        return False
+
+    def allow_tag_creation(self, nsprefix, name, attrs):
+        return self.matches(name, attrs)
+
+    def allow_string_creation(self, string):
+        return False
+
+    def search_tag(self, markup_name=None, markup_attrs={}):
+        # Hook used by BeautifulSoup releases before 4.13
+        return markup_name if self.matches(markup_name, dict(markup_attrs)) else None
+
+    def _attribute_matches(self, actual, op, value):
+        """Apply one attribute filter"""
+        if actual is None:
+            return False
+        if isinstance(actual, list):
+            actual = " ".join(actual)
+        if not op:
+            return True
+        if op == "*=":
+            return value in actual
+        if op == "^=":
+            return actual.startswith(value)
+        return actual == value
+
+class SelectolaxNode:
+    """Wraps a selectolax node in the subset of the BeautifulSoup API the extractors use"""
+
+    def __init__(self, node):
+        self.node = node
+
+    def select(self, selector):
+        """Find all matching descendants
+
+        Selectors the backend cannot compile (such as soupsieve's :contains)
+        match nothing rather than aborting the whole extraction.
+        """
+        try:
+            nodes = self.node.css(selector)
+        except Exception:
+            return []
+        return [SelectolaxNode(node) for node in nodes]
+
+    def select_one(self, selector):
+        """Find the first matching descendant"""
+        try:
+            node = self.node.css_first(selector)
+        except Exception:
+            return None
+        return SelectolaxNode(node) if node is not None else None
+
+    @property
+    def text(self):
+        return self.node.text(deep=True)
+
+    def get_text(self, separator="", strip=False):
+        return self.node.text(deep=True, separator=separator, strip=strip)
+
+    @property
+    def attrs(self):
+        return {name: value if value is not None else "" for name, value in self.node.attributes.items()}
+
+    def has_attr(self, name):
+        return name in self.node.attributes
+
+    def get(self, name, default=None):
+        return self.attrs.get(name, default)
+
+    def __getitem__(self, name):
+        return self.attrs[name]
+
+class CompiledSelector:
+    """A CSS selector compiled once and run against any backend's nodes
+
+    BeautifulSoup trees are matched with the precompiled soupsieve pattern.
+    selectolax nodes take the selector text, since selectolax has no
+    compiled form to reuse.
+    """
+
+    def __init__(self, selector):
+        self.selector = selector
+        self.pattern = soupsieve.compile(selector)
+
+    def select(self, node):
+        """Find all descendants of node matching the selector"""
+        if isinstance(node, ParsedDocument):
+            return node.select(self)
+        if isinstance(node, SelectolaxNode):
+            return node.select(self.selector)
+        return self.pattern.select(node)
+
+    def select_one(self, node):
+        """Find the first descendant of node matching the selector"""
+        if isinstance(node, ParsedDocument):
+            return node.select_one(self)
+        if isinstance(node, SelectolaxNode):
+            return node.select_one(self.selector)
+        return self.pattern.select_one(node)
+
+    def __str__(self):
+        return self.selector
+
+class ParsedDocument:
+    """A page parsed once and shared by everything that reads it
+
+    Extractors and the next-page locator run their selectors against the
+    same tree, and results of document-level selectors are cached so asking
+    twice costs nothing.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.selector_cache = {}
+
+    def select(self, selector):
+        """Find all elements matching selector (text or CompiledSelector), cached per selector"""
+        key = ("select", str(selector))
+        if key not in self.selector_cache:
+            if isinstance(selector, CompiledSelector):
+                self.selector_cache[key] = selector.select(self.root)
+            else:
+                self.selector_cache[key] = self.root.select(selector)
+        return self.selector_cache[key]
+
+    def select_one(self, selector):
+        """Find the first element matching selector (text or CompiledSelector), cached per selector"""
+        key = ("select_one", str(selector))
+        if key not in self.selector_cache:
+            if isinstance(selector, CompiledSelector):
+                self.selector_cache[key] = selector.select_one(self.root)
+            else:
+                self.selector_cache[key] = self.root.select_one(selector)
+        return self.selector_cache[key]
+
+class HtmlParser:
+    """Parses pages with the backend chosen by scraping.parser in the config
+
+    lxml (the default) and html.parser return a BeautifulSoup tree.
+    selectolax is much faster still and is used when installed; its nodes are
+    wrapped so extractors can call select, select_one, text and attribute
+    lookups the same way on every backend. Unavailable backends fall back to
+    lxml, then html.parser.
+
+    Callers that only read a few parts of a page can pass targets, a list
+    of simple selectors such as "li.s-item" or 'div[data-component-type="x"]'.
+    The BeautifulSoup backends then build only those subtrees. selectolax
+    always parses the whole page, which is already cheap for it.
+    """
+
+    BACKENDS = ["lxml", "html.parser", "selectolax"]
+
+    def __init__(self, config_manager=None, backend=None):
+        self.logger = logging.getLogger("HtmlParser")
+
+        if backend is None:
+            backend = config_manager.get_value("scraping.parser", "lxml") if config_manager else "lxml"
+        self.backend = self._resolve_backend(backend)
+
+    def parse(self, markup, encoding=None, targets=None):
+        """Parse a page given as bytes (with an optional encoding) or text"""
+        if self.backend == "selectolax":
+            if isinstance(markup, bytes):
+                markup = markup.decode(encoding or "utf-8", errors="replace")
+            return SelectolaxNode(SelectolaxHTMLParser(markup).root)
+
+        parse_only = TargetStrainer(targets) if targets else None
+
+        if isinstance(markup, bytes):
+            return BeautifulSoup(markup, self.backend, from_encoding=encoding, parse_only=parse_only)
+        return BeautifulSoup(markup, self.backend, parse_only=parse_only)
+
+    def parse_document(self, markup, encoding=None, targets=None):
+        """Parse a page into a ParsedDocument with a selector cache"""
+        return ParsedDocument(self.parse(markup, encoding, targets))
+
+    def _resolve_backend(self, backend):
+        """Pick the requested backend if it can be used here"""
+        if backend not in self.BACKENDS:
+            self.logger.warning(f"Unknown parser backend {backend}, using lxml")
+            backend = "lxml"
+
+        if backend == "selectolax" and SelectolaxHTMLParser is None:
+            self.logger.warning("selectolax is not installed, using lxml")
+            backend = "lxml"
+
+        if backend == "lxml":
+            try:
+                BeautifulSoup("", "lxml")
+            except FeatureNotFound:
+                self.logger.warning("lxml is not installed, using html.parser")
+                backend = "html.parser"
+
+        return backend
\ No newline at end of file
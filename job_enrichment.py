@@ -0,0 +1,169 @@
+# job_enrichment.py - Fetches full job details for the listings that survive filtering
+import json
+import logging
+import os
+import threading
+import time
+
+class JobDetailCache:
+    """Full job details by source and job ID, persisted to a JSON file
+
+    The same job is often listed under different tracking URLs, so entries
+    are keyed by the ID its source gives it rather than by URL. Entries
+    expire after scraping.enrichment.cache_ttl seconds and the oldest are
+    dropped past cache_max_entries.
+    """
+
+    def __init__(self, config_manager):
+        self.data_file = config_manager.get_value("scraping.enrichment.cache_file", "job_details.json")
+        self.ttl = config_manager.get_value("scraping.enrichment.cache_ttl", 604800)
+        self.max_entries = config_manager.get_value("scraping.enrichment.cache_max_entries", 5000)
+        self.logger = logging.getLogger("JobDetailCache")
+
+        self.entries = self._load_data()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Get the cached details for a job key, or None if missing or expired"""
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if time.time() - entry["fetched_at"] > self.ttl:
+                del self.entries[key]
+                return None
+            return entry["details"]
+
+    def put(self, key, details):
+        """Cache a job's details"""
+        with self._lock:
+            self.entries[key] = {"details": details, "fetched_at": time.time()}
+            if len(self.entries) > self.max_entries:
+                oldest = sorted(self.entries, key=lambda k: self.entries[k]["fetched_at"])
+                for stale_key in oldest[:len(self.entries) - self.max_entries]:
+                    del self.entries[stale_key]
+
+    def save(self):
+        """Save the cache to file"""
+        with self._lock:
+            try:
+                with open(self.data_file, 'w') as f:
+                    json.dump(self.entries, f)
+            except Exception as e:
+                self.logger.error(f"Error saving job details: {e}")
+
+    def _load_data(self):
+        """Load cached details from file"""
+        if os.path.exists(self.data_file):
+            try:
+                with open(self.data_file, 'r') as f:
+                    return json.load(f)
+            except Exception as e:
+                self.logger.error(f"Error loading job details: {e}")
+        return {}
+
+class JobEnricher:
+    """Adds full job details to the top listings after filtering
+
+    Only the first scraping.enrichment.top_n jobs are enriched, and only
+    those whose source plugin declares detail_fetch, so detail pages are
+    fetched just for listings that will be shown. Cached details are reused;
+    the rest are fetched as one batch per source with the source's
+    get_many_job_details, which runs on the asyncio engine, so requests per
+    domain stay within protection.max_per_domain and backoff never ties up
+    a thread. Details are merged into each job dict, e.g. full_description.
+    """
+
+    def __init__(self, config_manager, protection_service, scrapers):
+        self.enabled = config_manager.get_value("scraping.enrichment.enabled", True)
+        self.top_n = config_manager.get_value("scraping.enrichment.top_n", 20)
+        self.protection_service = protection_service
+        self.scrapers = scrapers
+        self.cache = JobDetailCache(config_manager)
+        self.logger = logging.getLogger("JobEnricher")
+
+        self.stats = {"enriched": 0, "cache_hits": 0, "fetched": 0, "failed": 0}
+        self._lock = threading.Lock()
+
+    def enrich(self, jobs):
+        """Add details to the top jobs in place and return the list"""
+        if not self.enabled or not jobs:
+            return jobs
+
+        before = self.get_stats()
+        pending = []
+        for job in jobs[:self.top_n]:
+            scraper = self._get_detail_scraper(job)
+            if scraper is None or not job.get("url"):
+                continue
+
+            key = self._job_key(job)
+            details = self.cache.get(key)
+            if details is not None:
+                job.update(details)
+                self._count("cache_hits")
+                self._count("enriched")
+            else:
+                pending.append((key, job, scraper))
+
+        if pending:
+            self._fetch_details(pending)
+            self.cache.save()
+
+        after = self.get_stats()
+        self.logger.info(
+            f"Enriched {after['enriched'] - before['enriched']} of the top {min(len(jobs), self.top_n)} jobs "
+            f"({after['cache_hits'] - before['cache_hits']} from cache, {after['failed'] - before['failed']} failed)"
+        )
+        return jobs
+
+    def get_stats(self):
+        """Get how many jobs were enriched, from cache or fetched, and how many failed"""
+        with self._lock:
+            return dict(self.stats)
+
+    def _fetch_details(self, pending):
+        """Fetch details in one batch per source, applying each as its page arrives"""
+        by_scraper = {}
+        for key, job, scraper in pending:
+            by_scraper.setdefault(scraper, {}).setdefault(job["url"], []).append((key, job))
+
+        for scraper, jobs_by_url in by_scraper.items():
+            remaining = dict(jobs_by_url)
+            try:
+                for job_url, details in scraper.get_many_job_details(list(jobs_by_url), self.protection_service):
+                    for key, job in remaining.pop(job_url, []):
+                        self._apply(key, job, details)
+            except Exception as e:
+                self.logger.error(f"Error getting details from {scraper.name}: {e}")
+
+            # Whatever the batch did not deliver has failed
+            for jobs in remaining.values():
+                for _ in jobs:
+                    self._count("failed")
+
+    def _apply(self, key, job, details):
+        """Merge fetched details into a job and cache them"""
+        if not details or not any(details.values()):
+            self._count("failed")
+            return
+
+        job.update(details)
+        self.cache.put(key, details)
+        self._count("fetched")
+        self._count("enriched")
+
+    def _get_detail_scraper(self, job):
+        """Get the plugin for a job's source if it can fetch details"""
+        scraper = self.scrapers.get(job.get("source"))
+        if scraper is None or not scraper.capabilities.detail_fetch:
+            return None
+        return scraper
+
+    def _job_key(self, job):
+        """Cache key for a job: its source and ID, or its URL when it has no ID"""
+        return f"{job['source']}:{job.get('id') or job['url']}"
+
+    def _count(self, stat):
+        with self._lock:
+            self.stats[stat] += 1
\ No newline at end of file
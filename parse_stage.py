@@ -0,0 +1,312 @@
+# parse_stage.py - Parses fetched pages into plain records on a process pool
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from embedded_json import EmbeddedJson
+from extraction_rules import ExtractionRules
+from html_parser import HtmlParser
+from urllib.parse import urlparse
+
+logger = logging.getLogger("ParseStage")
+
+# Parser and extraction rules a worker process builds once at start-up
+_worker_state = {}
+
+# The job cards Indeed search pages embed for their own client-side rendering
+INDEED_JOB_CARDS = EmbeddedJson({
+    "marker": 'window.mosaic.providerData["mosaic-provider-jobcards"]=',
+    "records": "metaData.mosaicProviderJobCardsModel.results",
+    "fields": {
+        "title": {"path": "title", "default": "Unknown"},
+        "company": {"path": "company", "default": "Unknown"},
+        "location": {"path": "formattedLocation", "default": "Unknown"},
+        "url": {"path": "jobkey", "prefix": "https://www.indeed.com/viewjob?jk="},
+        "description": {"path": "snippet", "html": True},
+        "salary": {"path": "salarySnippet.text", "default": "Not specified"}
+    },
+    "source": "Indeed"
+})
+
+def extract_listing(document, url, data_points, rules):
+    """Extract product records and the next-page URL with the site's extraction rule"""
+    return rules.extract(document, url, data_points), rules.find_next_page(document, url)
+
+def extract_indeed_jobs(document, url, data_points, rules):
+    """Extract jobs from the cards on an Indeed search page"""
+    jobs = []
+    for card in document.select("div.job_seen_beacon"):
+        try:
+            # Extract job details
+            title_elem = card.select_one("h2.jobTitle span")
+            company_elem = card.select_one("span.companyName")
+            location_elem = card.select_one("div.companyLocation")
+
+            # Get job URL
+            job_link_elem = card.select_one("h2.jobTitle a")
+            job_url = ""
+
+            if job_link_elem and job_link_elem.has_attr("href"):
+                job_path = job_link_elem["href"]
+                if job_path.startswith("/"):
+                    job_url = f"https://www.indeed.com{job_path}"
+                else:
+                    job_url = job_path
+
+            # Get job description snippet
+            snippet_elem = card.select_one("div.job-snippet")
+
+            # Get salary if available
+            salary_elem = card.select_one("div.salary-snippet-container")
+
+            jobs.append({
+                "title": title_elem.text.strip() if title_elem else "Unknown",
+                "company": company_elem.text.strip() if company_elem else "Unknown",
+                "location": location_elem.text.strip() if location_elem else "Unknown",
+                "url": job_url,
+                "description": snippet_elem.text.strip() if snippet_elem else "",
+                "salary": salary_elem.text.strip() if salary_elem else "Not specified",
+                "source": "Indeed"
+            })
+
+        except Exception as e:
+            logger.error(f"Error parsing Indeed job card: {e}")
+
+    return jobs, None
+
+def extract_remoteok_jobs(document, url, data_points, rules):
+    """Extract jobs from the rows on a RemoteOK search page"""
+    jobs = []
+    for row in document.select("tr.job"):
+        try:
+            # Extract job details
+            title_elem = row.select_one("h2")
+            company_elem = row.select_one("h3")
+            tags_elem = row.select("div.tags div.tag")
+
+            # Get job URL
+            job_id = row.get("data-id", "")
+            job_url = f"https://remoteok.com/l/{job_id}" if job_id else ""
+
+            # Get job description
+            desc_elem = row.select_one("div.description")
+
+            # Get salary if available
+            salary_elem = row.select_one("div.salary")
+
+            jobs.append({
+                "id": job_id,
+                "title": title_elem.text.strip() if title_elem else "Unknown",
+                "company": company_elem.text.strip() if company_elem else "Unknown",
+                "location": "Remote",
+                "url": job_url,
+                "description": desc_elem.text.strip() if desc_elem else "",
+                "salary": salary_elem.text.strip() if salary_elem else "Not specified",
+                "tags": [tag.text.strip() for tag in tags_elem] if tags_elem else [],
+                "source": "RemoteOK"
+            })
+
+        except Exception as e:
+            logger.error(f"Error parsing RemoteOK job card: {e}")
+
+    return jobs, None
+
+# Record extractors by page kind
+EXTRACTORS = {
+    "listing": extract_listing,
+    "indeed": extract_indeed_jobs,
+    "remoteok": extract_remoteok_jobs
+}
+
+# Embedded JSON tried before the selectors, by page kind; listings use their rule's
+EMBEDDED = {
+    "indeed": INDEED_JOB_CARDS
+}
+
+def _init_worker(backend, rules_file):
+    """Build the parser and extraction rules once per worker process"""
+    _worker_state["parser"] = HtmlParser(backend=backend)
+    _worker_state["rules"] = ExtractionRules(rules_file=rules_file)
+
+def parse_records(kind, body, encoding, url, targets, data_points, state=None):
+    """Parse a page and run the extractor for its kind
+
+    Listings embedded as JSON are read straight from the blob, with only the
+    next-page link parsed from the HTML. Returns a plain
+    {"records": [...], "next_page": url or None, "path": "embedded" or "selectors"}
+    dict so only picklable data crosses the process boundary.
+    """
+    state = state or _worker_state
+    parser, rules = state["parser"], state["rules"]
+
+    records = extract_embedded(kind, body, encoding, url, data_points, rules)
+    if records is not None:
+        next_page = None
+        if kind == "listing":
+            next_targets = rules.get_rule(url).next_page_targets
+            if next_targets != []:
+                next_page = rules.find_next_page(parser.parse_document(body, encoding, next_targets), url)
+        return {"records": records, "next_page": next_page, "path": "embedded"}
+
+    document = parser.parse_document(body, encoding, targets)
+    records, next_page = EXTRACTORS[kind](document, url, data_points or [], rules)
+    return {"records": records, "next_page": next_page, "path": "selectors"}
+
+def get_embedded(kind, url, rules):
+    """Get the embedded JSON spec for a page, if its kind or site has one"""
+    if kind == "listing":
+        rule = rules.get_rule(url)
+        return rule.embedded if rule is not None else None
+    return EMBEDDED.get(kind)
+
+def extract_embedded(kind, body, encoding, url, data_points, rules):
+    """Read a page's records from its embedded JSON, or return None to fall back to selectors"""
+    embedded = get_embedded(kind, url, rules)
+    if embedded is None:
+        return None
+
+    source = None
+    if kind == "listing":
+        source = rules.get_rule(url).source or urlparse(url).netloc
+    return embedded.extract(body, encoding, source, data_points)
+
+class ParseStage:
+    """Turns fetched (body, encoding) pages into record lists
+
+    Parsing is CPU-bound and holds the GIL, so pages of at least
+    scraping.inline_parse_bytes are sent to a pool of
+    scraping.parse_workers processes and several can be parsed at once.
+    Smaller pages, and pages whose embedded JSON can be read without
+    parsing, are handled inline, where they cost less than the trip to a
+    worker. Setting parse_workers to 0 parses everything inline, and if
+    the pool cannot start or dies, the stage falls back to inline parsing.
+    How often each kind of page was read from embedded JSON, with selectors
+    or while streaming is counted in get_stats.
+    """
+
+    def __init__(self, config_manager, html_parser, extraction_rules):
+        self.workers = config_manager.get_value("scraping.parse_workers", 2)
+        self.inline_bytes = config_manager.get_value("scraping.inline_parse_bytes", 65536)
+        self.logger = logger
+
+        self.state = {"parser": html_parser, "rules": extraction_rules}
+        self.executor = None
+        self.stats = {"inline": 0, "pool": 0}
+        self.path_stats = {}
+        self._lock = threading.Lock()
+
+    def submit(self, kind, page, url, targets=None, data_points=None):
+        """Start parsing a page, returning a Future for its records and next-page URL"""
+        body, encoding = page
+        executor = None
+        if len(body) >= self.inline_bytes:
+            embedded = get_embedded(kind, url, self.state["rules"])
+            if embedded is None or embedded.marker not in body:
+                executor = self._get_executor()
+        if executor is None:
+            return self._run_inline(kind, body, encoding, url, targets, data_points)
+
+        try:
+            pool_future = executor.submit(parse_records, kind, body, encoding, url, targets, data_points)
+        except (BrokenProcessPool, RuntimeError, OSError) as e:
+            self._disable_pool(e)
+            return self._run_inline(kind, body, encoding, url, targets, data_points)
+
+        self._count("pool")
+        future = Future()
+
+        def relay(pool_future):
+            if pool_future.cancelled():
+                future.cancel()
+                return
+
+            error = pool_future.exception()
+            if isinstance(error, BrokenProcessPool):
+                self._disable_pool(error)
+                pool_future = self._run_inline(kind, body, encoding, url, targets, data_points)
+                error = pool_future.exception()
+            elif error is None:
+                self.record_path(kind, pool_future.result()["path"])
+
+            if error:
+                future.set_exception(error)
+            else:
+                future.set_result(pool_future.result())
+
+        pool_future.add_done_callback(relay)
+        return future
+
+    def parse(self, kind, page, url, targets=None, data_points=None):
+        """Parse a page and wait for its records and next-page URL"""
+        return self.submit(kind, page, url, targets, data_points).result()
+
+    def record_path(self, kind, path):
+        """Count a page of one kind extracted along a path (embedded, selectors or stream)"""
+        with self._lock:
+            paths = self.path_stats.setdefault(kind, {})
+            paths[path] = paths.get(path, 0) + 1
+
+    def get_stats(self):
+        """Get how many pages were parsed inline and on the pool, and by which path per kind"""
+        with self._lock:
+            return {
+                **self.stats,
+                "paths": {kind: dict(paths) for kind, paths in self.path_stats.items()}
+            }
+
+    def close(self):
+        """Shut down the worker processes"""
+        with self._lock:
+            executor, self.executor = self.executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _run_inline(self, kind, body, encoding, url, targets, data_points):
+        """Parse a page on the calling thread, returning a completed Future"""
+        self._count("inline")
+        future = Future()
+        try:
+            result = parse_records(kind, body, encoding, url, targets, data_points, self.state)
+        except Exception as e:
+            future.set_exception(e)
+            return future
+
+        self.record_path(kind, result["path"])
+        future.set_result(result)
+        return future
+
+    def _get_executor(self):
+        """Get the process pool, starting it on first use (None when disabled)
+
+        Workers are started from a fork server (or spawned where there is
+        none) rather than forked from this process, whose fetch threads may
+        hold locks a forked child would inherit held.
+        """
+        with self._lock:
+            if self.executor is None and self.workers > 0:
+                try:
+                    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+                    self.executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context(method),
+                        initializer=_init_worker,
+                        initargs=(self.state["parser"].backend, self.state["rules"].rules_file)
+                    )
+                except (OSError, ValueError, NotImplementedError) as e:
+                    self.logger.warning(f"Could not start parse workers, parsing inline: {e}")
+                    self.workers = 0
+            return self.executor
+
+    def _disable_pool(self, error):
+        """Stop using a pool that failed and parse inline from now on"""
+        self.logger.warning(f"Parse workers failed, parsing inline: {error}")
+        with self._lock:
+            executor, self.executor = self.executor, None
+            self.workers = 0
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _count(self, path):
+        with self._lock:
+            self.stats[path] += 1
\ No newline at end of file
@@ -1,10 +1,61 @@
+import codecs
+import re
 import time
 import random
 import logging
-import requests
+import threading
+from requests.compat import chardet
 from urllib.parse import urlparse
+from async_protection_service import AsyncProtectionService
+from rate_limiter import RateLimiter
+from retry_scheduler import RetryScheduler, RetryDeferred
+from circuit_breaker import CircuitBreaker
+from transports import Http1Transport, Http2Transport
+from service_quota import ServiceQuota
+from response_cache import ResponseCache
+from proxy_router import ProxyRouter
+from single_flight import SingleFlight, request_key
+
+# Charset declared in a <meta> tag near the top of the page
+META_CHARSET = re.compile(rb'<meta[^>]+charset=["\']?([A-Za-z0-9_.:-]+)', re.IGNORECASE)
+
+class FetchResult:
+    """Status, headers and body of a response read by the protection layer
+    
+    A streamed response has an empty content; size counts the bytes that
+    were handed to the consumer instead.
+    """
+    
+    def __init__(self, status_code, headers, content, encoding, truncated=False, size=None):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.encoding = encoding
+        self.truncated = truncated
+        self.size = len(content) if size is None else size
+
+class StreamInterrupted(Exception):
+    """A streamed body failed after part of it reached the consumer, so it cannot be retried
+    
+    consumer_failed is True when the consumer raised rather than the download.
+    """
+    
+    def __init__(self, message, consumer_failed=False):
+        super().__init__(message)
+        self.consumer_failed = consumer_failed
 
 class ProtectionService:
+    DEFAULT_CONTENT_TYPES = [
+        "text/html",
+        "application/xhtml+xml",
+        "application/json",
+        "text/plain",
+        "text/xml",
+        "application/xml",
+        "application/rss+xml",
+        "application/atom+xml"
+    ]
+    
     def __init__(self, config_manager):
         self.config_manager = config_manager
         self.enabled = config_manager.get_value("protection.enabled", True)
@@ -12,8 +63,32 @@ class ProtectionService:
         self.current_service = config_manager.get_value("protection.current_service", "Direct")
         self.request_counts = {}
         self.max_requests_per_domain = 10
+        self.routing_mode = config_manager.get_value("protection.routing.mode", "adaptive")
+        self.pool_size = config_manager.get_value("protection.pool_size", 10)
+        self.max_body_bytes = config_manager.get_value("protection.max_body_bytes", 5 * 1024 * 1024)
+        self.allowed_content_types = config_manager.get_value(
+            "protection.allowed_content_types", self.DEFAULT_CONTENT_TYPES
+        )
+        self.detect_bytes = config_manager.get_value("protection.charset_detect_bytes", 65536)
+        self.fetch_stats = {}
+        self.transport_warnings = set()
         self.logger = logging.getLogger("ProtectionService")
         
+        # Pooled HTTP/1.1 sessions and HTTP/2 clients, chosen per domain
+        self.transports = {
+            Http1Transport.name: Http1Transport(self.pool_size),
+            Http2Transport.name: Http2Transport(self.pool_size)
+        }
+        self.async_service = None
+        self.rate_limiter = RateLimiter(config_manager)
+        self.retry_scheduler = RetryScheduler(config_manager)
+        self.circuit_breaker = CircuitBreaker(config_manager)
+        self.service_quota = ServiceQuota(config_manager)
+        self.response_cache = ResponseCache(config_manager)
+        self.router = ProxyRouter(config_manager)
+        self.single_flight = SingleFlight()
+        self._lock = threading.RLock()
+        
         # User agents for fingerprinting
         self.user_agents = [
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
@@ -39,6 +114,70 @@ class ProtectionService:
         self.current_service = service_name
         self.config_manager.set_value("protection.current_service", service_name)
     
+    def set_pool_size(self, pool_size):
+        """Set the connection pool size used for new sessions"""
+        self.pool_size = pool_size
+        self.config_manager.set_value("protection.pool_size", pool_size)
+        self.close()
+        for transport in self.transports.values():
+            transport.pool_size = pool_size
+    
+    def set_rate_limit(self, domain, rate, burst, jitter=0.5):
+        """Set the request budget for a domain ("default" applies to all others)"""
+        # Domains contain dots, so update the whole mapping rather than a dotted path
+        rate_limits = dict(self.config_manager.get_value("protection.rate_limits", {}))
+        rate_limits[domain] = {
+            "rate": rate,
+            "burst": burst,
+            "jitter": jitter
+        }
+        self.config_manager.set_value("protection.rate_limits", rate_limits)
+        self.rate_limiter.reset()
+    
+    def close(self):
+        """Close all pooled sessions and clients"""
+        with self._lock:
+            for transport in self.transports.values():
+                transport.close()
+            
+            if self.async_service is not None:
+                self.async_service.close()
+                self.async_service = None
+            
+            self.response_cache.close()
+            self.router.close()
+            self.service_quota.close()
+    
+    def set_transport(self, domain, transport):
+        """Set the transport for a domain: "http1" or "http2" ("default" applies to all others)"""
+        # Domains contain dots, so update the whole mapping rather than a dotted path
+        transports = dict(self.config_manager.get_value("protection.transports", {}))
+        transports[domain] = transport
+        self.config_manager.set_value("protection.transports", transports)
+    
+    def _get_transport(self, url):
+        """Get the transport configured for url's domain"""
+        domain = self._extract_domain(url)
+        transports = self.config_manager.get_value("protection.transports", {})
+        
+        name = transports.get(domain)
+        if name is None and domain.startswith("www."):
+            name = transports.get(domain[4:])
+        if name is None:
+            name = transports.get("default", "http1")
+        
+        transport = self.transports.get(name)
+        if transport is None or not transport.available:
+            # Warn once per domain rather than on every request
+            with self._lock:
+                warn = domain not in self.transport_warnings
+                self.transport_warnings.add(domain)
+            if warn:
+                self.logger.warning(f"Transport {name} unavailable for {domain}, using http1")
+            transport = self.transports["http1"]
+        
+        return transport
+    
     def configure_brightdata(self, username, password, host, port):
         """Configure BrightData proxy"""
         self.config_manager.set_value("protection.services.BrightData.enabled", True)
@@ -56,33 +195,266 @@ class ProtectionService:
         self.set_service("ScraperAPI")
         self.logger.info("ScraperAPI proxy configured")
     
-    def get_with_protection(self, url, headers=None):
-        """Make a protected HTTP request"""
-        if not self.enabled:
-            return self._make_direct_request(url, headers)
+    def get_with_protection(self, url, headers=None, bypass_cache=False, retry=None):
+        """Make a protected HTTP request
         
-        # Track requests per domain for rotation
-        domain = self._extract_domain(url)
-        if domain not in self.request_counts:
-            self.request_counts[domain] = 0
+        Fresh responses are served from the on-disk cache and stale ones are
+        revalidated with the server. Pass bypass_cache=True to skip the lookup.
+        Concurrent calls for the same request share a single fetch. With a
+        RetryState as retry, a retryable failure raises RetryDeferred instead
+        of sleeping, so the caller can fetch other URLs while it backs off.
+        """
+        page = self.get_bytes_with_protection(url, headers, bypass_cache, retry)
+        if page is None:
+            return None
+        
+        return self._decode_body(*page)
+    
+    def get_bytes_with_protection(self, url, headers=None, bypass_cache=False, retry=None):
+        """Make a protected HTTP request and return (body, encoding) undecoded
+        
+        The encoding is the charset declared by the server or the page itself,
+        with detection over a capped prefix only when neither declares one.
+        Handing the bytes straight to the parser avoids an intermediate str.
+        """
+        key = self._flight_key(url, headers, bypass_cache, retry)
+        return self.single_flight.do(key, self._get_once, url, headers, bypass_cache, retry)
+    
+    def _flight_key(self, url, headers=None, bypass_cache=False, retry=None):
+        """Build the single-flight key shared by the sync and async fetch paths
+        
+        Only callers that reschedule their own retries may be handed
+        RetryDeferred, so they get a key of their own.
+        """
+        return request_key(url, headers, bypass_cache, retry is not None)
+    
+    def stream_with_protection(self, url, consumer, headers=None, retry=None):
+        """Make a protected HTTP request and hand the body to consumer as it downloads
+        
+        consumer(chunk, encoding) is called for every chunk, with the
+        encoding resolved from the headers and the first chunk. Fresh and
+        revalidated cache entries are handed over in one piece. Streamed
+        bodies are not kept, so they are neither cached nor shared between
+        concurrent callers. Returns the number of bytes handed over, or None
+        if the request failed. retry works as for get_with_protection; a
+        deferred retry is raised before the consumer sees any of the body.
+        """
+        headers = self._request_headers(headers)
+        cache_entry, fresh, headers = self._cache_lookup(url, headers)
+        if not fresh:
+            result = self._fetch(url, headers, consumer, retry)
+            if result is None:
+                return None
+            if result.status_code != 304:
+                return result.size
+            if cache_entry is None:
+                return None
+            self.response_cache.revalidated(url, result.headers, headers)
+        
+        body = cache_entry["body"]
+        consumer(body, self._resolve_encoding(body, cache_entry["encoding"]))
+        return len(body)
+    
+    def _get_once(self, url, headers=None, bypass_cache=False, retry=None):
+        """Make a protected HTTP request without de-duplication"""
+        headers = self._request_headers(headers)
+        cache_entry, fresh, headers = self._cache_lookup(url, headers, bypass_cache)
+        if fresh:
+            return cache_entry["body"], self._resolve_encoding(cache_entry["body"], cache_entry["encoding"])
+        
+        response = self._fetch(url, headers, retry=retry)
+        if response is None:
+            return None
+        
+        return self._cache_response(url, headers, cache_entry, response)
+    
+    def _request_headers(self, headers=None):
+        """Get the headers a request is sent with, fingerprinted if enabled
         
-        self.request_counts[domain] += 1
+        They are built before the cache lookup so the cache can tell apart
+        responses to differently fingerprinted requests.
+        """
+        if not self.enabled:
+            return headers
+        return self._get_headers(headers)
+    
+    def _fetch(self, url, headers=None, consumer=None, retry=None):
+        """Send a request with headers from _request_headers through the selected service
         
-        # Rotate service if needed
-        if self.request_counts[domain] > self.max_requests_per_domain:
-            self._rotate_service()
-            self.request_counts[domain] = 1
+        With a consumer the body is streamed to it rather than kept.
+        """
+        if not self.enabled:
+            return self._make_direct_request(url, headers, consumer, retry)
         
-        # Prepare headers with fingerprinting if enabled
-        request_headers = self._get_headers(headers)
+        service = self._select_service(url)
         
         # Determine which service to use
-        if self.current_service == "BrightData":
-            return self._make_brightdata_request(url, request_headers)
-        elif self.current_service == "ScraperAPI":
-            return self._make_scraperapi_request(url, request_headers)
+        if service == "BrightData":
+            return self._make_brightdata_request(url, headers, consumer, retry)
+        elif service == "ScraperAPI":
+            return self._make_scraperapi_request(url, headers, consumer, retry)
         else:
-            return self._make_direct_request(url, request_headers)
+            return self._make_direct_request(url, headers, consumer, retry)
+    
+    def _cache_lookup(self, url, headers, bypass_cache=False):
+        """Look up url in the response cache
+        
+        Returns (entry, fresh, headers). For a stale entry the headers gain
+        the validators needed to revalidate it.
+        """
+        if not self.response_cache.enabled:
+            return None, False, headers
+        
+        if bypass_cache:
+            self.response_cache.record_bypass()
+            return None, False, headers
+        
+        entry, fresh = self.response_cache.lookup(url, headers)
+        if entry is None or fresh:
+            return entry, fresh, headers
+        
+        conditional_headers = self.response_cache.conditional_headers(entry)
+        return entry, False, {**(headers or {}), **conditional_headers}
+    
+    def _cache_response(self, url, headers, cache_entry, result):
+        """Turn a fetch result into (body, encoding), storing it in or refreshing it from the cache"""
+        if result.status_code == 304:
+            if cache_entry is None:
+                return None
+            
+            self.response_cache.revalidated(url, result.headers, headers)
+            return cache_entry["body"], self._resolve_encoding(cache_entry["body"], cache_entry["encoding"])
+        
+        # Never cache a partial body
+        if self.response_cache.enabled and not result.truncated:
+            self.response_cache.store(url, result.content, result.encoding, result.headers, headers)
+        
+        return result.content, self._resolve_encoding(result.content, result.encoding)
+    
+    def _decode_body(self, body, encoding):
+        """Decode a response body to text"""
+        return body.decode(encoding or "utf-8", errors="replace")
+    
+    def _resolve_encoding(self, body, declared):
+        """Pick the encoding for a body: declared charset, then <meta> charset, then capped detection"""
+        if declared:
+            return declared
+        
+        match = META_CHARSET.search(body[:4096])
+        if match:
+            encoding = match.group(1).decode("ascii")
+            try:
+                return codecs.lookup(encoding).name
+            except LookupError:
+                pass
+        
+        if not body:
+            return "utf-8"
+        
+        # Only look at a prefix so detection stays cheap on large pages
+        return chardet.detect(body[:self.detect_bytes])["encoding"] or "utf-8"
+    
+    def _declared_encoding(self, headers):
+        """Get the charset declared in a Content-Type header, if any"""
+        for param in headers.get("Content-Type", "").split(";")[1:]:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "charset":
+                return value.strip().strip("\"'") or None
+        return None
+    
+    def _build_result(self, status_code, headers, content, truncated=False):
+        """Wrap a fully read response"""
+        return FetchResult(status_code, headers, content, self._declared_encoding(headers), truncated)
+    
+    def _accepts_content_type(self, url, content_type):
+        """Check a response's Content-Type against the allowed types"""
+        media_type = content_type.split(";")[0].strip().lower()
+        
+        # Servers that omit the header get the benefit of the doubt
+        if not media_type or media_type in self.allowed_content_types:
+            return True
+        
+        self.logger.warning(f"Rejected {url}: unexpected content type {media_type}")
+        self._record_fetch_stat(url, "rejected")
+        return False
+    
+    def _record_fetch_stat(self, url, counter):
+        """Count a truncated, rejected or interrupted response against its domain"""
+        domain = self._extract_domain(url)
+        with self._lock:
+            stats = self.fetch_stats.setdefault(domain, {"truncated": 0, "rejected": 0, "interrupted": 0})
+            stats[counter] += 1
+    
+    def get_fetch_stats(self):
+        """Get truncated, rejected and interrupted response counts per domain"""
+        with self._lock:
+            return {domain: dict(stats) for domain, stats in self.fetch_stats.items()}
+    
+    def is_circuit_open(self, url):
+        """Check whether every usable route to url's domain is failing fast"""
+        domain = self._extract_domain(url)
+        services = self._available_services() if self.enabled else ["Direct"]
+        return all(self.circuit_breaker.is_open(service, domain) for service in services)
+    
+    def get_circuit_stats(self):
+        """Get circuit breaker state per service and domain"""
+        return self.circuit_breaker.get_stats()
+    
+    def get_service_usage(self):
+        """Get in-flight requests and quota usage per service"""
+        return self.service_quota.get_stats()
+    
+    def get_many_with_protection(self, urls, headers=None, bypass_cache=False, as_bytes=False):
+        """Fetch a batch of URLs concurrently, yielding (url, html) as each completes
+        
+        With as_bytes=True each result is (body, encoding) as returned by
+        get_bytes_with_protection.
+        """
+        return self.get_async_service().get_many(urls, headers, bypass_cache, as_bytes)
+    
+    def get_async_service(self):
+        """Get the asyncio fetch engine that shares this service's state"""
+        with self._lock:
+            if self.async_service is None:
+                self.async_service = AsyncProtectionService(self)
+            return self.async_service
+    
+    def _select_service(self, url):
+        """Pick the service for a request
+        
+        In adaptive mode the router picks the healthiest route for the domain;
+        in round_robin mode services rotate after too many hits on one domain.
+        """
+        domain = self._extract_domain(url)
+        
+        if self.routing_mode == "adaptive":
+            services = self._available_services()
+            
+            # Keep away from routes whose breaker is open unless nothing else is left
+            closed = [service for service in services if not self.circuit_breaker.is_open(service, domain)]
+            
+            # Shift traffic to Direct as paid services near their quota
+            service = self.router.choose(domain, self.service_quota.filter_services(closed or services))
+            self.current_service = service
+            return service
+        
+        with self._lock:
+            # Track requests per domain for rotation
+            if domain not in self.request_counts:
+                self.request_counts[domain] = 0
+            
+            self.request_counts[domain] += 1
+            
+            # Rotate service if needed
+            if self.request_counts[domain] > self.max_requests_per_domain:
+                self._rotate_service()
+                self.request_counts[domain] = 1
+            
+            # Don't spend a paid service's quota past its soft budget
+            if self.current_service not in self.service_quota.filter_services([self.current_service]):
+                return "Direct"
+            
+            return self.current_service
     
     def _get_headers(self, custom_headers=None):
         """Get request headers with optional fingerprinting"""
@@ -120,8 +492,8 @@ class ProtectionService:
         parsed_url = urlparse(url)
         return parsed_url.netloc
     
-    def _rotate_service(self):
-        """Rotate to next available service"""
+    def _available_services(self):
+        """List the services that are enabled in config"""
         services = ["Direct"]
         
         # Add BrightData if configured
@@ -132,135 +504,242 @@ class ProtectionService:
         if self.config_manager.get_value("protection.services.ScraperAPI.enabled", False):
             services.append("ScraperAPI")
         
+        return services
+    
+    def _rotate_service(self):
+        """Rotate to next available service"""
+        services = self._available_services()
+        
         # Get current index and rotate to next
-        try:
-            current_index = services.index(self.current_service)
-            next_index = (current_index + 1) % len(services)
-            self.set_service(services[next_index])
-            self.logger.info(f"Rotated to service: {self.current_service}")
-        except ValueError:
-            # Default to first service if current not found
-            self.set_service(services[0])
-            self.logger.info(f"Reset to service: {self.current_service}")
-    
-    def _make_brightdata_request(self, url, headers):
-        """Make request through BrightData proxy"""
-        # Get BrightData configuration
-        username = self.config_manager.get_value("protection.services.BrightData.username", "")
-        password = self.config_manager.get_value("protection.services.BrightData.password", "")
-        host = self.config_manager.get_value("protection.services.BrightData.host", "")
-        port = self.config_manager.get_value("protection.services.BrightData.port", "")
+        with self._lock:
+            try:
+                current_index = services.index(self.current_service)
+                next_index = (current_index + 1) % len(services)
+                self.set_service(services[next_index])
+                self.logger.info(f"Rotated to service: {self.current_service}")
+            except ValueError:
+                # Default to first service if current not found
+                self.set_service(services[0])
+                self.logger.info(f"Reset to service: {self.current_service}")
+    
+    def _get_route(self, service, url):
+        """Get the request URL, proxy and timeout for sending url through a service
         
-        if not all([username, password, host, port]):
-            self.logger.warning("BrightData proxy not fully configured, falling back to direct request")
-            return self._make_direct_request(url, headers)
+        Returns None if the service is not fully configured.
+        """
+        if service == "BrightData":
+            # Get BrightData configuration
+            username = self.config_manager.get_value("protection.services.BrightData.username", "")
+            password = self.config_manager.get_value("protection.services.BrightData.password", "")
+            host = self.config_manager.get_value("protection.services.BrightData.host", "")
+            port = self.config_manager.get_value("protection.services.BrightData.port", "")
+            
+            if not all([username, password, host, port]):
+                return None
+            
+            return {
+                "url": url,
+                "proxy": f"http://{username}:{password}@{host}:{port}",
+                "endpoint": f"{host}:{port}",
+                "timeout": 30
+            }
         
-        # Configure proxy
-        proxy_url = f"http://{username}:{password}@{host}:{port}"
-        proxies = {
-            "http": proxy_url,
-            "https": proxy_url
-        }
+        elif service == "ScraperAPI":
+            # Get ScraperAPI configuration
+            api_key = self.config_manager.get_value("protection.services.ScraperAPI.api_key", "")
+            
+            if not api_key:
+                return None
+            
+            return {
+                "url": f"http://api.scraperapi.com?api_key={api_key}&url={url}",
+                "proxy": None,
+                "endpoint": "api.scraperapi.com",
+                "timeout": 60  # Longer timeout for proxy services
+            }
         
-        # Add jitter delay to appear more human-like
-        time.sleep(random.uniform(1, 3))
+        return {
+            "url": url,
+            "proxy": None,
+            "endpoint": None,
+            "timeout": 30
+        }
+    
+    def _make_brightdata_request(self, url, headers, consumer=None, retry=None):
+        """Make request through BrightData proxy"""
+        route = self._get_route("BrightData", url)
         
-        # Make request with retry logic
-        max_retries = 3
-        for retry in range(max_retries):
-            try:
-                response = requests.get(
-                    url, 
-                    headers=headers, 
-                    proxies=proxies, 
-                    timeout=30
-                )
-                
-                if response.status_code == 200:
-                    return response.text
-                elif response.status_code in [403, 429]:
-                    # Being blocked, try another service next time
-                    self.logger.warning(f"Blocked with status {response.status_code}, rotating service")
-                    self._rotate_service()
-                    time.sleep(2 ** retry)  # Exponential backoff
-                else:
-                    self.logger.warning(f"Unexpected status code: {response.status_code}")
-                    return None
-            except Exception as e:
-                self.logger.error(f"Error making BrightData request: {e}")
-                time.sleep(2 ** retry)  # Exponential backoff
+        if route is None:
+            self.logger.warning("BrightData proxy not fully configured, falling back to direct request")
+            return self._make_direct_request(url, headers, consumer, retry)
         
-        # All retries failed
-        return None
+        return self._request_with_retries("BrightData", route, url, headers, consumer, retry)
     
-    def _make_scraperapi_request(self, url, headers):
+    def _make_scraperapi_request(self, url, headers, consumer=None, retry=None):
         """Make request through ScraperAPI"""
-        # Get ScraperAPI configuration
-        api_key = self.config_manager.get_value("protection.services.ScraperAPI.api_key", "")
+        route = self._get_route("ScraperAPI", url)
         
-        if not api_key:
+        if route is None:
             self.logger.warning("ScraperAPI not configured, falling back to direct request")
-            return self._make_direct_request(url, headers)
+            return self._make_direct_request(url, headers, consumer, retry)
         
-        # Build ScraperAPI URL
-        api_url = f"http://api.scraperapi.com?api_key={api_key}&url={url}"
+        return self._request_with_retries("ScraperAPI", route, url, headers, consumer, retry)
+    
+    def _make_direct_request(self, url, headers, consumer=None, retry=None):
+        """Make direct request without proxy"""
+        route = self._get_route("Direct", url)
+        return self._request_with_retries("Direct", route, url, headers, consumer, retry)
+    
+    def _request_with_retries(self, service, route, url, headers, consumer=None, retry=None):
+        """Send a request along a route, retrying on blocks and errors
         
-        # Add jitter delay to appear more human-like
-        time.sleep(random.uniform(1, 3))
+        A streamed body that fails part way is not retried, since the
+        consumer has already seen the start of it. With a RetryState the
+        backoff is not slept here: RetryDeferred is raised for the caller
+        to reschedule, and the next call resumes from the state.
+        """
+        # The transport follows the host we actually connect to
+        transport = self._get_transport(route["url"])
+        
+        domain = self._extract_domain(url)
         
         # Make request with retry logic
-        max_retries = 3
-        for retry in range(max_retries):
+        delay = retry.delay if retry is not None else 0
+        attempt = retry.attempt if retry is not None else 0
+        if attempt == 0:
+            self.retry_scheduler.record_request()
+        
+        while True:
+            # Fail fast while this route's breaker is open
+            if not self.circuit_breaker.allow(service, domain):
+                self.logger.debug(f"Circuit open for {service} on {domain}, skipping {url}")
+                return None
+            
+            # Wait only if this domain's request budget is exhausted
+            self.rate_limiter.acquire(domain)
+            
+            # Stay within the service's concurrency cap and count the request
+            self.service_quota.acquire(service)
+            
+            started = time.monotonic()
+            retry_after = None
             try:
-                response = requests.get(
-                    api_url, 
-                    headers=headers, 
-                    timeout=60  # Longer timeout for proxy services
-                )
+                response = transport.send(service, route, headers)
                 
-                if response.status_code == 200:
-                    return response.text
-                elif response.status_code in [403, 429]:
-                    # Being blocked, try another service next time
-                    self.logger.warning(f"Blocked with status {response.status_code}, rotating service")
-                    self._rotate_service()
-                    time.sleep(2 ** retry)  # Exponential backoff
-                else:
+                if response.status_code in [200, 304]:
+                    # Only a body that was read in full counts as a success
+                    result = self._read_response(url, response, consumer)
+                    self._report_result(service, url, started, "success")
+                    if result is not None:
+                        self.service_quota.record_bytes(service, result.size)
+                    return result
+                
+                response.close()
+                if not self.retry_scheduler.should_retry_status(response.status_code):
                     self.logger.warning(f"Unexpected status code: {response.status_code}")
+                    outcome = "error" if response.status_code >= 500 else "success"
+                    self._report_result(service, url, started, outcome)
                     return None
+                
+                self.logger.warning(f"Blocked with status {response.status_code} on {service}")
+                outcome = "blocked" if response.status_code in [403, 429] else "error"
+                self._report_result(service, url, started, outcome)
+                retry_after = response.headers.get("Retry-After")
+            except StreamInterrupted as e:
+                self.logger.error(f"Error streaming {url} through {service}: {e}")
+                self._record_fetch_stat(url, "interrupted")
+                # A failing consumer says nothing about the route's health
+                self._report_result(service, url, started, "success" if e.consumer_failed else "error")
+                return None
             except Exception as e:
-                self.logger.error(f"Error making ScraperAPI request: {e}")
-                time.sleep(2 ** retry)  # Exponential backoff
-        
-        # All retries failed
-        return None
+                self.logger.error(f"Error making {service} request: {e}")
+                self._report_result(service, url, started, "error")
+            finally:
+                self.service_quota.release(service)
+            
+            delay = self.retry_scheduler.next_delay(url, attempt, delay, retry_after)
+            if delay is None:
+                return None
+            
+            attempt += 1
+            if retry is not None:
+                # Let the caller use this worker for other URLs while the request backs off
+                retry.attempt = attempt
+                retry.delay = delay
+                raise RetryDeferred(url, delay, retry)
+            
+            time.sleep(delay)
     
-    def _make_direct_request(self, url, headers):
-        """Make direct request without proxy"""
-        # Add jitter delay to appear more human-like
-        time.sleep(random.uniform(0.5, 2))
+    def _read_response(self, url, response, consumer=None):
+        """Stream a response body, rejecting unwanted content types and capping its size
         
-        # Make request with retry logic
-        max_retries = 3
-        for retry in range(max_retries):
-            try:
-                response = requests.get(
-                    url, 
-                    headers=headers, 
-                    timeout=30
-                )
+        With a consumer, chunks are handed to it as they arrive instead of
+        being collected.
+        """
+        try:
+            if response.status_code == 304:
+                return self._build_result(304, response.headers, b"")
+            
+            # Abort before reading the body if the headers already rule it out
+            if not self._accepts_content_type(url, response.headers.get("Content-Type", "")):
+                return None
+            
+            body = bytearray()
+            size = 0
+            encoding = None
+            truncated = False
+            for chunk in response.iter_content(chunk_size=65536):
+                if size + len(chunk) > self.max_body_bytes:
+                    chunk = chunk[:self.max_body_bytes - size]
+                    truncated = True
+                size += len(chunk)
                 
-                if response.status_code == 200:
-                    return response.text
-                elif response.status_code in [403, 429]:
-                    self.logger.warning(f"Blocked with status {response.status_code}")
-                    time.sleep(2 ** retry)  # Exponential backoff
+                if consumer is None:
+                    body += chunk
                 else:
-                    self.logger.warning(f"Unexpected status code: {response.status_code}")
-                    return None
-            except Exception as e:
-                self.logger.error(f"Error making direct request: {e}")
-                time.sleep(2 ** retry)  # Exponential backoff
+                    if encoding is None:
+                        encoding = self._resolve_encoding(chunk, self._declared_encoding(response.headers))
+                    self._consume(consumer, chunk, encoding, size)
+                
+                if truncated:
+                    break
+            
+            if truncated:
+                self.logger.warning(f"Truncated {url} at {self.max_body_bytes} bytes")
+                self._record_fetch_stat(url, "truncated")
+            
+            if consumer is not None:
+                return FetchResult(response.status_code, response.headers, b"", encoding, truncated, size)
+            
+            return self._build_result(
+                response.status_code,
+                response.headers,
+                bytes(body),
+                truncated
+            )
+        except StreamInterrupted:
+            raise
+        except Exception as e:
+            # Once the consumer has part of the body a retry would repeat it
+            if consumer is not None and encoding is not None:
+                raise StreamInterrupted(e) from e
+            raise
+        finally:
+            response.close()
+    
+    def _consume(self, consumer, chunk, encoding, size):
+        """Hand a chunk to a stream consumer, turning its errors into StreamInterrupted"""
+        try:
+            consumer(chunk, encoding)
+        except Exception as e:
+            raise StreamInterrupted(f"consumer failed after {size} bytes: {e}", consumer_failed=True) from e
+    
+    def _report_result(self, service, url, started, outcome):
+        """Feed a request outcome back into routing"""
+        domain = self._extract_domain(url)
+        self.router.record(service, domain, time.monotonic() - started, outcome)
+        self.circuit_breaker.record(service, domain, outcome)
         
-        # All retries failed
-        return None
\ No newline at end of file
+        if outcome == "blocked" and service != "Direct" and self.routing_mode != "adaptive":
+            # Being blocked, try another service next time
+            self._rotate_service()
\ No newline at end of file
@@ -0,0 +1,138 @@
+# proxy_router.py - Health-scored routing across proxy services
+import json
+import logging
+import os
+import random
+import threading
+import time
+
+class ProxyRouter:
+    """Routes each request to the healthiest service for its domain
+
+    Latency, error rate and block rate are tracked per (service, domain) as
+    exponentially weighted moving averages. Most requests go to the route
+    with the lowest score, a small share explores the others, and a route
+    that fails repeatedly is quarantined for a cooldown. Stats are persisted
+    to a JSON file so routing decisions survive restarts.
+    """
+
+    def __init__(self, config_manager):
+        self.config_manager = config_manager
+        self.data_file = config_manager.get_value("protection.routing.stats_file", "routing_stats.json")
+        self.decay = config_manager.get_value("protection.routing.decay", 0.3)
+        self.exploration = config_manager.get_value("protection.routing.exploration", 0.1)
+        self.quarantine_after = config_manager.get_value("protection.routing.quarantine_after", 3)
+        self.cooldown = config_manager.get_value("protection.routing.cooldown", 300)
+        self.error_penalty = config_manager.get_value("protection.routing.error_penalty", 10)
+        self.block_penalty = config_manager.get_value("protection.routing.block_penalty", 20)
+        self.save_interval = 5
+        self.logger = logging.getLogger("ProxyRouter")
+
+        self.route_stats = self._load_data()
+        self._last_save = 0
+        self._lock = threading.Lock()
+
+    def choose(self, domain, services):
+        """Pick the service to use for a request to domain"""
+        now = time.time()
+
+        with self._lock:
+            available = [
+                service for service in services
+                if self._get_stats(service, domain)["quarantined_until"] <= now
+            ]
+
+            if not available:
+                # Everything is quarantined, so use the route that recovers first
+                return min(
+                    services,
+                    key=lambda service: self._get_stats(service, domain)["quarantined_until"]
+                )
+
+            if len(available) > 1 and random.random() < self.exploration:
+                return random.choice(available)
+
+            return min(available, key=lambda service: self._score(service, domain))
+
+    def record(self, service, domain, latency, outcome):
+        """Record the outcome of a request (success, blocked or error)"""
+        with self._lock:
+            stats = self._get_stats(service, domain)
+            alpha = self.decay
+
+            blocked = 1.0 if outcome == "blocked" else 0.0
+            error = 1.0 if outcome == "error" else 0.0
+
+            if stats["samples"] == 0:
+                stats["latency"] = latency
+            else:
+                stats["latency"] += alpha * (latency - stats["latency"])
+            stats["block_rate"] += alpha * (blocked - stats["block_rate"])
+            stats["error_rate"] += alpha * (error - stats["error_rate"])
+            stats["samples"] += 1
+
+            if outcome == "success":
+                stats["consecutive_failures"] = 0
+            else:
+                stats["consecutive_failures"] += 1
+                if stats["consecutive_failures"] >= self.quarantine_after:
+                    stats["quarantined_until"] = time.time() + self.cooldown
+                    stats["consecutive_failures"] = 0
+                    self.logger.warning(
+                        f"Quarantined {service} for {domain} for {self.cooldown}s"
+                    )
+
+            if time.time() - self._last_save >= self.save_interval:
+                self._save_data()
+
+    def get_stats(self):
+        """Get a copy of the per-route stats"""
+        with self._lock:
+            return {key: dict(stats) for key, stats in self.route_stats.items()}
+
+    def close(self):
+        """Persist stats to disk"""
+        with self._lock:
+            self._save_data()
+
+    def _score(self, service, domain):
+        """Score a route; lower is better and unseen routes score best"""
+        stats = self._get_stats(service, domain)
+        return (
+            stats["latency"]
+            + self.error_penalty * stats["error_rate"]
+            + self.block_penalty * stats["block_rate"]
+        )
+
+    def _get_stats(self, service, domain):
+        """Get or create the stats entry for a route"""
+        key = f"{service}|{domain}"
+        if key not in self.route_stats:
+            self.route_stats[key] = {
+                "latency": 0.0,
+                "error_rate": 0.0,
+                "block_rate": 0.0,
+                "samples": 0,
+                "consecutive_failures": 0,
+                "quarantined_until": 0
+            }
+        return self.route_stats[key]
+
+    def _load_data(self):
+        """Load route stats from file"""
+        if os.path.exists(self.data_file):
+            try:
+                with open(self.data_file, 'r') as f:
+                    return json.load(f)
+            except Exception as e:
+                self.logger.error(f"Error loading routing stats: {e}")
+        return {}
+
+    def _save_data(self):
+        """Save route stats to file"""
+        try:
+            with open(self.data_file, 'w') as f:
+                json.dump(self.route_stats, f, indent=2)
+            self._last_save = time.time()
+        except Exception as e:
+            self.logger.error(f"Error saving routing stats: {e}")
\ No newline at end of file
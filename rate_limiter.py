@@ -0,0 +1,125 @@
+# rate_limiter.py - Per-domain token bucket rate limiting
+import asyncio
+import logging
+import random
+import threading
+import time
+
+class TokenBucket:
+    """Token bucket holding the request budget for one domain"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def reserve(self):
+        """Take one token and return how long the caller must wait for it"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+        # Tokens may go negative so concurrent callers queue up behind each other
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return 0
+        return -self.tokens / self.rate
+
+class RateLimiter:
+    """Delays requests only when a domain's budget is exhausted
+
+    Budgets come from protection.rate_limits in the config, keyed by domain
+    with a "default" entry for everything else. Each entry has a rate in
+    requests per second, a burst size and a jitter in seconds that is added
+    to any delay so throttled requests are not evenly spaced.
+    """
+
+    DEFAULT_LIMIT = {"rate": 0.5, "burst": 2, "jitter": 0.5}
+
+    def __init__(self, config_manager):
+        self.config_manager = config_manager
+        self.buckets = {}
+        self.wait_stats = {}
+        self.logger = logging.getLogger("RateLimiter")
+        self._lock = threading.Lock()
+
+    def acquire(self, domain, caller=None):
+        """Block until a request to domain is allowed, returning the time waited"""
+        delay = self.reserve(domain)
+        if delay > 0:
+            time.sleep(delay)
+
+        self._record_wait(caller or threading.current_thread().name, domain, delay)
+        return delay
+
+    async def acquire_async(self, domain, caller=None):
+        """Wait without blocking the event loop until a request to domain is allowed"""
+        delay = self.reserve(domain)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if caller is None:
+            task = asyncio.current_task()
+            caller = task.get_name() if task else threading.current_thread().name
+
+        self._record_wait(caller, domain, delay)
+        return delay
+
+    def reserve(self, domain):
+        """Reserve a slot for domain and return the delay before it may be used"""
+        limit = self._get_limit(domain)
+
+        with self._lock:
+            bucket = self.buckets.get(domain)
+            if bucket is None:
+                bucket = TokenBucket(limit["rate"], limit["burst"])
+                self.buckets[domain] = bucket
+
+            delay = bucket.reserve()
+
+        if delay > 0:
+            delay += random.uniform(0, limit.get("jitter", 0))
+            self.logger.debug(f"Rate limit reached for {domain}, delaying {delay:.2f}s")
+
+        return delay
+
+    def get_stats(self):
+        """Get wait statistics per caller and per domain"""
+        with self._lock:
+            return {
+                key: dict(stats) for key, stats in self.wait_stats.items()
+            }
+
+    def reset(self):
+        """Drop all buckets so updated limits take effect"""
+        with self._lock:
+            self.buckets = {}
+
+    def _get_limit(self, domain):
+        """Look up the configured budget for a domain"""
+        limits = self.config_manager.get_value("protection.rate_limits", {})
+
+        limit = limits.get(domain)
+        if limit is None and domain.startswith("www."):
+            limit = limits.get(domain[4:])
+        if limit is None:
+            limit = limits.get("default", self.DEFAULT_LIMIT)
+
+        return {**self.DEFAULT_LIMIT, **limit}
+
+    def _record_wait(self, caller, domain, waited):
+        """Record how long a caller waited for a domain"""
+        with self._lock:
+            for key in (f"caller:{caller}", f"domain:{domain}"):
+                stats = self.wait_stats.setdefault(key, {
+                    "requests": 0,
+                    "delayed": 0,
+                    "total_wait": 0.0,
+                    "max_wait": 0.0
+                })
+                stats["requests"] += 1
+                if waited > 0:
+                    stats["delayed"] += 1
+                    stats["total_wait"] += waited
+                    stats["max_wait"] = max(stats["max_wait"], waited)
\ No newline at end of file
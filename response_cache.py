@@ -0,0 +1,222 @@
+# response_cache.py - On-disk HTTP response cache with conditional revalidation
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from urllib.parse import urlparse
+from single_flight import VARY_HEADERS
+
+class ResponseCache:
+    """SQLite-backed response cache shared by the protection layer
+
+    Entries expire after a per-domain TTL. Expired entries that carry an ETag
+    or Last-Modified header are revalidated with a conditional request rather
+    than downloaded again. Entries are keyed on the URL and the request
+    headers in VARY_HEADERS, so requests that would get different responses
+    (with and without fingerprinting, say) never share one. The cache is
+    bounded in size and evicts the least recently used entries first.
+    """
+
+    def __init__(self, config_manager):
+        self.config_manager = config_manager
+        self.enabled = config_manager.get_value("protection.cache.enabled", True)
+        self.path = config_manager.get_value("protection.cache.path", "http_cache.sqlite")
+        self.max_bytes = config_manager.get_value("protection.cache.max_bytes", 100 * 1024 * 1024)
+        self.default_ttl = config_manager.get_value("protection.cache.default_ttl", 3600)
+        self.logger = logging.getLogger("ResponseCache")
+
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "stale": 0,
+            "revalidations": 0,
+            "stores": 0,
+            "evictions": 0,
+            "bypasses": 0
+        }
+
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def lookup(self, url, request_headers=None):
+        """Find a cached entry for url requested with request_headers
+
+        Returns (entry, fresh) where entry is None on a miss. Stale entries are
+        still returned so their validators can be sent with the next request.
+        """
+        key = self._key(url, request_headers)
+        with self._lock:
+            row = self._get_conn().execute(
+                "SELECT body, encoding, etag, last_modified, expires_at FROM responses WHERE key = ?",
+                (key,)
+            ).fetchone()
+
+            if row is None:
+                self.stats["misses"] += 1
+                return None, False
+
+            entry = {
+                "body": row[0],
+                "encoding": row[1],
+                "etag": row[2],
+                "last_modified": row[3]
+            }
+            fresh = row[4] > time.time()
+
+            if fresh:
+                self.stats["hits"] += 1
+                self._touch(key)
+            elif not (entry["etag"] or entry["last_modified"]):
+                # Nothing to revalidate with, so this is a plain miss
+                self.stats["misses"] += 1
+                return None, False
+            else:
+                self.stats["stale"] += 1
+
+            return entry, fresh
+
+    def conditional_headers(self, entry):
+        """Build revalidation headers for a stale entry"""
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, url, body, encoding, response_headers, request_headers=None):
+        """Store a 200 response body"""
+        cache_control = response_headers.get("Cache-Control", "").lower()
+        if "no-store" in cache_control:
+            return
+
+        now = time.time()
+        with self._lock:
+            conn = self._get_conn()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, url, body, encoding, etag, last_modified, stored_at, expires_at, last_access, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    self._key(url, request_headers),
+                    url,
+                    body,
+                    encoding,
+                    response_headers.get("ETag"),
+                    response_headers.get("Last-Modified"),
+                    now,
+                    now + self._get_ttl(url),
+                    now,
+                    len(body)
+                )
+            )
+            self.stats["stores"] += 1
+            self._evict(conn)
+            conn.commit()
+
+    def revalidated(self, url, response_headers, request_headers=None):
+        """Refresh an entry after the server answered 304 Not Modified"""
+        now = time.time()
+        with self._lock:
+            conn = self._get_conn()
+            conn.execute(
+                "UPDATE responses SET expires_at = ?, last_access = ?, "
+                "etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified) "
+                "WHERE key = ?",
+                (
+                    now + self._get_ttl(url),
+                    now,
+                    response_headers.get("ETag"),
+                    response_headers.get("Last-Modified"),
+                    self._key(url, request_headers)
+                )
+            )
+            conn.commit()
+            self.stats["revalidations"] += 1
+
+    def record_bypass(self):
+        """Count a request that skipped the cache"""
+        with self._lock:
+            self.stats["bypasses"] += 1
+
+    def get_stats(self):
+        """Get cache counters and current size"""
+        with self._lock:
+            entries, size = self._get_conn().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+            return {**self.stats, "entries": entries, "bytes": size}
+
+    def clear(self):
+        """Remove all cached responses"""
+        with self._lock:
+            conn = self._get_conn()
+            conn.execute("DELETE FROM responses")
+            conn.commit()
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _get_conn(self):
+        """Open the database on first use"""
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, url TEXT, body BLOB, encoding TEXT, "
+                "etag TEXT, last_modified TEXT, stored_at REAL, expires_at REAL, "
+                "last_access REAL, size INTEGER)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses (last_access)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def _touch(self, key):
+        """Mark an entry as recently used"""
+        conn = self._get_conn()
+        conn.execute(
+            "UPDATE responses SET last_access = ? WHERE key = ?",
+            (time.time(), key)
+        )
+        conn.commit()
+
+    def _evict(self, conn):
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+        while total > self.max_bytes:
+            row = conn.execute(
+                "SELECT key, size FROM responses ORDER BY last_access LIMIT 1"
+            ).fetchone()
+            if row is None:
+                break
+
+            conn.execute("DELETE FROM responses WHERE key = ?", (row[0],))
+            total -= row[1]
+            self.stats["evictions"] += 1
+
+    def _get_ttl(self, url):
+        """Get the TTL for a URL's domain"""
+        domain = urlparse(url).netloc
+        domain_ttls = self.config_manager.get_value("protection.cache.domain_ttls", {})
+
+        if domain in domain_ttls:
+            return domain_ttls[domain]
+        if domain.startswith("www.") and domain[4:] in domain_ttls:
+            return domain_ttls[domain[4:]]
+        return self.default_ttl
+
+    def _key(self, url, request_headers=None):
+        """Hash a URL and the request headers that change its response into a cache key"""
+        vary = sorted(
+            f"{name.lower()}: {value}" for name, value in (request_headers or {}).items()
+            if name.lower() in VARY_HEADERS
+        )
+        return hashlib.sha256("\n".join([url] + vary).encode("utf-8")).hexdigest()
\ No newline at end of file
@@ -62,9 +62,10 @@ class ResultFormatter:
             
             html += f'<div class="job-source">{job.get("source", "Unknown")}</div>'
             
-            # Add description if available
-            if job.get('description'):
-                html += f'<div class="job-description">{job.get("description")}</div>'
+            # Add description if available, preferring the full one from the job page
+            description = job.get('full_description') or job.get('description')
+            if description:
+                html += f'<div class="job-description">{description}</div>'
             
             # Add link if available
             if job.get('url'):
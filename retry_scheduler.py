@@ -0,0 +1,137 @@
+# retry_scheduler.py - Retry timing with Retry-After support and a global retry budget
+import logging
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+class RetryState:
+    """Retry progress of a request whose caller schedules the retries itself
+
+    Passing a fresh RetryState to the protection layer opts a request out of
+    sleeping between attempts: a retryable failure raises RetryDeferred
+    instead, and the caller retries later with the same state so the attempt
+    count and backoff carry over.
+    """
+
+    def __init__(self):
+        self.attempt = 0
+        self.delay = 0
+
+class RetryDeferred(Exception):
+    """A retryable failure handed back to the caller to retry after delay seconds"""
+
+    def __init__(self, url, delay, state):
+        super().__init__(f"Retry {url} in {delay:.2f}s")
+        self.url = url
+        self.delay = delay
+        self.state = state
+
+class RetryScheduler:
+    """Decides whether a failed request may be retried and when
+
+    Delays follow decorrelated jitter, so each backoff is drawn between the
+    base delay and three times the previous one, and a server's Retry-After
+    header sets the minimum wait. Retries draw from a budget shared by all
+    requests: every request deposits a fraction of a retry and the budget
+    also refills slowly over time, so a struggling site sees at most a small
+    multiple of normal traffic.
+    """
+
+    def __init__(self, config_manager):
+        self.config_manager = config_manager
+        self.max_attempts = config_manager.get_value("protection.retry.max_attempts", 3)
+        self.base_delay = config_manager.get_value("protection.retry.base_delay", 1.0)
+        self.max_delay = config_manager.get_value("protection.retry.max_delay", 30.0)
+        self.max_retry_after = config_manager.get_value("protection.retry.max_retry_after", 120)
+        self.retry_statuses = config_manager.get_value("protection.retry.statuses", [403, 429, 503])
+        self.budget_ratio = config_manager.get_value("protection.retry.budget_ratio", 0.2)
+        self.budget_min_per_second = config_manager.get_value("protection.retry.budget_min_per_second", 0.5)
+        self.budget_cap = config_manager.get_value("protection.retry.budget_cap", 10)
+        self.logger = logging.getLogger("RetryScheduler")
+
+        self.stats = {
+            "requests": 0,
+            "retries": 0,
+            "retry_after_honored": 0,
+            "retry_after_too_long": 0,
+            "budget_exhausted": 0
+        }
+
+        self.tokens = self.budget_cap
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def record_request(self):
+        """Count a new request, adding its share to the retry budget"""
+        with self._lock:
+            self.stats["requests"] += 1
+            self._refill()
+            self.tokens = min(self.budget_cap, self.tokens + self.budget_ratio)
+
+    def should_retry_status(self, status_code):
+        """Check whether a response status is worth retrying"""
+        return status_code in self.retry_statuses
+
+    def next_delay(self, url, attempt, previous_delay=0, retry_after=None):
+        """Get the delay before retrying a failed attempt, or None to give up
+
+        attempt counts from 0 for the first try and previous_delay is the
+        delay returned for the attempt before it.
+        """
+        if attempt + 1 >= self.max_attempts:
+            return None
+
+        wait = self._parse_retry_after(retry_after)
+        if wait is not None and wait > self.max_retry_after:
+            self.logger.warning(f"Retry-After of {wait:.0f}s for {url} exceeds limit, giving up")
+            with self._lock:
+                self.stats["retry_after_too_long"] += 1
+            return None
+
+        with self._lock:
+            self._refill()
+            if self.tokens < 1:
+                self.stats["budget_exhausted"] += 1
+                self.logger.warning(f"Retry budget exhausted, not retrying {url}")
+                return None
+
+            self.tokens -= 1
+            self.stats["retries"] += 1
+            if wait is not None:
+                self.stats["retry_after_honored"] += 1
+
+        # Decorrelated jitter
+        delay = min(self.max_delay, random.uniform(self.base_delay, max(self.base_delay, previous_delay * 3)))
+        if wait is not None:
+            delay = max(delay, wait)
+
+        self.logger.debug(f"Retrying {url} in {delay:.2f}s (attempt {attempt + 2})")
+        return delay
+
+    def get_stats(self):
+        """Get retry counters and the current budget"""
+        with self._lock:
+            self._refill()
+            return dict(self.stats, budget=round(self.tokens, 2))
+
+    def _refill(self):
+        """Top up the budget at the minimum retry rate"""
+        now = time.monotonic()
+        self.tokens = min(self.budget_cap, self.tokens + (now - self.updated) * self.budget_min_per_second)
+        self.updated = now
+
+    def _parse_retry_after(self, value):
+        """Convert a Retry-After header (seconds or HTTP date) to seconds"""
+        if not value:
+            return None
+
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
\ No newline at end of file
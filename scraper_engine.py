@@ -1,18 +1,56 @@
 import json
 import logging
 import os
-from bs4 import BeautifulSoup
-from urllib.parse import urlparse, urljoin
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from crawl_frontier import CrawlFrontier
+from extraction_rules import ExtractionRules
+from html_parser import HtmlParser
+from job_enrichment import JobEnricher
+from parse_stage import ParseStage, get_embedded
+from retry_scheduler import RetryDeferred, RetryState
+from scrapers import available_scrapers, get_all_scrapers
+from stream_parser import StreamingExtractor
+from urllib.parse import parse_qs, urlparse
 
 class ScraperEngine:
+    # Subtrees the job site searches read; the rest of the page is skipped
+    # while parsing. Listing sites take theirs from their extraction rule.
+    PARSE_TARGETS = {
+        "indeed.com": ["div.job_seen_beacon"],
+        "remoteok.com": ["tr.job"]
+    }
+    
+    # Query parameter that selects the results page on sites with predictable
+    # page URLs. Their pages are all queued up front instead of being found
+    # one next link at a time.
+    PAGE_PARAMS = {
+        "ebay.com": "_pgn",
+        "amazon.com": "page"
+    }
+    
     def __init__(self, config_manager, claude_service, protection_service):
         self.config_manager = config_manager
         self.claude_service = claude_service
         self.protection_service = protection_service
         self.logger = logging.getLogger("ScraperEngine")
+        self.last_source_stats = {}
+        self.html_parser = HtmlParser(config_manager)
+        self.extraction_rules = ExtractionRules(config_manager)
+        self.parse_stage = ParseStage(config_manager, self.html_parser, self.extraction_rules)
+        self.stream_parsing = config_manager.get_value("scraping.stream_parsing", False)
+        self.scrapers = get_all_scrapers()
+        self.enricher = JobEnricher(config_manager, protection_service, self.scrapers)
     
-    def search_jobs(self, query, sources=None, location=None):
-        """Search for jobs matching query"""
+    def search_jobs(self, query, sources=None, location=None, return_stats=False, on_job=None):
+        """Search for jobs matching query
+        
+        Sources are searched concurrently. Per-source timing and error counts
+        are kept in last_source_stats and returned with the jobs when
+        return_stats is True. on_job, if given, is called from the source
+        threads with each unfiltered job as soon as a source finds it.
+        """
         self.logger.info(f"Searching for jobs: {query}")
         
         # API Call 1: Use Claude to analyze the query and generate search parameters
@@ -25,38 +63,21 @@ class ScraperEngine:
         self.logger.info(f"Generated keywords: {keywords}")
         self.logger.info(f"Generated exclude keywords: {exclude_keywords}")
         
-        # Determine which sources to search
+        # Determine which sources to search, ignoring ones an older config still enables
+        # but no plugin provides
         if sources is None:
             sources = [
                 source for source, enabled in 
                 self.config_manager.get_value("job_sources", {}).items() 
-                if enabled
+                if enabled and source in available_scrapers
             ]
         
         # Search each enabled source (Using VPN protection if enabled)
         all_jobs = []
+        self.last_source_stats = {}
         
-        for source in sources:
-            try:
-                self.logger.info(f"Searching {source}...")
-                if source == "Indeed":
-                    jobs = self._search_indeed(keywords, exclude_keywords, location)
-                elif source == "RemoteOK":
-                    jobs = self._search_remoteok(keywords, exclude_keywords)
-                elif source == "LinkedIn":
-                    jobs = self._search_linkedin(keywords, exclude_keywords, location)
-                elif source == "Freelancer":
-                    jobs = self._search_freelancer(keywords, exclude_keywords)
-                elif source == "Craigslist":
-                    jobs = self._search_craigslist(keywords, exclude_keywords, location)
-                else:
-                    self.logger.warning(f"Unknown source: {source}")
-                    continue
-                
-                self.logger.info(f"Found {len(jobs)} jobs on {source}")
-                all_jobs.extend(jobs)
-            except Exception as e:
-                self.logger.error(f"Error searching {source}: {e}")
+        for source, jobs in self._search_sources(sources, keywords, exclude_keywords, location, on_job):
+            all_jobs.extend(jobs)
         
         # API Call 2: Filter out bootcamps and low-quality listings
         # This API call is independent of VPN/fingerprinting settings
@@ -64,16 +85,122 @@ class ScraperEngine:
             filtered_jobs = self.claude_service.filter_jobs(all_jobs, query)
             self.logger.info(f"Filtered from {len(all_jobs)} to {len(filtered_jobs)} jobs")
             
+            # Fetch full details only for the listings that will be shown
+            filtered_jobs = self.enricher.enrich(filtered_jobs)
+            
             # Save to file
             self._save_jobs(filtered_jobs, "all_jobs.json")
             
             # Generate HTML report
             self._generate_job_report(filtered_jobs, query)
-            
-            return filtered_jobs
         else:
             self.logger.warning("No jobs found")
-            return []
+            filtered_jobs = []
+        
+        if return_stats:
+            return filtered_jobs, self.last_source_stats
+        return filtered_jobs
+    
+    def close(self):
+        """Shut down the parse stage's worker processes"""
+        self.parse_stage.close()
+    
+    def _search_sources(self, sources, keywords, exclude_keywords, location, on_job=None):
+        """Search sources on their own worker threads, yielding (source, jobs) as each finishes
+        
+        Every source gets a thread, so none waits behind another, and its
+        timeout is measured from when it was submitted. A slow or hanging
+        board never holds up the others, and search_jobs returns once every
+        source has finished or timed out. Sources with no registered scraper
+        are skipped.
+        """
+        source_timeout = self.config_manager.get_value("scraping.source_timeout", 120)
+        
+        executor = ThreadPoolExecutor(max_workers=max(1, len(sources)), thread_name_prefix="JobSource")
+        started = {}
+        futures = {}
+        submitted = time.monotonic()
+        deadline = submitted + source_timeout
+        
+        for source in sources:
+            self.last_source_stats[source] = {
+                "jobs": 0,
+                "elapsed": 0.0,
+                "errors": 0,
+                "status": "pending"
+            }
+            future = executor.submit(
+                self._run_source, source, keywords, exclude_keywords, location, started, on_job
+            )
+            futures[future] = source
+        
+        pending = set(futures)
+        try:
+            while pending:
+                # Wake up in time for the shared deadline
+                done, pending = wait(
+                    pending, timeout=max(0, deadline - time.monotonic()), return_when=FIRST_COMPLETED
+                )
+                
+                now = time.monotonic()
+                for future in done:
+                    source = futures[future]
+                    stats = self.last_source_stats[source]
+                    stats["elapsed"] = now - started.get(source, submitted)
+                    
+                    try:
+                        jobs = future.result()
+                    except Exception as e:
+                        self.logger.error(f"Error searching {source}: {e}")
+                        stats["errors"] += 1
+                        stats["status"] = "error"
+                        continue
+                    
+                    if jobs is None:
+                        stats["status"] = "skipped"
+                        continue
+                    
+                    self.logger.info(f"Found {len(jobs)} jobs on {source} in {stats['elapsed']:.1f}s")
+                    stats["jobs"] = len(jobs)
+                    stats["status"] = "ok"
+                    yield source, jobs
+                
+                # Give up on sources that have run past their timeout
+                if now >= deadline:
+                    for future in pending:
+                        source = futures[future]
+                        self.logger.warning(f"Timed out searching {source} after {source_timeout}s")
+                        stats = self.last_source_stats[source]
+                        stats["elapsed"] = now - started.get(source, submitted)
+                        stats["errors"] += 1
+                        stats["status"] = "timeout"
+                        future.cancel()
+                    pending = set()
+        finally:
+            # Don't wait for hung sources; their threads finish in the background
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _run_source(self, source, keywords, exclude_keywords, location, started, on_job=None):
+        """Run a single source search on a worker thread through its registered scraper"""
+        started[source] = time.monotonic()
+        self.logger.info(f"Searching {source}...")
+        
+        scraper = self.scrapers.get(source)
+        if scraper is None:
+            self.logger.warning(f"No scraper available for source: {source}")
+            return None
+        
+        capabilities = scraper.capabilities
+        if location and not capabilities.location:
+            self.logger.info(f"{source} does not support locations, searching without one")
+            location = None
+        
+        max_pages = self.config_manager.get_value("scraping.search_pages", 1) if capabilities.pagination else 1
+        
+        return scraper.search(
+            keywords, exclude_keywords, location, self.protection_service, 
+            fetch_records=self._fetch_records, max_pages=max_pages, on_job=on_job
+        )
     
     def crawl_general(self, query, max_pages=10):
         """Execute a general crawl based on query"""
@@ -90,57 +217,11 @@ class ScraperEngine:
         
         self.logger.info(f"Generated strategy for {len(target_sites)} sites: {target_sites}")
         
-        # Generate search URLs
-        search_urls = self._generate_search_urls(target_sites, search_params)
+        # Generate search URLs, with every page up front where the site's page URLs are predictable
+        search_urls = self._generate_search_urls(target_sites, search_params, max_pages)
         
-        # Crawl each URL (Using VPN protection if enabled)
-        all_results = []
-        
-        for url in search_urls:
-            try:
-                self.logger.info(f"Crawling: {url}")
-                
-                # Make request with protection
-                html = self.protection_service.get_with_protection(url)
-                
-                if html:
-                    # Extract data from the page
-                    page_results = self._extract_data(html, url, data_points)
-                    
-                    if page_results:
-                        self.logger.info(f"Found {len(page_results)} results from {url}")
-                        all_results.extend(page_results)
-                        
-                        # Find and follow next page if within limit
-                        current_page = 1
-                        while current_page < max_pages:
-                            next_url = self._find_next_page(html, url)
-                            if not next_url or next_url == url:
-                                break
-                                
-                            # Request next page
-                            self.logger.info(f"Following next page: {next_url}")
-                            html = self.protection_service.get_with_protection(next_url)
-                            if not html:
-                                break
-                                
-                            # Extract data from next page
-                            next_results = self._extract_data(html, next_url, data_points)
-                            if next_results:
-                                self.logger.info(f"Found {len(next_results)} results on page {current_page + 1}")
-                                all_results.extend(next_results)
-                                
-                                # Update for next iteration
-                                url = next_url
-                                current_page += 1
-                            else:
-                                break
-                    else:
-                        self.logger.warning(f"No results extracted from {url}")
-                else:
-                    self.logger.warning(f"Failed to get content from {url}")
-            except Exception as e:
-                self.logger.error(f"Error crawling {url}: {e}")
+        # Crawl every site through one frontier (Using VPN protection if enabled)
+        all_results = self._crawl_frontier(search_urls, max_pages, data_points)
         
         # Apply filtering criteria
         filtered_results = self._apply_filters(all_results, filtering_criteria)
@@ -158,156 +239,102 @@ class ScraperEngine:
             self.logger.warning("No results found")
             return []
     
-    def _search_indeed(self, keywords, exclude_keywords, location=None):
-        """Search Indeed for jobs"""
-        # Build search URL
-        keyword_str = "+".join(keywords)
-        exclude_str = " ".join(f"-{kw}" for kw in exclude_keywords)
-        
-        query = f"{keyword_str} {exclude_str}".strip()
-        query = query.replace(" ", "+")
-        
-        if location:
-            url = f"https://www.indeed.com/jobs?q={query}&l={location}"
-        else:
-            url = f"https://www.indeed.com/jobs?q={query}&remotejob=032b3046-06a3-4876-8dfd-474eb5e7ed11"
-        
-        # Get the page content
-        html = self.protection_service.get_with_protection(url)
-        
-        if not html:
-            self.logger.warning("Failed to get Indeed search results")
-            return []
+    def _crawl_frontier(self, seed_urls, max_pages, data_points):
+        """Crawl seed pages and the next pages they lead to across all sites at once
+        
+        Seed and next-page URLs from every site share one CrawlFrontier,
+        drained by scraping.crawl_workers threads, so pages of different
+        sites (eBay page 3 and Amazon page 2, say) are fetched and parsed
+        side by side. max_pages is each site's page budget, and at most
+        scraping.crawl_max_per_host pages of one host are in flight. Sites
+        in PAGE_PARAMS arrive with all their pages already generated. A page
+        that has to back off goes back on the frontier until its delay is
+        up, so its worker and host slot serve other pages in the meantime.
+        """
+        workers = self.config_manager.get_value("scraping.crawl_workers", 4)
+        frontier = CrawlFrontier(max_pages, self.config_manager.get_value("scraping.crawl_max_per_host", 2))
+        for url in seed_urls:
+            frontier.add(url, self._get_page_number(url))
         
-        # Parse the HTML with BeautifulSoup
-        soup = BeautifulSoup(html, 'html.parser')
+        results = []
+        lock = threading.Lock()
         
-        # Extract job listings
-        job_cards = soup.select("div.job_seen_beacon")
+        def work():
+            while True:
+                item = frontier.get()
+                if item is None:
+                    return
+                
+                url, page, retry = item
+                try:
+                    records = self._crawl_page(frontier, url, page, data_points, retry or RetryState())
+                    with lock:
+                        results.extend(records)
+                except RetryDeferred as e:
+                    self.logger.info(f"Backing off page {page} for {e.delay:.1f}s: {url}")
+                    frontier.retry(url, page, e.state, e.delay)
+                except Exception as e:
+                    self.logger.error(f"Error crawling {url}: {e}")
+                finally:
+                    frontier.done(url)
         
-        jobs = []
-        for card in job_cards:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="Crawler") as executor:
+            crawlers = [executor.submit(work) for _ in range(workers)]
             try:
-                # Extract job details
-                title_elem = card.select_one("h2.jobTitle span")
-                company_elem = card.select_one("span.companyName")
-                location_elem = card.select_one("div.companyLocation")
-                
-                # Get job URL
-                job_link_elem = card.select_one("h2.jobTitle a")
-                job_url = ""
-                
-                if job_link_elem and job_link_elem.has_attr("href"):
-                    job_path = job_link_elem["href"]
-                    if job_path.startswith("/"):
-                        job_url = f"https://www.indeed.com{job_path}"
-                    else:
-                        job_url = job_path
-                
-                # Get job description snippet
-                snippet_elem = card.select_one("div.job-snippet")
-                
-                # Get salary if available
-                salary_elem = card.select_one("div.salary-snippet-container")
-                
-                # Create job object
-                job = {
-                    "title": title_elem.text.strip() if title_elem else "Unknown",
-                    "company": company_elem.text.strip() if company_elem else "Unknown",
-                    "location": location_elem.text.strip() if location_elem else "Unknown",
-                    "url": job_url,
-                    "description": snippet_elem.text.strip() if snippet_elem else "",
-                    "salary": salary_elem.text.strip() if salary_elem else "Not specified",
-                    "source": "Indeed"
-                }
-                
-                jobs.append(job)
-            
-            except Exception as e:
-                self.logger.error(f"Error parsing Indeed job card: {e}")
+                for crawler in crawlers:
+                    crawler.result()
+            finally:
+                frontier.close()
         
-        return jobs
+        return results
     
-    def _search_remoteok(self, keywords, exclude_keywords):
-        """Search RemoteOK for jobs"""
-        # Simplified implementation - expand as needed
-        keyword_str = "+".join(keywords)
-        url = f"https://remoteok.com/remote-{keyword_str}-jobs"
+    def _crawl_page(self, frontier, url, page, data_points, retry=None):
+        """Fetch and extract one listing page, queueing its next page on the frontier
         
-        html = self.protection_service.get_with_protection(url)
+        On sites whose pages were all generated up front, an empty page means
+        the results have run out, so the site's later pages are dropped. They
+        are also dropped when a failed fetch leaves the site's circuit open.
+        Raises RetryDeferred if the fetch has to back off.
+        """
+        self.logger.info(f"Crawling page {page}: {url}")
+        host = urlparse(url).netloc
+        generated = self._get_page_param(url) is not None
+        parsed = self._fetch_records("listing", url, data_points, retry=retry)
+        if not parsed:
+            self.logger.warning(f"Failed to get content from {url}")
+            if self.protection_service.is_circuit_open(url):
+                dropped = frontier.drop_site(host, page)
+                if dropped:
+                    self.logger.warning(f"Circuit open for {host}, dropped {dropped} later pages")
+            return []
         
-        if not html:
-            self.logger.warning("Failed to get RemoteOK search results")
+        records = parsed["records"]
+        if not records:
+            self.logger.warning(f"No results extracted from {url}")
+            if generated:
+                dropped = frontier.drop_site(host, page)
+                if dropped:
+                    self.logger.info(f"Dropped {dropped} later pages of {host}")
             return []
         
-        # Parse HTML and extract jobs
-        soup = BeautifulSoup(html, 'html.parser')
-        job_rows = soup.select("tr.job")
+        self.logger.info(f"Found {len(records)} results on page {page} of {host}")
         
-        jobs = []
-        for row in job_rows:
-            try:
-                # Extract job details
-                title_elem = row.select_one("h2")
-                company_elem = row.select_one("h3")
-                tags_elem = row.select("div.tags div.tag")
-                
-                # Get job URL
-                job_url = "https://remoteok.com" + row.get("data-url", "") if row.has_attr("data-url") else ""
-                
-                # Get job description
-                desc_elem = row.select_one("div.description")
-                
-                # Get salary if available
-                salary_elem = row.select_one("div.salary")
-                
-                # Create job object
-                job = {
-                    "title": title_elem.text.strip() if title_elem else "Unknown",
-                    "company": company_elem.text.strip() if company_elem else "Unknown",
-                    "location": "Remote",
-                    "url": job_url,
-                    "description": desc_elem.text.strip() if desc_elem else "",
-                    "salary": salary_elem.text.strip() if salary_elem else "Not specified",
-                    "tags": [tag.text.strip() for tag in tags_elem] if tags_elem else [],
-                    "source": "RemoteOK"
-                }
-                
-                # Filter out jobs with exclude keywords in title or description
-                if any(kw.lower() in job["title"].lower() or 
-                       kw.lower() in job["description"].lower() 
-                       for kw in exclude_keywords):
-                    continue
-                
-                jobs.append(job)
-            
-            except Exception as e:
-                self.logger.error(f"Error parsing RemoteOK job card: {e}")
+        next_url = parsed["next_page"]
+        if next_url and next_url != url and not generated:
+            # Stop paginating a site that is hard-blocking us
+            if self.protection_service.is_circuit_open(next_url):
+                self.logger.warning(f"Circuit open for {urlparse(next_url).netloc}, skipping remaining pages")
+            elif frontier.add(next_url, page + 1):
+                self.logger.info(f"Queued next page: {next_url}")
         
-        return jobs
-    
-    def _search_linkedin(self, keywords, exclude_keywords, location=None):
-        """Search LinkedIn for jobs"""
-        # LinkedIn has strong anti-scraping measures, so this is a placeholder implementation
-        # In a production environment, you would need to use their API or implement more sophisticated scraping
-        self.logger.warning("LinkedIn scraping not fully implemented - this is a placeholder")
-        return []
+        return records
     
-    def _search_freelancer(self, keywords, exclude_keywords):
-        """Search Freelancer for jobs"""
-        # Placeholder implementation
-        self.logger.warning("Freelancer scraping not fully implemented - this is a placeholder")
-        return []
-    
-    def _search_craigslist(self, keywords, exclude_keywords, location=None):
-        """Search Craigslist for jobs"""
-        # Craigslist implementation would depend on location
-        # This is a placeholder implementation
-        self.logger.warning("Craigslist scraping not fully implemented - this is a placeholder")
-        return []
-    
-    def _generate_search_urls(self, target_sites, search_params):
-        """Generate search URLs for target sites"""
+    def _generate_search_urls(self, target_sites, search_params, max_pages=1):
+        """Generate search URLs for target sites
+        
+        Sites in PAGE_PARAMS get the URLs of pages 1 to max_pages so they can
+        be fetched in parallel; other sites get their first page only.
+        """
         urls = []
         
         # Get search keywords
@@ -327,12 +354,12 @@ class ScraperEngine:
                 if price_max:
                     url += f"&_udhi={price_max}"
                 
-                urls.append(url)
+                urls.extend(self._get_page_urls(url, max_pages))
             
             elif "amazon.com" in site:
                 # Amazon URL construction
                 url = f"https://www.amazon.com/s?k={keyword_str}"
-                urls.append(url)
+                urls.extend(self._get_page_urls(url, max_pages))
             
             elif "google.com" in site:
                 # Google URL construction
@@ -358,160 +385,72 @@ class ScraperEngine:
         
         return urls
     
-    def _extract_data(self, html, url, data_points):
-        """Extract data from HTML based on the URL and data points"""
-        soup = BeautifulSoup(html, 'html.parser')
-        results = []
-        
-        # Determine extraction logic based on the domain
+    def _get_page_urls(self, url, max_pages):
+        """Get the URLs of pages 1 to max_pages of a search on a site in PAGE_PARAMS"""
+        param = self._get_page_param(url)
+        if param is None:
+            return [url]
+        return [url] + [f"{url}&{param}={page}" for page in range(2, max_pages + 1)]
+    
+    def _get_page_param(self, url):
+        """Look up the page query parameter for url's site, or None if its pages are found by next links"""
         domain = urlparse(url).netloc
-        
-        if "ebay.com" in domain:
-            # eBay extraction logic
-            items = soup.select('li.s-item')
-            for item in items:
-                try:
-                    title_elem = item.select_one('h3.s-item__title')
-                    price_elem = item.select_one('span.s-item__price')
-                    link_elem = item.select_one('a.s-item__link')
-                    
-                    result = {
-                        "title": title_elem.text.strip() if title_elem else "",
-                        "price": price_elem.text.strip() if price_elem else "",
-                        "url": link_elem['href'] if link_elem and 'href' in link_elem.attrs else "",
-                        "source": "ebay.com"
-                    }
-                    
-                    # Extract additional data points if requested
-                    if "condition" in data_points:
-                        condition_elem = item.select_one('span.SECONDARY_INFO')
-                        if condition_elem:
-                            result["condition"] = condition_elem.text.strip()
-                    
-                    if "shipping" in data_points:
-                        shipping_elem = item.select_one('span.s-item__shipping')
-                        if shipping_elem:
-                            result["shipping"] = shipping_elem.text.strip()
-                    
-                    results.append(result)
-                except Exception as e:
-                    self.logger.error(f"Error extracting eBay item: {e}")
-        
-        elif "amazon.com" in domain:
-            # Amazon extraction logic
-            items = soup.select('div[data-component-type="s-search-result"]')
-            for item in items:
-                try:
-                    title_elem = item.select_one('h2 span')
-                    price_elem = item.select_one('span.a-price .a-offscreen')
-                    link_elem = item.select_one('h2 a')
-                    
-                    result = {
-                        "title": title_elem.text.strip() if title_elem else "",
-                        "price": price_elem.text.strip() if price_elem else "",
-                        "url": f"https://www.amazon.com{link_elem['href']}" if link_elem and 'href' in link_elem.attrs else "",
-                        "source": "amazon.com"
-                    }
-                    
-                    # Extract additional data points if requested
-                    if "rating" in data_points:
-                        rating_elem = item.select_one('span.a-icon-alt')
-                        if rating_elem:
-                            result["rating"] = rating_elem.text.strip()
-                    
-                    if "review_count" in data_points:
-                        review_elem = item.select_one('span.a-size-base')
-                        if review_elem:
-                            result["review_count"] = review_elem.text.strip()
-                    
-                    results.append(result)
-                except Exception as e:
-                    self.logger.error(f"Error extracting Amazon item: {e}")
-        
-        elif "kayak.com" in domain:
-            # Kayak flights extraction
-            items = soup.select('div[class*="resultInner"]')
-            for item in items:
-                try:
-                    price_elem = item.select_one('span[class*="price-text"]')
-                    airline_elem = item.select_one('div[class*="carrierName"]')
-                    time_elem = item.select_one('div[class*="duration"]')
-                    
-                    result = {
-                        "price": price_elem.text.strip() if price_elem else "",
-                        "airline": airline_elem.text.strip() if airline_elem else "",
-                        "duration": time_elem.text.strip() if time_elem else "",
-                        "source": "kayak.com"
-                    }
-                    
-                    results.append(result)
-                except Exception as e:
-                    self.logger.error(f"Error extracting Kayak flight: {e}")
-        
-        else:
-            # Generic extraction logic - try to find product-like items
-            items = soup.select('div.product, div.item, div.result, div[class*="product"], div[class*="item"]')
-            for item in items:
-                try:
-                    title_elem = item.select_one('h2, h3, h4, [class*="title"]')
-                    price_elem = item.select_one('[class*="price"]')
-                    link_elem = item.select_one('a')
-                    
-                    result = {
-                        "title": title_elem.text.strip() if title_elem else "",
-                        "price": price_elem.text.strip() if price_elem else "",
-                        "url": link_elem['href'] if link_elem and 'href' in link_elem.attrs else "",
-                        "source": domain
-                    }
-                    
-                    results.append(result)
-                except Exception as e:
-                    self.logger.error(f"Error extracting generic item: {e}")
-        
-        return results
+        for site, param in self.PAGE_PARAMS.items():
+            if site in domain:
+                return param
+        return None
     
-    def _find_next_page(self, html, url):
-        """Find next page URL in HTML"""
-        soup = BeautifulSoup(html, 'html.parser')
+    def _get_page_number(self, url):
+        """Read the page number from a generated page URL (1 when it has none)"""
+        param = self._get_page_param(url)
+        if param is None:
+            return 1
+        values = parse_qs(urlparse(url).query).get(param)
+        return int(values[0]) if values and values[0].isdigit() else 1
+    
+    def _fetch_records(self, kind, url, data_points=None, on_record=None, retry=None):
+        """Fetch a page and extract its records and next-page URL, or return None if the fetch fails
+        
+        With scraping.stream_parsing on, pages with parse targets are
+        extracted while they download with their selectors, and on_record
+        sees each record as soon as its element closes. Everything else,
+        including pages that may embed their listings as JSON, is fetched
+        whole and handed to the parse stage, which reads the embedded JSON
+        first and falls back to the selectors; on_record sees those records
+        once the page is parsed. retry is passed to the protection service,
+        so with a RetryState a backoff raises RetryDeferred.
+        """
+        targets = self._get_parse_targets(url)
+        
+        # Embedded JSON is cheaper and more reliable than the selectors, so never stream past it
+        streamable = targets and get_embedded(kind, url, self.extraction_rules) is None
+        
+        if self.stream_parsing and streamable:
+            extractor = StreamingExtractor(
+                kind, url, targets, self.extraction_rules, self.html_parser, data_points, on_record
+            )
+            if self.protection_service.stream_with_protection(url, extractor.feed, retry=retry) is None:
+                return None
+            self.parse_stage.record_path(kind, "stream")
+            return extractor.close()
+        
+        page = self.protection_service.get_bytes_with_protection(url, retry=retry)
+        if not page:
+            return None
+        
+        parsed = self.parse_stage.parse(kind, page, url, targets, data_points)
+        if on_record is not None:
+            for record in parsed["records"]:
+                on_record(record)
+        return parsed
+    
+    def _get_parse_targets(self, url):
+        """Look up the parse targets for url's site, or None to parse everything"""
         domain = urlparse(url).netloc
-        next_url = None
-        
-        # Site-specific next page selectors
-        if "ebay.com" in domain:
-            next_elem = soup.select_one('a.pagination__next')
-            if next_elem and 'href' in next_elem.attrs:
-                next_url = next_elem['href']
-        
-        elif "amazon.com" in domain:
-            next_elem = soup.select_one('a.s-pagination-next')
-            if next_elem and 'href' in next_elem.attrs:
-                next_url = urljoin("https://www.amazon.com", next_elem['href'])
-        
-        else:
-            # Generic next page detection
-            next_patterns = [
-                'a[rel="next"]', 
-                'a.next', 
-                'a.pagination-next', 
-                'a[aria-label="Next"]',
-                'a[aria-label="Next page"]',
-                'a.pagination__next',
-                'a.s-pagination-next',
-                'a[class*="next"]',
-                'a:contains("Next")'
-            ]
-                
-            for pattern in next_patterns:
-                next_elem = soup.select_one(pattern)
-                if next_elem and 'href' in next_elem.attrs:
-                    next_url = next_elem['href']
-                    break
-        
-        # Make relative URLs absolute
-        if next_url and not next_url.startswith(('http://', 'https://')):
-            next_url = urljoin(url, next_url)
-        
-        return next_url
+        for site, targets in self.PARSE_TARGETS.items():
+            if site in domain:
+                return targets
+        return self.extraction_rules.get_parse_targets(url)
     
     def _apply_filters(self, results, filtering_criteria):
         """Apply filtering criteria to results"""
@@ -621,9 +560,10 @@ class ScraperEngine:
             
             html += f'<div class="job-source">{job.get("source", "Unknown")}</div>'
             
-            # Add description if available
-            if job.get('description'):
-                html += f'<div class="job-description">{job.get("description")}</div>'
+            # Add description if available, preferring the full one from the job page
+            description = job.get('full_description') or job.get('description')
+            if description:
+                html += f'<div class="job-description">{description}</div>'
             
             # Add link if available
             if job.get('url'):
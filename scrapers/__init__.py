@@ -1,19 +1,37 @@
 # scrapers/__init__.py - Initialize scrapers package
-from .indeed_scraper import IndeedScraper
-from .remoteok_scraper import RemoteOKScraper
+import importlib
+from .base import Scraper, ScraperCapabilities
+from .registry import ScraperRegistry, ScraperInstances
 
-# Add more scrapers as they are implemented
-available_scrapers = {
-    "Indeed": IndeedScraper,
-    "RemoteOK": RemoteOKScraper
+# Built-in job sources; modules are only imported when a source is first used.
+# Other packages add sources through the gravy_scraper.scrapers entry point group.
+available_scrapers = ScraperRegistry({
+    "Indeed": "scrapers.indeed_scraper:IndeedScraper",
+    "RemoteOK": "scrapers.remoteok_feed:RemoteOKFeed",
+    "Craigslist": "scrapers.craigslist_feed:CraigslistFeed"
+})
+
+# Scraper classes importable from the package, loaded on first access
+_LAZY_CLASSES = {
+    "IndeedScraper": ".indeed_scraper",
+    "RemoteOKScraper": ".remoteok_scraper",
+    "FeedSource": ".feed_source",
+    "RemoteOKFeed": ".remoteok_feed",
+    "CraigslistFeed": ".craigslist_feed"
 }
 
+def __getattr__(name):
+    if name in _LAZY_CLASSES:
+        return getattr(importlib.import_module(_LAZY_CLASSES[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 def get_scraper(name):
     """Get a scraper instance by name"""
-    if name in available_scrapers:
-        return available_scrapers[name]()
+    scraper_class = available_scrapers.get(name)
+    if scraper_class is not None:
+        return scraper_class()
     return None
 
 def get_all_scrapers():
-    """Get instances of all available scrapers"""
-    return {name: scraper_class() for name, scraper_class in available_scrapers.items()}
\ No newline at end of file
+    """Get all available scrapers by name; each is imported and built the first time it is looked up"""
+    return ScraperInstances(available_scrapers)
\ No newline at end of file
@@ -0,0 +1,86 @@
+# scrapers/base.py - Base class and capabilities for job source plugins
+import logging
+from html_parser import HtmlParser
+from parse_stage import parse_records
+
+class ScraperCapabilities:
+    """What a job source plugin supports, used by the engine to schedule it
+
+    pagination: search() reads more than one results page when given max_pages
+    detail_fetch: get_many_job_details() fetches full job pages in a batch (get_job_details() one at a time)
+    location: search() narrows results to the location it is given
+    max_concurrency: the most requests the source makes at once during a search
+    """
+
+    def __init__(self, pagination=False, detail_fetch=False, location=False, max_concurrency=1):
+        self.pagination = pagination
+        self.detail_fetch = detail_fetch
+        self.location = location
+        self.max_concurrency = max_concurrency
+
+    def __repr__(self):
+        return (
+            f"ScraperCapabilities(pagination={self.pagination}, detail_fetch={self.detail_fetch}, "
+            f"location={self.location}, max_concurrency={self.max_concurrency})"
+        )
+
+class Scraper:
+    """Base for job source plugins
+
+    A plugin sets name and capabilities and implements search(), returning
+    job dicts with id, title, company, location, url, description, salary,
+    source and, where the site has them, tags. When run by ScraperEngine,
+    search() is given the engine's fetch_records so pages go through its
+    parse stage and streaming; run on its own, pages are fetched with the
+    protection service and parsed inline. If on_job is given, search()
+    also calls it with each job as soon as it is found, which with stream
+    parsing is while its results page is still downloading.
+    """
+
+    name = None
+    capabilities = ScraperCapabilities()
+
+    # Only these subtrees of the search page are parsed
+    SEARCH_TARGETS = None
+
+    def __init__(self):
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def search(self, keywords, exclude_keywords, location, protection_service, fetch_records=None, max_pages=1,
+               on_job=None):
+        """Search the source for jobs"""
+        raise NotImplementedError
+
+    def fetch_records(self, kind, url, protection_service, fetch_records=None, on_record=None):
+        """Fetch a search page and extract its records, or return None if the fetch fails
+
+        on_record is called with each record as it is extracted.
+        """
+        if fetch_records is not None:
+            return fetch_records(kind, url, on_record=on_record)
+
+        page = protection_service.get_bytes_with_protection(url)
+        if not page:
+            return None
+
+        parsed = self.parse_page(kind, page, url, protection_service.config_manager)
+        if on_record is not None:
+            for record in parsed["records"]:
+                on_record(record)
+        return parsed
+
+    def parse_page(self, kind, page, url, config_manager=None):
+        """Extract the records from a fetched (body, encoding) search page"""
+        body, encoding = page
+        # Job page kinds do not use the listing extraction rules
+        state = {"parser": HtmlParser(config_manager), "rules": None}
+        return parse_records(kind, body, encoding, url, self.SEARCH_TARGETS, None, state)
+
+    def exclude(self, jobs, exclude_keywords):
+        """Drop jobs with an exclude keyword in their title or description"""
+        return [
+            job for job in jobs
+            if not any(kw.lower() in job["title"].lower() or
+                       kw.lower() in job["description"].lower()
+                       for kw in exclude_keywords)
+        ]
\ No newline at end of file
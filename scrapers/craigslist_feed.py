@@ -0,0 +1,58 @@
+# scrapers/craigslist_feed.py - Craigslist jobs from its per-city RSS feeds
+import re
+from urllib.parse import quote_plus
+from .base import ScraperCapabilities
+from .feed_source import FeedSource, strip_html
+
+# Posting IDs end Craigslist listing URLs: .../sof/d/python-developer/7712345678.html
+POSTING_ID = re.compile(r'/(\d+)\.html')
+
+# The area an RSS item's title ends with: "Python Developer (Mission District)"
+AREA = re.compile(r'\(([^()]+)\)\s*$')
+
+class CraigslistFeed(FeedSource):
+    """Reads Craigslist job postings from the RSS feed of each city's job search
+
+    Each city is a separate Craigslist site with its own feed, so one search
+    fans out over every city in scraping.craigslist_cities at once. When the
+    search location names one of those cities, only that city is searched.
+    Postings cross-listed in nearby cities are kept once.
+    """
+
+    name = "Craigslist"
+    capabilities = ScraperCapabilities(location=True, max_concurrency=8)
+
+    DEFAULT_CITIES = ["sfbay", "newyork", "losangeles", "seattle", "chicago", "boston", "austin", "denver"]
+
+    def get_feed_urls(self, keywords, location, config_manager):
+        cities = config_manager.get_value("scraping.craigslist_cities", self.DEFAULT_CITIES)
+
+        if location:
+            place = re.sub(r'[^a-z]', "", location.split(",")[0].lower())
+            local = [city for city in cities if place and (city in place or place in city)]
+            cities = local or cities
+
+        query = quote_plus(" ".join(keywords))
+        return [f"https://{city}.craigslist.org/search/jjj?format=rss&query={query}" for city in cities]
+
+    def to_job(self, entry, feed_url):
+        title = entry.get("title", "")
+        url = entry.get("link", "")
+        if not title or not url:
+            return None
+
+        area = AREA.search(title)
+        posting_id = POSTING_ID.search(url)
+        city = feed_url.split("//", 1)[1].split(".", 1)[0]
+
+        return {
+            "id": posting_id.group(1) if posting_id else url,
+            "title": strip_html(AREA.sub("", title)) or "Unknown",
+            "company": "Unknown",
+            "location": area.group(1).strip() if area else city,
+            "url": url,
+            "description": strip_html(entry.get("description") or entry.get("summary")),
+            "salary": "Not specified",
+            "tags": entry.get("categories", []),
+            "source": "Craigslist"
+        }
\ No newline at end of file
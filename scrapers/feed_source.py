@@ -0,0 +1,286 @@
+# scrapers/feed_source.py - Base for job sources read from JSON APIs and RSS/Atom feeds
+import codecs
+import heapq
+import html
+import itertools
+import json
+import logging
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from lxml import etree
+from retry_scheduler import RetryDeferred, RetryState
+from .base import Scraper
+
+TAG = re.compile(r'<[^>]+>')
+WHITESPACE = re.compile(r'\s+')
+
+def strip_html(markup):
+    """Turn an HTML fragment from a feed into plain text"""
+    return WHITESPACE.sub(" ", html.unescape(TAG.sub(" ", markup or ""))).strip()
+
+class FeedParser:
+    """Incremental parser for a JSON array, RSS or Atom feed
+
+    Chunks are fed in as they download and each entry is returned as soon
+    as it is complete: every element of a top-level JSON array, or every RSS
+    item / Atom entry as a dict of its child elements' text (links use their
+    href, and repeated categories are collected in "categories"). The format
+    is sniffed from the first bytes. A top-level JSON object is returned
+    whole when the feed ends.
+    """
+
+    ENTRY_TAGS = {"item", "entry"}
+
+    def __init__(self):
+        self.format = None
+        self.decoder = None
+        self.buffer = ""
+        self.array_started = False
+        self.array_done = False
+        self.xml_parser = None
+        self.logger = logging.getLogger("FeedParser")
+
+    def feed(self, chunk, encoding=None):
+        """Parse the next chunk, returning the entries it completed"""
+        if self.format is None:
+            stripped = chunk.lstrip(codecs.BOM_UTF8 + b" \t\r\n")
+            if not stripped:
+                return []
+            self.format = "json" if stripped[:1] in (b"[", b"{") else "xml"
+
+        if self.format == "json":
+            if self.decoder is None:
+                self.decoder = codecs.getincrementaldecoder(encoding or "utf-8")(errors="replace")
+            self.buffer += self.decoder.decode(chunk)
+            return self._read_json_entries()
+
+        if self.xml_parser is None:
+            self.xml_parser = etree.XMLPullParser(
+                events=("end",), recover=True, resolve_entities=False, no_network=True
+            )
+        self.xml_parser.feed(chunk)
+        return self._read_xml_entries()
+
+    def close(self):
+        """Finish the feed, returning any entries still pending"""
+        if self.format == "json":
+            self.buffer += self.decoder.decode(b"", final=True)
+            entries = self._read_json_entries(final=True)
+
+            if not self.array_started and self.buffer.strip():
+                try:
+                    entries.append(json.loads(self.buffer))
+                except ValueError as e:
+                    self.logger.warning(f"Could not decode JSON feed: {e}")
+            elif self.array_started and not self.array_done:
+                self.logger.warning("JSON feed ended before its array closed")
+            return entries
+
+        if self.format == "xml":
+            try:
+                self.xml_parser.close()
+            except etree.XMLSyntaxError as e:
+                self.logger.warning(f"Incomplete feed: {e}")
+            return self._read_xml_entries()
+
+        return []
+
+    def _read_json_entries(self, final=False):
+        """Decode every complete element at the front of the buffered array
+
+        An element is only taken once the comma or bracket after it has
+        arrived (or the feed has ended), since a number cut by a chunk
+        boundary decodes fine as its first digits.
+        """
+        entries = []
+        decoder = json.JSONDecoder()
+
+        while not self.array_done:
+            text = self.buffer.lstrip(" \t\r\n,\ufeff")
+            if not self.array_started:
+                if not text.startswith("["):
+                    # A single object; decoded whole in close()
+                    break
+                self.array_started = True
+                text = text[1:].lstrip(" \t\r\n")
+
+            if text.startswith("]"):
+                self.array_done = True
+                self.buffer = ""
+                break
+
+            try:
+                entry, end = decoder.raw_decode(text)
+            except ValueError:
+                # The next element has not fully arrived yet
+                self.buffer = text
+                break
+
+            rest = text[end:].lstrip(" \t\r\n")
+            if rest[:1] not in (",", "]") and not (final and not rest):
+                self.buffer = text
+                break
+
+            entries.append(entry)
+            self.buffer = rest
+
+        return entries
+
+    def _read_xml_entries(self):
+        """Turn every closed item or entry element into a dict"""
+        entries = []
+        for _, elem in self.xml_parser.read_events():
+            if not isinstance(elem.tag, str) or etree.QName(elem).localname not in self.ENTRY_TAGS:
+                continue
+
+            entry = {}
+            for child in elem:
+                if not isinstance(child.tag, str):
+                    continue
+
+                name = etree.QName(child).localname
+                if name == "category":
+                    entry.setdefault("categories", []).append(child.get("term") or (child.text or "").strip())
+                elif name == "link" and child.get("href"):
+                    if child.get("rel", "alternate") == "alternate":
+                        entry.setdefault("link", child.get("href"))
+                else:
+                    entry.setdefault(name, (child.text or "").strip())
+
+            entries.append(entry)
+
+            # Drop the entry and anything before it so the tree stays small
+            elem.clear()
+            parent = elem.getparent()
+            while parent is not None and elem.getprevious() is not None:
+                del parent[0]
+
+        return entries
+
+class FeedSource(Scraper):
+    """Base for job sources read from a JSON API or RSS/Atom feeds instead of HTML
+
+    Subclasses list the feed URLs for a search and turn each entry into the
+    same job dict the HTML scrapers return. Feeds are streamed through
+    FeedParser as they download, several at a time when a source fans out
+    over many feeds, and jobs seen in more than one feed are kept once.
+    Sources whose feeds are not filtered by the server set match_keywords so
+    entries are matched against the keywords locally.
+    """
+
+    match_keywords = False
+
+    def search(self, keywords, exclude_keywords, location, protection_service, fetch_records=None, max_pages=1,
+               on_job=None):
+        """Search the source's feeds for jobs"""
+        jobs, _ = self.search_feeds(keywords, exclude_keywords, location, protection_service, on_job)
+        return jobs
+
+    def search_feeds(self, keywords, exclude_keywords, location, protection_service, on_job=None):
+        """Search the source's feeds, returning (jobs, number of feed entries read)
+
+        The entry count is returned rather than kept on the instance, since
+        one plugin instance serves every concurrent search.
+        """
+        self.logger.info(f"Searching {self.name} feeds for: {keywords}")
+        config_manager = protection_service.config_manager
+
+        feed_urls = self.get_feed_urls(keywords, location, config_manager)
+        entries = self.fetch_feeds(feed_urls, protection_service, config_manager)
+
+        jobs = []
+        seen = set()
+        for feed_url, entry in entries:
+            try:
+                job = self.to_job(entry, feed_url)
+            except Exception as e:
+                self.logger.error(f"Error reading {self.name} feed entry: {e}")
+                continue
+
+            if job is None or (job["url"] and job["url"] in seen):
+                continue
+            if not self._matches(job, keywords, exclude_keywords):
+                continue
+
+            seen.add(job["url"])
+            jobs.append(job)
+            if on_job is not None:
+                on_job(job)
+
+        self.logger.info(f"Found {len(jobs)} jobs on {self.name}")
+        return jobs, len(entries)
+
+    def fetch_feeds(self, feed_urls, protection_service, config_manager):
+        """Stream every feed, several at once, returning (feed URL, entry) pairs in feed order
+
+        A feed that has to back off is handed back to the pool once its delay
+        is up, so its worker streams the other feeds in the meantime.
+        """
+        if not feed_urls:
+            return []
+
+        max_workers = min(
+            len(feed_urls),
+            config_manager.get_value("scraping.feed_workers", 8),
+            self.capabilities.max_concurrency
+        )
+        results = {}
+        deferred = []
+        order = itertools.count()
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="Feed") as executor:
+            futures = {
+                executor.submit(self._fetch_feed, url, protection_service, RetryState()): url
+                for url in dict.fromkeys(feed_urls)
+            }
+
+            while futures or deferred:
+                # Resubmit feeds whose backoff is over
+                now = time.monotonic()
+                while deferred and deferred[0][0] <= now:
+                    _, _, url, state = heapq.heappop(deferred)
+                    futures[executor.submit(self._fetch_feed, url, protection_service, state)] = url
+
+                timeout = max(0, deferred[0][0] - now) if deferred else None
+                done, _ = wait(futures, timeout=timeout, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    url = futures.pop(future)
+                    try:
+                        results[url] = future.result()
+                    except RetryDeferred as e:
+                        heapq.heappush(deferred, (time.monotonic() + e.delay, next(order), url, e.state))
+
+        return [(url, entry) for url in feed_urls for entry in results.get(url, [])]
+
+    def get_feed_urls(self, keywords, location, config_manager):
+        """List the feed URLs to read for a search"""
+        raise NotImplementedError
+
+    def to_job(self, entry, feed_url):
+        """Turn a feed entry into a job dict, or None to skip it"""
+        raise NotImplementedError
+
+    def _fetch_feed(self, feed_url, protection_service, retry=None):
+        """Stream one feed through a FeedParser, raising RetryDeferred if it has to back off"""
+        parser = FeedParser()
+        entries = []
+
+        consume = lambda chunk, encoding: entries.extend(parser.feed(chunk, encoding))
+        if protection_service.stream_with_protection(feed_url, consume, retry=retry) is None:
+            self.logger.warning(f"Failed to get {self.name} feed {feed_url}")
+            return entries
+
+        entries.extend(parser.close())
+        return entries
+
+    def _matches(self, job, keywords, exclude_keywords):
+        """Apply the keyword and exclude-keyword filters to a job"""
+        if not self.exclude([job], exclude_keywords):
+            return False
+
+        if self.match_keywords and keywords:
+            text = f"{job['title']} {job['description']} {' '.join(job['tags'])}".lower()
+            return any(kw.lower() in text for kw in keywords)
+        return True
\ No newline at end of file
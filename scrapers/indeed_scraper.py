@@ -1,20 +1,65 @@
 # scrapers/indeed_scraper.py - Indeed-specific scraper implementation
-import logging
-from bs4 import BeautifulSoup
+from html_parser import HtmlParser
 from urllib.parse import quote
+from .base import Scraper, ScraperCapabilities
 
-class IndeedScraper:
+class IndeedScraper(Scraper):
     """Scraper for Indeed job listings"""
     
-    def __init__(self):
-        self.name = "Indeed"
-        self.logger = logging.getLogger("IndeedScraper")
+    name = "Indeed"
+    capabilities = ScraperCapabilities(pagination=True, detail_fetch=True, location=True)
     
-    def search(self, keywords, exclude_keywords, location, protection_service):
-        """Search for jobs on Indeed"""
+    # Only these subtrees of the search and job pages are parsed
+    SEARCH_TARGETS = ["div.job_seen_beacon"]
+    DETAIL_TARGETS = ["div#jobDescriptionText"]
+    
+    # Jobs on each results page; later pages are reached with &start=
+    PAGE_SIZE = 10
+    
+    def search(self, keywords, exclude_keywords, location, protection_service, fetch_records=None, max_pages=1,
+               on_job=None):
+        """Search for jobs on Indeed
+        
+        Job cards are read from the JSON the page embeds where it has it and
+        with the selectors otherwise. Up to max_pages results pages are read,
+        stopping at the first page with no new jobs.
+        """
         self.logger.info(f"Searching Indeed for: {keywords}")
         
-        # Build search URL
+        jobs = []
+        seen = set()
+        
+        # Report each job once, as its card is extracted
+        on_record = None
+        if on_job is not None:
+            reported = set()
+            
+            def on_record(record):
+                job = self._with_ids([record])[0]
+                if job["url"] not in reported:
+                    reported.add(job["url"])
+                    on_job(job)
+        
+        for page_number in range(max(1, max_pages)):
+            url = self.search_url(keywords, exclude_keywords, location, page_number)
+            parsed = self.fetch_records("indeed", url, protection_service, fetch_records, on_record)
+            
+            if not parsed:
+                self.logger.warning(f"Failed to get Indeed search results page {page_number + 1}")
+                break
+            
+            new_jobs = [job for job in self._with_ids(parsed["records"]) if job["url"] not in seen]
+            if not new_jobs:
+                break
+            
+            seen.update(job["url"] for job in new_jobs)
+            jobs.extend(new_jobs)
+        
+        self.logger.info(f"Found {len(jobs)} jobs on Indeed")
+        return jobs
+    
+    def search_url(self, keywords, exclude_keywords, location=None, page_number=0):
+        """Build the URL of one Indeed results page"""
         keyword_str = " ".join(keywords)
         exclude_str = " ".join(f"-{kw}" for kw in exclude_keywords)
         
@@ -27,69 +72,13 @@ class IndeedScraper:
         else:
             url = f"https://www.indeed.com/jobs?q={encoded_query}&remotejob=032b3046-06a3-4876-8dfd-474eb5e7ed11"
         
-        # Get the page content
-        # Get the page content
-        html = protection_service.get_with_protection(url)
-        
-        if not html:
-            self.logger.warning("Failed to get Indeed search results")
-            return []
-        
-        # Parse the HTML with BeautifulSoup
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        # Extract job listings
-        job_cards = soup.select("div.job_seen_beacon")
-        
-        jobs = []
-        for card in job_cards:
-            try:
-                # Extract job details
-                title_elem = card.select_one("h2.jobTitle span")
-                company_elem = card.select_one("span.companyName")
-                location_elem = card.select_one("div.companyLocation")
-                
-                # Get job URL
-                job_link_elem = card.select_one("h2.jobTitle a")
-                job_url = ""
-                job_id = ""
-                
-                if job_link_elem and job_link_elem.has_attr("href"):
-                    job_path = job_link_elem["href"]
-                    if job_path.startswith("/"):
-                        job_url = f"https://www.indeed.com{job_path}"
-                    else:
-                        job_url = job_path
-                    
-                    # Extract job ID from URL
-                    if "jk=" in job_url:
-                        job_id = job_url.split("jk=")[1].split("&")[0]
-                
-                # Get job description snippet
-                snippet_elem = card.select_one("div.job-snippet")
-                
-                # Get salary if available
-                salary_elem = card.select_one("div.salary-snippet-container")
-                
-                # Create job object
-                job = {
-                    "id": job_id,
-                    "title": title_elem.text.strip() if title_elem else "Unknown",
-                    "company": company_elem.text.strip() if company_elem else "Unknown",
-                    "location": location_elem.text.strip() if location_elem else "Unknown",
-                    "url": job_url,
-                    "description": snippet_elem.text.strip() if snippet_elem else "",
-                    "salary": salary_elem.text.strip() if salary_elem else "Not specified",
-                    "source": "Indeed"
-                }
-                
-                jobs.append(job)
-            
-            except Exception as e:
-                self.logger.error(f"Error parsing Indeed job card: {e}")
-        
-        self.logger.info(f"Found {len(jobs)} jobs on Indeed")
-        return jobs
+        if page_number:
+            url += f"&start={page_number * self.PAGE_SIZE}"
+        return url
+    
+    def parse_search_page(self, page, url, config_manager=None):
+        """Extract the jobs from a fetched (body, encoding) search page"""
+        return self._with_ids(self.parse_page("indeed", page, url, config_manager)["records"])
     
     def get_job_details(self, job_url, protection_service):
         """Get full job details from job page"""
@@ -97,14 +86,30 @@ class IndeedScraper:
             return {}
         
         # Get the job page content
-        html = protection_service.get_with_protection(job_url)
+        page = protection_service.get_bytes_with_protection(job_url)
         
-        if not html:
+        if not page:
             self.logger.warning(f"Failed to get job details from {job_url}")
             return {}
         
-        # Parse the HTML
-        soup = BeautifulSoup(html, 'html.parser')
+        return self._parse_job_details(page, protection_service.config_manager)
+    
+    def get_many_job_details(self, job_urls, protection_service):
+        """Get full job details for several jobs, yielding (url, details) as each page arrives"""
+        job_urls = [job_url for job_url in job_urls if job_url]
+        
+        for job_url, page in protection_service.get_many_with_protection(job_urls, as_bytes=True):
+            if not page:
+                self.logger.warning(f"Failed to get job details from {job_url}")
+                yield job_url, {}
+                continue
+            
+            yield job_url, self._parse_job_details(page, protection_service.config_manager)
+    
+    def _parse_job_details(self, page, config_manager=None):
+        """Parse full job details from a (body, encoding) job page"""
+        body, encoding = page
+        soup = HtmlParser(config_manager).parse(body, encoding, self.DETAIL_TARGETS)
         
         # Extract full job description
         description_elem = soup.select_one("div#jobDescriptionText")
@@ -115,4 +120,14 @@ class IndeedScraper:
         
         return {
             "full_description": description
-        }
\ No newline at end of file
+        }
+    
+    def _with_ids(self, jobs):
+        """Add each job's ID, taken from its URL"""
+        return [{"id": self._job_id(job["url"]), **job} for job in jobs]
+    
+    def _job_id(self, job_url):
+        """Extract the job ID from a job URL"""
+        if "jk=" in job_url:
+            return job_url.split("jk=")[1].split("&")[0]
+        return ""
\ No newline at end of file
@@ -0,0 +1,112 @@
+# scrapers/registry.py - Lazy registry of job source plugins
+import importlib
+import logging
+import threading
+from collections.abc import Mapping
+from importlib.metadata import entry_points
+
+# Entry point group other packages register job source plugins under
+ENTRY_POINT_GROUP = "gravy_scraper.scrapers"
+
+class ScraperRegistry(Mapping):
+    """Maps source names to scraper classes, importing each class the first time it is used
+
+    Built-in plugins are given as "module:Class" strings. Plugins from other
+    installed packages are discovered through the gravy_scraper.scrapers
+    entry point group, and take precedence over a built-in of the same name.
+    Listing the registry only reads entry point metadata; no plugin module
+    is imported until its class is looked up. A plugin that fails to import
+    is logged and treated as missing.
+    """
+
+    def __init__(self, plugins, group=ENTRY_POINT_GROUP):
+        self.plugins = dict(plugins)
+        self.group = group
+        self.classes = {}
+        self.discovered = group is None
+        self.logger = logging.getLogger("ScraperRegistry")
+        self._lock = threading.Lock()
+
+    def register(self, name, plugin):
+        """Register a plugin as a class or a "module:Class" string"""
+        with self._lock:
+            self.plugins[name] = plugin
+            self.classes.pop(name, None)
+
+    def capabilities(self, name):
+        """Get a plugin's capabilities, importing it if needed (None if unavailable)"""
+        scraper_class = self.get(name)
+        return scraper_class.capabilities if scraper_class is not None else None
+
+    def __getitem__(self, name):
+        self._discover()
+        with self._lock:
+            if name in self.classes:
+                return self.classes[name]
+            plugin = self.plugins[name]
+
+        try:
+            scraper_class = self._load(plugin)
+        except Exception as e:
+            self.logger.error(f"Could not load scraper plugin {name}: {e}")
+            raise KeyError(name) from e
+
+        with self._lock:
+            self.classes[name] = scraper_class
+        return scraper_class
+
+    def __contains__(self, name):
+        self._discover()
+        return name in self.plugins
+
+    def __iter__(self):
+        self._discover()
+        return iter(list(self.plugins))
+
+    def __len__(self):
+        self._discover()
+        return len(self.plugins)
+
+    def _discover(self):
+        """Add plugins registered by installed packages, once"""
+        if self.discovered:
+            return
+
+        with self._lock:
+            if self.discovered:
+                return
+            try:
+                for entry_point in entry_points(group=self.group):
+                    if entry_point.name in self.plugins:
+                        self.logger.info(f"Scraper plugin {entry_point.value} replaces built-in {entry_point.name}")
+                    self.plugins[entry_point.name] = entry_point
+            except Exception as e:
+                self.logger.warning(f"Could not discover scraper plugins: {e}")
+            self.discovered = True
+
+    def _load(self, plugin):
+        """Import a plugin given as a class, entry point or "module:Class" string"""
+        if isinstance(plugin, str):
+            module_name, _, attr = plugin.partition(":")
+            return getattr(importlib.import_module(module_name), attr)
+        if hasattr(plugin, "load"):
+            return plugin.load()
+        return plugin
+
+class ScraperInstances(Mapping):
+    """Scraper instances by source name, each built the first time it is looked up"""
+
+    def __init__(self, registry):
+        self.registry = registry
+        self.instances = {}
+
+    def __getitem__(self, name):
+        if name not in self.instances:
+            self.instances[name] = self.registry[name]()
+        return self.instances[name]
+
+    def __iter__(self):
+        return iter(self.registry)
+
+    def __len__(self):
+        return len(self.registry)
\ No newline at end of file
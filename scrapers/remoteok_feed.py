@@ -0,0 +1,58 @@
+# scrapers/remoteok_feed.py - RemoteOK jobs from its JSON API
+from .base import ScraperCapabilities
+from .feed_source import FeedSource, strip_html
+from .remoteok_scraper import RemoteOKScraper
+
+class RemoteOKFeed(FeedSource):
+    """Reads RemoteOK jobs from its public JSON API
+
+    The API returns every current listing in one array, so jobs are matched
+    against the keywords locally. Its first element is the API's legal
+    notice rather than a job and is skipped. If the API cannot be read, the
+    HTML search page is scraped instead.
+    """
+
+    name = "RemoteOK"
+    capabilities = ScraperCapabilities()
+
+    API_URL = "https://remoteok.com/api"
+    match_keywords = True
+
+    def search(self, keywords, exclude_keywords, location, protection_service, fetch_records=None, max_pages=1,
+               on_job=None):
+        """Search the RemoteOK API, falling back to the HTML search page"""
+        jobs, entry_count = self.search_feeds(keywords, exclude_keywords, location, protection_service, on_job)
+        if not entry_count:
+            self.logger.warning("RemoteOK API returned no listings, scraping the search page")
+            return RemoteOKScraper().search(
+                keywords, exclude_keywords, location, protection_service, fetch_records, on_job=on_job
+            )
+        return jobs
+
+    def get_feed_urls(self, keywords, location, config_manager):
+        return [self.API_URL]
+
+    def to_job(self, entry, feed_url):
+        if not isinstance(entry, dict) or not entry.get("id") or not entry.get("position"):
+            return None
+
+        job_id = str(entry["id"])
+        return {
+            "id": job_id,
+            "title": entry["position"].strip(),
+            "company": (entry.get("company") or "Unknown").strip(),
+            "location": (entry.get("location") or "Remote").strip(),
+            "url": f"https://remoteok.com/l/{job_id}",
+            "description": strip_html(entry.get("description")),
+            "salary": self._salary(entry.get("salary_min"), entry.get("salary_max")),
+            "tags": [str(tag) for tag in entry.get("tags") or []],
+            "source": "RemoteOK"
+        }
+
+    def _salary(self, salary_min, salary_max):
+        """Format the API's salary range"""
+        if salary_min and salary_max:
+            return f"${salary_min:,} - ${salary_max:,}"
+        if salary_min or salary_max:
+            return f"${salary_min or salary_max:,}"
+        return "Not specified"
\ No newline at end of file
@@ -0,0 +1,183 @@
+# service_quota.py - Concurrency caps and quota accounting for proxy services
+import asyncio
+import json
+import logging
+import os
+import random
+import threading
+import time
+
+class ServiceQuota:
+    """Tracks in-flight requests and billed usage for each proxy service
+
+    Services with a max_concurrency setting get a semaphore so we never
+    exceed the provider's cap. Requests and bytes are counted per billing
+    period (hourly, daily or monthly) against optional quota_requests and
+    quota_bytes limits. Once usage passes the soft budget, a service is
+    offered to the router less and less often, and it is not offered at all
+    once its quota is spent. Usage totals are persisted to a JSON file.
+    """
+
+    PERIOD_FORMATS = {
+        "hourly": "%Y-%m-%d %H",
+        "daily": "%Y-%m-%d",
+        "monthly": "%Y-%m"
+    }
+
+    def __init__(self, config_manager):
+        self.config_manager = config_manager
+        self.data_file = config_manager.get_value("protection.quota.stats_file", "service_usage.json")
+        self.soft_budget = config_manager.get_value("protection.quota.soft_budget", 0.8)
+        self.save_interval = 5
+        self.logger = logging.getLogger("ServiceQuota")
+
+        self.usage = self._load_data()
+        self.in_flight = {}
+        self.semaphores = {}
+        self._last_save = 0
+        self._lock = threading.Lock()
+
+    def acquire(self, service):
+        """Wait for a free slot on service and count the request against its quota"""
+        semaphore = self._get_semaphore(service)
+        if semaphore is not None:
+            semaphore.acquire()
+        self._record_request(service)
+
+    async def acquire_async(self, service):
+        """Wait without blocking the event loop for a free slot on service"""
+        semaphore = self._get_semaphore(service)
+        if semaphore is not None:
+            # The semaphore is shared with threads, so poll rather than block the loop
+            while not semaphore.acquire(blocking=False):
+                await asyncio.sleep(0.05)
+        # Counting the request may save usage to disk, which would block the loop
+        await asyncio.get_running_loop().run_in_executor(None, self._record_request, service)
+
+    def release(self, service):
+        """Free the slot taken by acquire"""
+        with self._lock:
+            self.in_flight[service] = self.in_flight.get(service, 1) - 1
+
+        semaphore = self._get_semaphore(service)
+        if semaphore is not None:
+            semaphore.release()
+
+    def record_bytes(self, service, size):
+        """Count downloaded bytes against a service's quota"""
+        with self._lock:
+            self._get_usage(service)["bytes"] += size
+            self._maybe_save()
+
+    def usage_ratio(self, service):
+        """Get the used share of a service's quota for this period (0 when unlimited)"""
+        limits = self._get_limits(service)
+
+        with self._lock:
+            usage = self._get_usage(service)
+            ratios = [0.0]
+            if limits["quota_requests"]:
+                ratios.append(usage["requests"] / limits["quota_requests"])
+            if limits["quota_bytes"]:
+                ratios.append(usage["bytes"] / limits["quota_bytes"])
+            return max(ratios)
+
+    def filter_services(self, services):
+        """Thin out services that are close to their quota so traffic shifts to Direct
+
+        Below the soft budget a service is always offered. Past it, the chance
+        of offering it falls linearly to zero at the full quota.
+        """
+        offered = []
+        for service in services:
+            if service == "Direct":
+                offered.append(service)
+                continue
+
+            ratio = self.usage_ratio(service)
+            if ratio < self.soft_budget:
+                offered.append(service)
+            elif ratio < 1 and random.random() < (1 - ratio) / (1 - self.soft_budget):
+                offered.append(service)
+
+        return offered or ["Direct"]
+
+    def get_stats(self):
+        """Get usage, limits and in-flight counts for every service seen"""
+        services = set(self.usage) | set(self.in_flight)
+        stats = {}
+        for service in services:
+            limits = self._get_limits(service)
+            ratio = self.usage_ratio(service)
+            with self._lock:
+                stats[service] = {
+                    **self._get_usage(service),
+                    **limits,
+                    "in_flight": self.in_flight.get(service, 0),
+                    "usage_ratio": round(ratio, 4)
+                }
+        return stats
+
+    def close(self):
+        """Persist usage to disk"""
+        with self._lock:
+            self._save_data()
+
+    def _record_request(self, service):
+        """Count one request in flight and billed"""
+        with self._lock:
+            self.in_flight[service] = self.in_flight.get(service, 0) + 1
+            self._get_usage(service)["requests"] += 1
+            self._maybe_save()
+
+    def _get_limits(self, service):
+        """Read a service's concurrency cap, quotas and billing period from config"""
+        return {
+            "max_concurrency": self.config_manager.get_value(f"protection.services.{service}.max_concurrency", 0),
+            "quota_requests": self.config_manager.get_value(f"protection.services.{service}.quota_requests", 0),
+            "quota_bytes": self.config_manager.get_value(f"protection.services.{service}.quota_bytes", 0),
+            "billing_period": self.config_manager.get_value(f"protection.services.{service}.billing_period", "monthly")
+        }
+
+    def _get_semaphore(self, service):
+        """Get the semaphore enforcing a service's concurrency cap, or None if uncapped"""
+        with self._lock:
+            if service not in self.semaphores:
+                limit = self.config_manager.get_value(f"protection.services.{service}.max_concurrency", 0)
+                self.semaphores[service] = threading.BoundedSemaphore(limit) if limit else None
+            return self.semaphores[service]
+
+    def _get_usage(self, service):
+        """Get the usage counters for a service, starting fresh in a new billing period"""
+        period_format = self.PERIOD_FORMATS.get(self._get_limits(service)["billing_period"], "%Y-%m")
+        period = time.strftime(period_format)
+
+        usage = self.usage.get(service)
+        if usage is None or usage["period"] != period:
+            usage = {"period": period, "requests": 0, "bytes": 0}
+            self.usage[service] = usage
+        return usage
+
+    def _maybe_save(self):
+        """Save usage if the last save is old enough"""
+        if time.time() - self._last_save >= self.save_interval:
+            self._save_data()
+
+    def _load_data(self):
+        """Load usage totals from file"""
+        if os.path.exists(self.data_file):
+            try:
+                with open(self.data_file, 'r') as f:
+                    return json.load(f)
+            except Exception as e:
+                self.logger.error(f"Error loading service usage: {e}")
+        return {}
+
+    def _save_data(self):
+        """Save usage totals to file"""
+        try:
+            with open(self.data_file, 'w') as f:
+                json.dump(self.usage, f, indent=2)
+            self._last_save = time.time()
+        except Exception as e:
+            self.logger.error(f"Error saving service usage: {e}")
\ No newline at end of file
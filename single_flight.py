@@ -0,0 +1,88 @@
+# single_flight.py - De-duplication of concurrent identical requests
+import asyncio
+import threading
+from concurrent.futures import Future
+from utils import canonicalize_url
+
+# Request headers that change what the server sends back
+VARY_HEADERS = ["accept", "accept-language", "authorization", "cookie", "range"]
+
+def request_key(url, headers=None, *extra):
+    """Build a de-duplication key from the canonical URL and response-affecting headers"""
+    vary = tuple(sorted(
+        (name.lower(), value) for name, value in (headers or {}).items()
+        if name.lower() in VARY_HEADERS
+    ))
+    return (canonicalize_url(url), vary) + extra
+
+class SingleFlight:
+    """Lets concurrent callers asking for the same key share one in-flight call
+
+    The first caller for a key runs the call; everyone else who arrives
+    before it finishes waits for and receives the same result. Thread and
+    asyncio callers share the same registry, so a GUI thread and a batch on
+    the async engine coalesce too.
+    """
+
+    def __init__(self):
+        self.stats = {"calls": 0, "shared": 0}
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn, *args):
+        """Run fn(*args) once for all threads currently asking for key"""
+        future, leader = self._join(key)
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn(*args)
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+
+        self._finish(key, future, result=result)
+        return result
+
+    async def do_async(self, key, fn, *args):
+        """Await fn(*args) once for all callers currently asking for key"""
+        future, leader = self._join(key)
+        if not leader:
+            return await asyncio.wrap_future(future)
+
+        try:
+            result = await fn(*args)
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+
+        self._finish(key, future, result=result)
+        return result
+
+    def get_stats(self):
+        """Get counts of executed and shared calls"""
+        with self._lock:
+            return dict(self.stats, in_flight=len(self._calls))
+
+    def _join(self, key):
+        """Register interest in key, returning (future, is_leader)"""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.stats["shared"] += 1
+                return future, False
+
+            future = Future()
+            self._calls[key] = future
+            self.stats["calls"] += 1
+            return future, True
+
+    def _finish(self, key, future, result=None, error=None):
+        """Publish the leader's result to any waiting callers"""
+        with self._lock:
+            self._calls.pop(key, None)
+
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
\ No newline at end of file
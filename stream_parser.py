@@ -0,0 +1,105 @@
+# stream_parser.py - Extracts records while a page is still downloading
+import logging
+from lxml import etree
+from html_parser import HtmlParser, TargetStrainer
+from parse_stage import EXTRACTORS
+
+# Elements that only parse inside a table, and the markup to wrap their fragments in
+TABLE_PARTS = {
+    "tr": ("<table>", "</table>"),
+    "thead": ("<table>", "</table>"),
+    "tbody": ("<table>", "</table>"),
+    "tfoot": ("<table>", "</table>"),
+    "td": ("<table><tr>", "</tr></table>"),
+    "th": ("<table><tr>", "</tr></table>")
+}
+
+class StreamingExtractor:
+    """Feeds a page into lxml's incremental HTML parser chunk by chunk
+
+    Whenever an element matching one of the parse targets closes (a job
+    card, a product item or a next-page link), its subtree is serialised on
+    its own and run through the same extractor the parse stage uses, so the
+    records match a full parse. Records are handed to on_record as they
+    appear. Everything else is discarded as soon as it closes, so neither
+    the page text nor its full tree is ever held in memory.
+
+    Only pages with parse targets can be streamed; the targets must cover
+    everything the extractor reads. Pages whose kind or site has an
+    embedded JSON spec are not streamed, since their records are read from
+    the blob first.
+    """
+
+    def __init__(self, kind, url, targets, rules, html_parser=None, data_points=None, on_record=None):
+        self.kind = kind
+        self.url = url
+        self.rules = rules
+        self.html_parser = html_parser or HtmlParser()
+        self.data_points = data_points or []
+        self.on_record = on_record
+        self.logger = logging.getLogger("StreamingExtractor")
+
+        self.strainer = TargetStrainer(targets)
+        self.parser = None
+        self.capture = None
+        self.records = []
+        self.next_page = None
+
+    def feed(self, chunk, encoding):
+        """Parse the next chunk of the body and emit any items it completes"""
+        if self.parser is None:
+            self.parser = etree.HTMLPullParser(events=("start", "end"), encoding=encoding)
+        self.parser.feed(chunk)
+        self._handle_events()
+
+    def close(self):
+        """Finish the page and return {"records": [...], "next_page": url or None, "path": "stream"}"""
+        if self.parser is not None:
+            try:
+                self.parser.close()
+            except etree.XMLSyntaxError as e:
+                self.logger.debug(f"Incomplete page {self.url}: {e}")
+            self._handle_events()
+            self.parser = None
+        return {"records": self.records, "next_page": self.next_page, "path": "stream"}
+
+    def _handle_events(self):
+        """Start capturing at each target element and emit it once it closes"""
+        for event, elem in self.parser.read_events():
+            if not isinstance(elem.tag, str):
+                continue
+
+            if event == "start":
+                if self.capture is None and self.strainer.matches(elem.tag, dict(elem.attrib)):
+                    self.capture = elem
+                continue
+
+            if elem is self.capture:
+                self.capture = None
+                self._emit(elem)
+            elif self.capture is not None:
+                continue
+
+            # Nothing outside a target is needed once it has closed
+            elem.clear(keep_tail=True)
+            parent = elem.getparent()
+            while parent is not None and elem.getprevious() is not None:
+                del parent[0]
+
+    def _emit(self, elem):
+        """Extract records and a next-page link from one completed target"""
+        fragment = etree.tostring(elem, method="html", encoding="unicode", with_tail=False)
+        if elem.tag in TABLE_PARTS:
+            before, after = TABLE_PARTS[elem.tag]
+            fragment = before + fragment + after
+
+        document = self.html_parser.parse_document(fragment)
+        records, next_page = EXTRACTORS[self.kind](document, self.url, self.data_points, self.rules)
+
+        if next_page and self.next_page is None:
+            self.next_page = next_page
+
+        for record in records:
+            self.records.append(record)
+            if self.on_record is not None:
+                self.on_record(record)
\ No newline at end of file
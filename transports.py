@@ -0,0 +1,154 @@
+# transports.py - HTTP/1.1 and HTTP/2 transports for the protection layer
+import importlib.util
+import logging
+import threading
+import requests
+import httpx
+from requests.adapters import HTTPAdapter
+
+# Connection-specific headers that HTTP/2 forbids
+HOP_BY_HOP_HEADERS = ["connection", "keep-alive", "proxy-connection", "transfer-encoding", "upgrade"]
+
+def strip_hop_by_hop(headers):
+    """Drop headers that are not allowed on an HTTP/2 request"""
+    return {
+        name: value for name, value in (headers or {}).items()
+        if name.lower() not in HOP_BY_HOP_HEADERS
+    }
+
+class Http1Transport:
+    """HTTP/1.1 transport built on pooled requests sessions
+
+    Sessions are keyed by (service, proxy endpoint) so each route keeps its
+    own warm connection pool and cookie jar.
+    """
+
+    name = "http1"
+    available = True
+
+    def __init__(self, pool_size):
+        self.pool_size = pool_size
+        self.sessions = {}
+        self.logger = logging.getLogger("Http1Transport")
+        self._lock = threading.Lock()
+
+    def send(self, service, route, headers):
+        """Start a streamed GET along a route"""
+        session = self.get_session(service, route["endpoint"])
+
+        # Configure proxy
+        proxies = None
+        if route["proxy"]:
+            proxies = {
+                "http": route["proxy"],
+                "https": route["proxy"]
+            }
+
+        return session.get(
+            route["url"],
+            headers=headers,
+            proxies=proxies,
+            timeout=route["timeout"],
+            stream=True
+        )
+
+    def get_session(self, service, endpoint=None):
+        """Get the pooled session for a service and proxy endpoint"""
+        key = (service, endpoint)
+
+        with self._lock:
+            session = self.sessions.get(key)
+
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=self.pool_size,
+                    pool_maxsize=self.pool_size
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self.sessions[key] = session
+                self.logger.debug(f"Created session for {service} ({endpoint or 'no proxy'})")
+
+            return session
+
+    def close(self):
+        """Close all pooled sessions"""
+        with self._lock:
+            for session in self.sessions.values():
+                session.close()
+            self.sessions = {}
+
+class Http2Response:
+    """Gives a streamed httpx response the parts of the requests API we use"""
+
+    def __init__(self, response):
+        self.response = response
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.http_version = response.http_version
+
+    def iter_content(self, chunk_size):
+        """Iterate over the decoded body in chunks"""
+        return self.response.iter_bytes(chunk_size)
+
+    def close(self):
+        """Release the stream back to the connection"""
+        self.response.close()
+
+class Http2Transport:
+    """HTTP/2 transport built on httpx
+
+    Requests to the same host are multiplexed over one connection. Servers
+    that do not negotiate HTTP/2 are served over HTTP/1.1 by the same client.
+    Needs the h2 package (pip install httpx[http2]).
+    """
+
+    name = "http2"
+    available = importlib.util.find_spec("h2") is not None
+
+    def __init__(self, pool_size):
+        self.pool_size = pool_size
+        self.clients = {}
+        self.logger = logging.getLogger("Http2Transport")
+        self._lock = threading.Lock()
+
+    def send(self, service, route, headers):
+        """Start a streamed GET along a route"""
+        client = self.get_client(service, route)
+        request = client.build_request(
+            "GET",
+            route["url"],
+            headers=strip_hop_by_hop(headers),
+            timeout=route["timeout"]
+        )
+        return Http2Response(client.send(request, stream=True))
+
+    def get_client(self, service, route):
+        """Get the pooled client for a service and proxy endpoint"""
+        key = (service, route["endpoint"])
+
+        with self._lock:
+            client = self.clients.get(key)
+
+            if client is None:
+                client = httpx.Client(
+                    http2=True,
+                    proxy=route["proxy"],
+                    follow_redirects=True,
+                    limits=httpx.Limits(
+                        max_connections=self.pool_size,
+                        max_keepalive_connections=self.pool_size
+                    )
+                )
+                self.clients[key] = client
+                self.logger.debug(f"Created HTTP/2 client for {service} ({route['endpoint'] or 'no proxy'})")
+
+            return client
+
+    def close(self):
+        """Close all pooled clients"""
+        with self._lock:
+            for client in self.clients.values():
+                client.close()
+            self.clients = {}
\ No newline at end of file
@@ -4,7 +4,7 @@ import json
 import os
 import logging
 from datetime import datetime
-from urllib.parse import urlparse, urljoin
+from urllib.parse import urlparse, urljoin, urlencode, parse_qsl, urlunparse
 
 logger = logging.getLogger("GravyUtils")
 
@@ -68,6 +68,21 @@ def get_domain(url):
     parsed_url = urlparse(url)
     return parsed_url.netloc
 
+def canonicalize_url(url):
+    """Normalize a URL so equivalent spellings compare equal"""
+    parsed = urlparse(url)
+    scheme = parsed.scheme.lower()
+    netloc = parsed.netloc.lower()
+    
+    # Drop default ports
+    if (scheme == "http" and netloc.endswith(":80")) or (scheme == "https" and netloc.endswith(":443")):
+        netloc = netloc.rsplit(":", 1)[0]
+    
+    # Sort query parameters and drop the fragment
+    query = urlencode(sorted(parse_qsl(parsed.query, keep_blank_values=True)))
+    
+    return urlunparse((scheme, netloc, parsed.path or "/", parsed.params, query, ""))
+
 def sanitize_filename(filename):
     """Sanitize filename by removing invalid characters"""
     return re.sub(r'[\\/*?:"<>|]', "", filename)